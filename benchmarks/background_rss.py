@@ -0,0 +1,76 @@
+"""Compare Leeway's memory use with the window open and in background mode.
+
+Starts the installed `leeway` twice, once normally and once with
+--background (the state it is in after the window is closed with
+"Run in background" on), lets each settle, and reports resident memory
+from /proc.
+
+    python3 benchmarks/background_rss.py [--command leeway] [--settle 10]
+
+Needs an installed Leeway and a graphical session. Quit any running
+instance first, or the new one just hands over to it.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+MODES = {
+    "window open": [],
+    "background": ["--background"],
+}
+
+
+def memory(pid: int) -> dict[str, int]:
+    """Resident memory figures, in KiB, from /proc/<pid>/status."""
+    figures = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "RssAnon", "RssFile"):
+                figures[name] = int(value.split()[0])
+    return figures
+
+
+def measure(command: list[str], settle: float) -> dict[str, int]:
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(settle)
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(command)} exited early; is Leeway already running?")
+        return memory(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--command", default="leeway", help="Leeway launcher to run")
+    parser.add_argument("--settle", type=float, default=10, help="Seconds to wait before measuring")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode, extra in MODES.items():
+        try:
+            results[mode] = measure([args.command, *extra], args.settle)
+        except (OSError, RuntimeError) as exc:
+            print(f"{mode}: {exc}", file=sys.stderr)
+            return 1
+
+    print(f"{'mode':<12} {'RSS MiB':>8} {'anon MiB':>9} {'file MiB':>9}")
+    for mode, figures in results.items():
+        print(
+            f"{mode:<12} {figures['VmRSS'] / 1024:>8.1f}"
+            f" {figures['RssAnon'] / 1024:>9.1f} {figures['RssFile'] / 1024:>9.1f}"
+        )
+    saved = results["window open"]["VmRSS"] - results["background"]["VmRSS"]
+    print(f"background mode saves {saved / 1024:.1f} MiB "
+          f"({saved / results['window open']['VmRSS']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Time LTTB downsampling of trend-chart series to typical widths.
+
+A week of 15-second samples is about 40,000 points. The chart resamples
+only when its width crosses a 64-pixel step or enough new points have
+arrived, so this is the cost of one such frame, not of every frame.
+
+    python3 benchmarks/chart_downsample.py
+"""
+
+import argparse
+import math
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+
+from app.lttb import lttb  # noqa: E402
+
+
+def series(n: int) -> list[tuple[float, float]]:
+    """A sawtooth climb with some wobble, one point every 15 s."""
+    return [
+        (i * 15.0, (i % 1200) / 12 + math.sin(i / 7) * 2)
+        for i in range(n)
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[1_200, 10_000, 40_320, 100_000])
+    parser.add_argument("--widths", type=int, nargs="+", default=[320, 640, 1280])
+    args = parser.parse_args(argv)
+
+    print(f"{'points':>8} " + " ".join(f"{f'{w} px ms':>10}" for w in args.widths))
+    for n in args.points:
+        points = series(n)
+        cells = []
+        for width in args.widths:
+            seconds = min(timeit.repeat(lambda: lttb(points, width), number=5, repeat=3)) / 5
+            cells.append(f"{seconds * 1000:>10.2f}")
+        print(f"{n:>8,} " + " ".join(cells))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
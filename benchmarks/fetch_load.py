@@ -0,0 +1,122 @@
+"""Load and latency harness for the fetch layer.
+
+Runs thousands of refresh cycles of api_fetcher.fetch_usage against the
+local mock endpoint in tests/mock_usage_server.py and reports fetch time
+percentiles, connections opened and response body bytes sent.
+
+    python3 benchmarks/fetch_load.py --cycles 5000 --latency-ms 2
+    python3 benchmarks/fetch_load.py --etag --change-every 10
+    python3 benchmarks/fetch_load.py --fail-every 50 --status 503
+
+Requires PyGObject and libsoup3, but no display.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "tests"))
+
+from gi.repository import GLib  # noqa: E402
+
+from app import api_fetcher  # noqa: E402
+from app.api_client import API_URL_ENV, ResponseCache  # noqa: E402
+from app.request_governor import RequestGovernor  # noqa: E402
+from mock_usage_server import DEFAULT_BODY, MockResponse, MockUsageServer  # noqa: E402
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run(args) -> dict:
+    server = MockUsageServer(etag=args.etag)
+    server.default = MockResponse(delay_ms=args.latency_ms)
+    os.environ[API_URL_ENV] = server.url
+
+    cache = ResponseCache()
+    # Never back off: the harness wants every cycle to reach the server.
+    governor = RequestGovernor(base_delay=0, failure_threshold=sys.maxsize)
+    loop = GLib.MainLoop()
+    timings: list[float] = []
+    outcomes = {"ok": 0, "unchanged": 0, "error": 0}
+    state = {"cycle": 0, "started": 0.0}
+
+    def next_cycle():
+        cycle = state["cycle"]
+        if cycle >= args.cycles:
+            loop.quit()
+            return GLib.SOURCE_REMOVE
+        if args.change_every and cycle % args.change_every == 0:
+            raw = json.loads(DEFAULT_BODY)
+            raw["five_hour"]["utilization_pct"] = float(cycle % 100)
+            server.body = json.dumps(raw).encode("utf-8")
+        if args.fail_every and cycle and cycle % args.fail_every == 0:
+            # No Retry-After: the governor would refuse the cycles after it,
+            # and the report would time those refusals, not fetches.
+            server.enqueue(MockResponse(status=args.status))
+        state["started"] = time.perf_counter()
+        api_fetcher.fetch_usage("token", on_result, cache=cache, governor=governor)
+        return GLib.SOURCE_REMOVE
+
+    def on_result(data, error, unchanged):
+        timings.append((time.perf_counter() - state["started"]) * 1000)
+        if error:
+            outcomes["error"] += 1
+        elif unchanged:
+            outcomes["unchanged"] += 1
+        else:
+            outcomes["ok"] += 1
+        state["cycle"] += 1
+        GLib.idle_add(next_cycle)
+
+    GLib.idle_add(next_cycle)
+    wall_start = time.perf_counter()
+    loop.run()
+    wall = time.perf_counter() - wall_start
+    server.close()
+
+    return {
+        "cycles": args.cycles,
+        "wall_s": round(wall, 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p99_ms": round(_percentile(timings, 99), 3),
+        "max_ms": round(max(timings), 3),
+        "connections": server.stats.connections,
+        "requests": server.stats.requests,
+        "not_modified": server.stats.not_modified,
+        "body_bytes": server.stats.bytes_sent,
+        **outcomes,
+        "parsed": cache.stats.parsed,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=int, default=0, help="server latency per response")
+    parser.add_argument("--etag", action="store_true", help="serve ETags and honour If-None-Match")
+    parser.add_argument("--change-every", type=int, default=0, help="change the body every N cycles")
+    parser.add_argument("--fail-every", type=int, default=0, help="fail every Nth request")
+    parser.add_argument("--status", type=int, default=429, help="status used for failures")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key:>14}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Time history range queries over a year of 15-second samples.
+
+Fills a history database through HistoryStore (the same writer thread
+the app uses), then times raw-sample and rollup range queries of
+increasing span.
+
+    python3 benchmarks/history_queries.py --days 365 --db /tmp/leeway-history.sqlite3
+
+An existing --db is reused, so the (slow) fill only happens once.
+"""
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+
+from app.history_store import DAY, HOUR, HistoryStore  # noqa: E402
+from app.usage_model import UsageData  # noqa: E402
+
+END = datetime(2026, 2, 20, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def fill(store: HistoryStore, days: int, interval: int):
+    """Append days of samples, with a sawtooth that resets every 5 hours."""
+    start = END - timedelta(days=days)
+    count = days * DAY // interval
+    began = time.perf_counter()
+    for i in range(count):
+        at = start + timedelta(seconds=i * interval)
+        elapsed = i * interval
+        session = (elapsed % (5 * HOUR)) / (5 * HOUR) * 80
+        weekly = (elapsed % (7 * DAY)) / (7 * DAY) * 90
+        store.append(UsageData(session_pct=session, weekly_pct=weekly), at)
+    store.flush()
+    seconds = time.perf_counter() - began
+    print(f"filled {count * 2:,} samples in {seconds:.1f} s "
+          f"({store.batches_written:,} transactions)")
+
+
+def timed(query, repeat: int = 5) -> tuple[float, int]:
+    """Return (best milliseconds, rows) for query()."""
+    best = math.inf
+    rows = 0
+    for _ in range(repeat):
+        began = time.perf_counter()
+        rows = len(query())
+        best = min(best, time.perf_counter() - began)
+    return best * 1000, rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--interval", type=int, default=15, help="seconds between samples")
+    parser.add_argument("--db", type=Path, help="database to fill or reuse")
+    args = parser.parse_args(argv)
+
+    path = args.db or Path(tempfile.mkdtemp()) / "history.sqlite3"
+    reuse = path.exists()
+    store = HistoryStore(path, retention_days=0, clock=END.timestamp)
+    try:
+        if not reuse:
+            fill(store, args.days, args.interval)
+        print(f"database: {path} ({path.stat().st_size / 1e6:.0f} MB)")
+
+        end = int(END.timestamp())
+        print(f"{'query':<28} {'rows':>8} {'ms':>8}")
+        for label, query in (
+            ("raw, last hour", lambda: store.samples("five_hour", end - HOUR, end)),
+            ("raw, last day", lambda: store.samples("five_hour", end - DAY, end)),
+            ("raw, last week", lambda: store.samples("five_hour", end - 7 * DAY, end)),
+            ("hourly, last 30 days", lambda: store.rollups("five_hour", end - 30 * DAY, end, HOUR)),
+            ("hourly, last year", lambda: store.rollups("five_hour", end - 365 * DAY, end, HOUR)),
+            ("daily, last year", lambda: store.rollups("five_hour", end - 365 * DAY, end, DAY)),
+        ):
+            ms, rows = timed(query)
+            print(f"{label:<28} {rows:>8,} {ms:>8.2f}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Measure cold start of `leeway --once`, from process start to exit.
+
+Runs the command line the way the launcher does, in fresh interpreters,
+answering from a snapshot (`--max-age`) so the network does not skew
+the timing, and reports it alongside a bare interpreter doing nothing.
+Also checks that nothing the query does not need was imported.
+
+The budget applies to Leeway's share, the median less that of the bare
+interpreter, which is the part Leeway controls.
+
+    python3 benchmarks/once_startup.py --runs 50 --budget-ms 100
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, os.pardir, "src")
+sys.path.insert(0, SRC)
+
+from app.snapshot_cache import save_snapshot  # noqa: E402
+from app.usage_model import UsageData  # noqa: E402
+
+ONCE = (
+    "import sys\n"
+    "from app import cli\n"
+    "code = cli.main(sys.argv[1:])\n"
+    "heavy = sorted(set(cli.ONCE_AVOIDS) & sys.modules.keys())\n"
+    "if heavy:\n"
+    "    sys.exit(f'imported {heavy}')\n"
+    "sys.exit(code)\n"
+)
+
+
+def time_runs(argv: list[str], env: dict[str, str], runs: int) -> list[float]:
+    """Wall-clock seconds for each of runs fresh processes."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(argv, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--json", action="store_true", help="Time --once --json")
+    parser.add_argument("--budget-ms", type=float,
+                        help="Exit with status 1 if Leeway's share is slower than this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as cache_home:
+        env = {**os.environ, "PYTHONPATH": SRC, "XDG_CACHE_HOME": cache_home}
+        save_snapshot(
+            UsageData(session_pct=44.2, weekly_pct=15.4),
+            datetime.now(timezone.utc), Path(cache_home) / "leeway" / "snapshot.json",
+        )
+        once = [sys.executable, "-c", ONCE, "--once", "--max-age", "86400"]
+        if args.json:
+            once.append("--json")
+        # Warm the bytecode cache so every timed run is an ordinary cold start.
+        time_runs(once, env, 1)
+        bare = time_runs([sys.executable, "-c", "pass"], env, args.runs)
+        timed = time_runs(once, env, args.runs)
+
+    bare_ms = statistics.median(bare) * 1000
+    once_ms = statistics.median(timed) * 1000
+    print(f"bare interpreter   median {bare_ms:7.1f} ms   min {min(bare) * 1000:7.1f} ms")
+    print(f"leeway --once      median {once_ms:7.1f} ms   min {min(timed) * 1000:7.1f} ms")
+    print(f"Leeway's share     {once_ms - bare_ms:7.1f} ms")
+    if args.budget_ms is not None and once_ms - bare_ms > args.budget_ms:
+        print(f"\nSlower than the {args.budget_ms:g} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
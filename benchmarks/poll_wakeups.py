@@ -0,0 +1,82 @@
+"""Count timer wakeups and API requests per hour in each polling state.
+
+Simulates an hour of the monitor's timer loop on a fake clock using the
+real PollScheduler and PollPolicy, and compares it with the old fixed
+60-second timer that fired regardless of state.
+
+    python3 benchmarks/poll_wakeups.py
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+
+from app.poll_policy import PollPolicy  # noqa: E402
+from app.poll_scheduler import PollScheduler  # noqa: E402
+from app.usage_model import UsageData  # noqa: E402
+
+HOUR = 3600.0
+START = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+
+STATES = {
+    "online, visible": {},
+    "window hidden": {"visible": False},
+    "power saver": {"power_saver": True},
+    "hidden + power saver": {"visible": False, "power_saver": True},
+    "offline": {"online": False},
+}
+
+
+def simulate(conditions: dict, *, floor: int, ceiling: int, climb_per_hour: float) -> tuple[int, int]:
+    """Return (wakeups, requests) over one simulated hour."""
+    scheduler = PollScheduler(floor, ceiling)
+    policy = PollPolicy()
+    policy.update(**conditions)
+
+    elapsed = 0.0
+    wakeups = requests = 0
+    pct = 20.0
+    while True:
+        if not policy.paused:
+            now = START + timedelta(seconds=elapsed)
+            pct = 20.0 + climb_per_hour * elapsed / HOUR
+            scheduler.record(
+                UsageData(session_pct=pct, weekly_pct=10.0,
+                          session_resets_at=START + timedelta(hours=4)),
+                now=now,
+            )
+            requests += 1
+        delay = policy.adjust(scheduler.next_delay(now=START + timedelta(seconds=elapsed)))
+        if delay is None:
+            break  # no timer until connectivity returns
+        elapsed += max(1, round(delay))
+        if elapsed >= HOUR:
+            break
+        wakeups += 1
+    return wakeups, requests
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--floor", type=int, default=15)
+    parser.add_argument("--ceiling", type=int, default=60)
+    parser.add_argument("--climb", type=float, default=0.0,
+                        help="session usage growth in points per hour")
+    args = parser.parse_args(argv)
+
+    baseline = int(HOUR // 60)
+    print(f"{'state':<22} {'wakeups/h':>10} {'requests/h':>11}   (fixed 60 s timer: {baseline}/{baseline})")
+    for name, conditions in STATES.items():
+        wakeups, requests = simulate(
+            conditions, floor=args.floor, ceiling=args.ceiling, climb_per_hour=args.climb
+        )
+        print(f"{name:<22} {wakeups:>10} {requests:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
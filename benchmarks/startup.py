@@ -0,0 +1,111 @@
+"""Measure time from process start to the first painted window, and import costs.
+
+Runs an installed Leeway the way the launcher does, in a child process
+that reports when the window's frame clock finishes its first paint and
+then quits. The time is measured from just before the child is spawned,
+so it includes interpreter start-up. A second child runs with
+`python -X importtime` and lists the costliest Leeway and GObject
+introspection imports.
+
+    python3 benchmarks/startup.py --pkgdatadir /usr/local/share/leeway
+
+Needs PyGObject, an installed Leeway (for its gresource bundle and
+modules) and a graphical session. The child is non-unique, so a running
+Leeway does not interfere.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PKGDATADIR_CANDIDATES = ("/app/share/leeway", "/usr/local/share/leeway", "/usr/share/leeway")
+
+CHILD_SETUP = """
+import os, sys
+sys.path.insert(1, {pkgdatadir!r})
+import gi
+from gi.repository import Gio
+Gio.Resource.load(os.path.join({pkgdatadir!r}, 'leeway.gresource'))._register()
+"""
+
+
+def child(pkgdatadir: str) -> int:
+    """Start Leeway in-process; print the monotonic time of the first paint."""
+    exec(CHILD_SETUP.format(pkgdatadir=pkgdatadir), {})
+    from gi.repository import Gio
+    from leeway import main
+
+    app = main.LeewayApplication()
+    app.set_flags(app.get_flags() | Gio.ApplicationFlags.NON_UNIQUE)
+
+    def on_after_paint(_clock):
+        print(time.monotonic(), flush=True)
+        app.quit()
+
+    def on_map(window):
+        window.get_frame_clock().connect("after-paint", on_after_paint)
+
+    app.connect("window-added", lambda _app, window: window.connect("map", on_map))
+    return app.run([sys.argv[0]])
+
+
+def first_paint(pkgdatadir: str) -> float:
+    """Seconds from spawning a child to its first painted frame."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--pkgdatadir", pkgdatadir]
+    started = time.monotonic()
+    output = subprocess.run(command, capture_output=True, text=True, timeout=60, check=True).stdout
+    return float(output.split()[0]) - started
+
+
+def import_costs(pkgdatadir: str) -> list[tuple[int, int, str]]:
+    """(cumulative µs, self µs, module) for each import of `leeway.main`."""
+    code = CHILD_SETUP.format(pkgdatadir=pkgdatadir) + "from leeway import main\n"
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, timeout=60, check=True,
+    ).stderr
+    costs = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = (field.strip() for field in line[len("import time:"):].split("|"))
+        costs.append((int(cumulative), int(own), name))
+    return costs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pkgdatadir", default=next(
+        (path for path in PKGDATADIR_CANDIDATES if os.path.isdir(path)), PKGDATADIR_CANDIDATES[-1]
+    ))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Imports to list")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return child(args.pkgdatadir)
+
+    try:
+        times = [first_paint(args.pkgdatadir) for _ in range(args.runs)]
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError) as exc:
+        print(f"Could not start Leeway from {args.pkgdatadir}: {exc}", file=sys.stderr)
+        return 1
+    print(f"first paint over {args.runs} runs: median {statistics.median(times) * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms, max {max(times) * 1000:.0f} ms")
+
+    costs = import_costs(args.pkgdatadir)
+    total = max(cumulative for cumulative, _, _ in costs)
+    print(f"\nimports of leeway.main: {total / 1000:.1f} ms cumulative")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    interesting = [cost for cost in costs if cost[2].startswith(("leeway", "gi.", "sqlite3"))]
+    for cumulative, own, name in sorted(interesting, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:>14.1f} {own / 1000:>8.1f}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
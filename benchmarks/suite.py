@@ -0,0 +1,201 @@
+"""Micro-benchmarks for the hot pure functions, compared against stored baselines.
+
+Times parse_usage_response, parse_response_body, format_reset_time,
+read_credentials, status_for_pct and live snapshot reads, plus an end-to-end case that takes
+a raw response body through the response cache, the burn-rate
+forecaster and the view-state diff to the strings the dashboard shows.
+Each case is calibrated to run for about 0.2 s per repeat, and the
+fastest of several repeats is reported, as is conventional for timeit.
+
+    python3 benchmarks/suite.py               # compare with baselines.json
+    python3 benchmarks/suite.py --save        # record new baselines
+    python3 benchmarks/suite.py -k format --fail-over 15
+
+Baselines depend on the machine and interpreter, so record them on the
+machine you compare on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+
+from app.api_client import ResponseCache, parse_response_body  # noqa: E402
+from app.burn_rate import BurnRateForecaster  # noqa: E402
+from app.credential_reader import read_credentials  # noqa: E402
+from app.formatting import format_reset_time  # noqa: E402
+from app.live_snapshot import LiveSnapshotReader, LiveSnapshotWriter, read_live_snapshot  # noqa: E402
+from app.usage_calculator import status_for_pct  # noqa: E402
+from app.usage_model import parse_usage_response  # noqa: E402
+from app.view_state import ViewState, countdown_fields, usage_fields  # noqa: E402
+
+BASELINES = Path(HERE) / "baselines.json"
+
+NOW = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+
+RESPONSE = {
+    "five_hour": {"utilization": 44.2, "resets_at": "2026-02-20T17:00:00+00:00"},
+    "seven_day": {"utilization": 15.4, "resets_at": "2026-02-25T23:00:00+00:00"},
+    "seven_day_opus": {"utilization": 2.0, "resets_at": "2026-02-25T23:00:00+00:00"},
+    "seven_day_sonnet": {"utilization": 9.0, "resets_at": "2026-02-25T23:00:00+00:00"},
+    "seven_day_oauth_apps": None,
+    "extra_usage": {"is_enabled": False, "monthly_limit": None},
+}
+BODY = json.dumps(RESPONSE).encode()
+
+
+def _credentials_file(directory: str) -> Path:
+    path = Path(directory) / ".credentials.json"
+    path.write_text(json.dumps({
+        "claudeAiOauth": {
+            "accessToken": "sk-ant-oat01-benchmark",
+            "refreshToken": "sk-ant-ort01-benchmark",
+            "expiresAt": int(time.time() * 1000) + 3_600_000,
+            "scopes": ["user:inference"],
+            "subscriptionType": "max",
+        }
+    }))
+    return path
+
+
+def _end_to_end():
+    """A refresh without the network or GTK: body in, changed widget fields out."""
+    cache = ResponseCache()
+    cache.bind_token("sk-ant-oat01-benchmark")
+    forecaster = BurnRateForecaster()
+    view = ViewState()
+    # Vary the body like real polling does, so the cache parses each time.
+    bodies = [
+        json.dumps({**RESPONSE, "five_hour": {**RESPONSE["five_hour"], "utilization": 40 + i / 10}}).encode()
+        for i in range(100)
+    ]
+    tick = [0]
+
+    def refresh():
+        i = tick[0] = tick[0] + 1
+        now = NOW + timedelta(seconds=15 * i)
+        data, _unchanged = cache.resolve(bodies[i % len(bodies)])
+        forecaster.record(data, now=now)
+        view.begin_refresh()
+        for bucket in data.buckets:
+            view.diff(bucket.key, usage_fields(bucket))
+            view.diff(bucket.key, countdown_fields(bucket, forecaster.forecast(bucket.key), now=now))
+    return refresh
+
+
+def cases(directory: str) -> dict:
+    """Benchmark name -> zero-argument callable."""
+    credentials = _credentials_file(directory)
+    live = os.path.join(directory, "usage.bin")
+    LiveSnapshotWriter(live).publish(parse_usage_response(RESPONSE), NOW.timestamp())
+    reader = LiveSnapshotReader(live)
+    resets_at = [NOW + timedelta(seconds=s) for s in (30, 2_700, 4 * 3600 + 59, 6 * 86400 + 3)]
+    percentages = [i / 4 for i in range(401)]
+    return {
+        "parse_usage_response": lambda: parse_usage_response(RESPONSE),
+        "parse_response_body": lambda: parse_response_body(BODY),
+        "format_reset_time": lambda: [format_reset_time(at, now=NOW) for at in resets_at],
+        "read_credentials": lambda: read_credentials(credentials),
+        "status_for_pct": lambda: [status_for_pct(pct) for pct in percentages],
+        "live_snapshot_read": reader.read,
+        "live_snapshot_open_read": lambda: read_live_snapshot(live),
+        "refresh_end_to_end": _end_to_end(),
+    }
+
+
+def measure(func, repeat: int, target: float) -> float:
+    """Fastest seconds per call over repeat runs of about target seconds each."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * target / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or "unknown",
+    }
+
+
+def report(results: dict[str, float], baselines: dict, threshold: float) -> list[str]:
+    """Print a comparison table; return the names of regressed cases."""
+    stored = baselines.get("results", {})
+    regressed = []
+    print(f"{'benchmark':<22} {'baseline µs':>12} {'current µs':>11} {'change':>8}")
+    for name, seconds in results.items():
+        current = seconds * 1e6
+        base = stored.get(name)
+        if base is None:
+            print(f"{name:<22} {'—':>12} {current:>11.3f} {'new':>8}")
+            continue
+        change = (current - base) / base * 100
+        flag = ""
+        if change > threshold:
+            flag = "  slower"
+            regressed.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<22} {base:>12.3f} {current:>11.3f} {change:>+7.1f}%{flag}")
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="filter", help="Only benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="Store the results as baselines")
+    parser.add_argument("--threshold", type=float, default=10,
+                        help="Percentage change reported as slower or faster")
+    parser.add_argument("--fail-over", type=float, metavar="PCT",
+                        help="Exit with status 1 if any benchmark is this much slower")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        selected = {
+            name: func for name, func in cases(directory).items()
+            if args.filter is None or args.filter in name
+        }
+        results = {name: measure(func, args.repeat, args.target) for name, func in selected.items()}
+
+    if args.save:
+        baselines = {"environment": environment(), "results": {}}
+        if args.baselines.exists():
+            baselines["results"] = json.loads(args.baselines.read_text()).get("results", {})
+        baselines["results"].update({name: round(s * 1e6, 4) for name, s in results.items()})
+        args.baselines.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Saved {len(results)} baselines to {args.baselines}")
+        return 0
+
+    baselines = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    if baselines.get("environment", environment()) != environment():
+        print(f"Note: baselines were recorded on {baselines['environment']}; "
+              f"this is {environment()}.\n")
+    regressed = report(results, baselines, args.threshold)
+    if args.fail_over is not None:
+        stored = baselines.get("results", {})
+        failed = [
+            name for name in regressed
+            if (results[name] * 1e6 - stored[name]) / stored[name] * 100 > args.fail_over
+        ]
+        if failed:
+            print(f"\nSlower than baseline by more than {args.fail_over}%: {', '.join(failed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
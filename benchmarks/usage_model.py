@@ -0,0 +1,105 @@
+"""Compare parse cost and memory of the bucket model with the old dataclass.
+
+Parses a realistic usage response many times with parse_usage_response()
+and with a copy of the previous three-field dataclass parser, then
+measures the memory retained by a history of parsed snapshots.
+
+    python3 benchmarks/usage_model.py --iterations 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "src"))
+
+from app.usage_model import parse_usage_response  # noqa: E402
+
+RESPONSE = {
+    "five_hour": {"utilization": 44, "utilization_pct": 44.2, "resets_at": "2026-02-20T17:00:00+00:00"},
+    "seven_day": {"utilization": 15, "utilization_pct": 15.4, "resets_at": "2026-02-25T23:00:00+00:00"},
+    "seven_day_opus": {"utilization": 2, "resets_at": "2026-02-25T23:00:00+00:00"},
+    "seven_day_oauth_apps": None,
+}
+
+
+@dataclass
+class LegacyUsageData:
+    """The model as it was before buckets: three hard-coded pairs."""
+
+    session_pct: float | None = None
+    session_resets_at: datetime | None = None
+    weekly_pct: float | None = None
+    weekly_resets_at: datetime | None = None
+    opus_pct: float | None = None
+    opus_resets_at: datetime | None = None
+
+
+def _legacy_time(value):
+    if not value:
+        return None
+    try:
+        result = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    return result if result.tzinfo is not None else None
+
+
+def _legacy_pct(bucket):
+    pct = bucket.get("utilization_pct")
+    return bucket.get("utilization") if pct is None else pct
+
+
+def legacy_parse(raw: dict) -> LegacyUsageData:
+    five_hour = raw.get("five_hour", {})
+    seven_day = raw.get("seven_day", {})
+    opus = raw.get("seven_day_opus")
+    return LegacyUsageData(
+        session_pct=_legacy_pct(five_hour),
+        session_resets_at=_legacy_time(five_hour.get("resets_at")),
+        weekly_pct=_legacy_pct(seven_day),
+        weekly_resets_at=_legacy_time(seven_day.get("resets_at")),
+        opus_pct=_legacy_pct(opus) if opus else None,
+        opus_resets_at=_legacy_time(opus.get("resets_at")) if opus else None,
+    )
+
+
+def retained_bytes(parse, count: int) -> float:
+    """Average bytes held per parsed snapshot across a history of count.
+
+    Each snapshot is parsed from freshly decoded JSON, as a fetch would,
+    so nothing is shared with the response except what the model shares.
+    """
+    text = json.dumps(RESPONSE)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    history = [parse(json.loads(text)) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del history
+    return (after - before) / count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--history", type=int, default=10_000,
+                        help="snapshots kept when measuring memory")
+    args = parser.parse_args(argv)
+
+    print(f"{'model':<10} {'parse µs':>9} {'bytes/snapshot':>15}")
+    for name, parse in (("dataclass", legacy_parse), ("buckets", parse_usage_response)):
+        seconds = min(timeit.repeat(lambda: parse(RESPONSE), number=args.iterations, repeat=3))
+        per_parse = seconds / args.iterations * 1e6
+        print(f"{name:<10} {per_parse:>9.2f} {retained_bytes(parse, args.history):>15.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
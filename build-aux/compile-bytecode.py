@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+# compile-bytecode.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Byte-compile the installed Python modules; run by `meson install`.
+
+Without this the first launch compiles every module, and every launch
+does if the install directory is read-only (as in a Flatpak).
+"""
+
+import compileall
+import os
+import sys
+
+moduledir = sys.argv[1]
+destdir = os.environ.get("DESTDIR", "")
+target = os.path.join(destdir, os.path.relpath(moduledir, os.sep)) if destdir else moduledir
+
+if not os.environ.get("MESON_INSTALL_QUIET"):
+    print(f"Compiling Python bytecode in {target}")
+# Strip DESTDIR so tracebacks name the final install location.
+ok = compileall.compile_dir(target, stripdir=destdir or None, prependdir=os.sep if destdir else None, quiet=1)
+sys.exit(0 if ok else 1)
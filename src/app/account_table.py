@@ -0,0 +1,97 @@
+# account_table.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Virtualised table of per-account usage for multi-account monitoring."""
+
+from gi.repository import Gio, GObject, Gtk, Pango
+
+
+class LeewayAccountItem(GObject.Object):
+    """One row of the account table, holding display-ready strings."""
+
+    __gtype_name__ = 'LeewayAccountItem'
+
+    name = GObject.Property(type=str, default='')
+    session = GObject.Property(type=str, default='—')
+    weekly = GObject.Property(type=str, default='—')
+    resets = GObject.Property(type=str, default='')
+    status = GObject.Property(type=str, default='')
+
+    def update(self, **values):
+        """Set properties, emitting notify only for those whose value changed."""
+        for prop, value in values.items():
+            if self.get_property(prop) != value:
+                self.set_property(prop, value)
+
+
+# (title, item property, expand)
+_COLUMNS = (
+    ('Account', 'name', True),
+    ('Session', 'session', False),
+    ('Weekly', 'weekly', False),
+    ('Session resets', 'resets', False),
+    ('Status', 'status', True),
+)
+
+
+class LeewayAccountTable(Gtk.ScrolledWindow):
+    """A Gtk.ColumnView over a Gio.ListStore of LeewayAccountItem.
+
+    Only visible rows have widgets, and each cell label is bound to a
+    single item property, so an update touches just the cells whose
+    text actually changed.
+    """
+
+    __gtype_name__ = 'LeewayAccountTable'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.store = Gio.ListStore(item_type=LeewayAccountItem)
+        self._bindings: dict[Gtk.ColumnViewCell, GObject.Binding] = {}
+
+        view = Gtk.ColumnView(model=Gtk.NoSelection(model=self.store))
+        view.add_css_class('data-table')
+        for title, prop, expand in _COLUMNS:
+            factory = Gtk.SignalListItemFactory()
+            factory.connect('setup', self._on_setup)
+            factory.connect('bind', self._on_bind, prop)
+            factory.connect('unbind', self._on_unbind)
+            view.append_column(
+                Gtk.ColumnViewColumn(title=title, factory=factory, expand=expand)
+            )
+        self.set_child(view)
+
+    def set_items(self, items: list[LeewayAccountItem]):
+        """Replace all rows."""
+        self.store.splice(0, self.store.get_n_items(), items)
+
+    def _on_setup(self, _factory, cell):
+        label = Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
+        cell.set_child(label)
+
+    def _on_bind(self, _factory, cell, prop):
+        self._bindings[cell] = cell.get_item().bind_property(
+            prop, cell.get_child(), 'label', GObject.BindingFlags.SYNC_CREATE,
+        )
+
+    def _on_unbind(self, _factory, cell):
+        binding = self._bindings.pop(cell, None)
+        if binding is not None:
+            binding.unbind()
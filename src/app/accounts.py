@@ -0,0 +1,115 @@
+# accounts.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Accounts for multi-account monitoring, and bounded-concurrency fetching."""
+
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .api_client import ResponseCache
+from .poll_scheduler import PollScheduler
+from .request_governor import RequestGovernor
+from .usage_model import UsageData
+
+DEFAULT_CONCURRENCY = 4
+
+
+def account_label(path: Path) -> str:
+    """Derive a display name from a credentials file path.
+
+    ``~/team/alice.json`` becomes "alice"; a conventionally named
+    ``~/team/alice/.credentials.json`` also becomes "alice".
+    """
+    if path.stem.startswith(".") and path.parent.name:
+        return path.parent.name
+    return path.stem
+
+
+@dataclass(eq=False)
+class Account:
+    """One monitored subscription and its per-account fetch state."""
+
+    path: Path
+    scheduler: PollScheduler
+    label: str = ""
+    cache: ResponseCache = field(default_factory=ResponseCache)
+    governor: RequestGovernor = field(default_factory=RequestGovernor)
+    data: UsageData | None = None
+    error: str | None = None
+    in_flight: bool = False
+    next_due: float = 0.0  # monotonic seconds
+
+    def __post_init__(self):
+        if not self.label:
+            self.label = account_label(self.path)
+
+
+class ConcurrencyLimiter:
+    """Run at most `limit` asynchronous jobs at once.
+
+    A job is a callable taking a single `done` callback, which it must
+    call exactly once when its asynchronous work completes. Jobs beyond
+    the limit wait in FIFO order.
+    """
+
+    def __init__(self, limit: int = DEFAULT_CONCURRENCY):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._pending: deque = deque()
+        self._draining = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, job):
+        """Queue a job, starting it immediately if a slot is free."""
+        self._pending.append(job)
+        self._drain()
+
+    def clear(self):
+        """Drop jobs that have not started yet."""
+        self._pending.clear()
+
+    def _drain(self):
+        # Jobs may finish synchronously; loop here rather than recursing.
+        if self._draining:
+            return
+        self._draining = True
+        try:
+            while self._pending and self.active < self.limit:
+                job = self._pending.popleft()
+                self.active += 1
+                job(self._make_done())
+        finally:
+            self._draining = False
+
+    def _make_done(self):
+        called = False
+
+        def done():
+            nonlocal called
+            if called:
+                return
+            called = True
+            self.active -= 1
+            self._drain()
+
+        return done
@@ -0,0 +1,118 @@
+# alerts.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Decides which desktop notifications a usage result warrants.
+
+Kept free of GTK so the application can run it from the fetch loop
+whether or not a window exists.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from .burn_rate import Forecast
+from .formatting import format_duration, format_reset_time
+from .usage_model import RESET_TOLERANCE_SECONDS, SESSION, WEEKLY, UsageData
+
+SESSION_THRESHOLDS = (75, 90, 95)
+
+# Session usage below this means a new session, so thresholds re-arm.
+REARM_BELOW_PCT = 50
+
+# Buckets with forecast warnings, and what to call them.
+FORECAST_BUCKETS = {SESSION: "session", WEEKLY: "weekly"}
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    """A desktop notification to send."""
+
+    id: str
+    title: str
+    body: str
+
+
+class UsageAlerts:
+    """Remembers which alerts have fired, so each fires once per window."""
+
+    def __init__(self):
+        self._thresholds: set[int] = set()
+        # Reset time of the window each bucket last warned about.
+        self._forecasts: dict[str, datetime | None] = {}
+
+    def threshold_alerts(
+        self, data: UsageData, thresholds: Iterable[int], *, now: datetime | None = None
+    ) -> list[Alert]:
+        """Alerts for session thresholds crossed since the session began.
+
+        Only session usage is tracked. Session limits reset every 5 hours
+        and are the most immediately actionable; weekly limits are shown
+        in the dashboard but do not trigger alerts.
+        """
+        pct = data.session_pct
+        if pct is None:
+            return []
+
+        alerts = []
+        for threshold in thresholds:
+            if pct >= threshold and threshold not in self._thresholds:
+                self._thresholds.add(threshold)
+                reset_text = format_reset_time(data.session_resets_at, now=now)
+                if reset_text == "now":
+                    body = f"Session usage has reached {threshold} %. Resets now."
+                else:
+                    body = f"Session usage has reached {threshold} %. Resets in {reset_text}."
+                alerts.append(Alert(f"threshold-{threshold}", f"Leeway: {pct:.0f} %", body))
+
+        # Usage dropping back (i.e. after a session reset) re-arms every
+        # threshold for the new session.
+        if pct < REARM_BELOW_PCT:
+            self._thresholds.clear()
+        return alerts
+
+    def forecast_alerts(
+        self, forecasts: Iterable[Forecast | None], *, now: datetime | None = None
+    ) -> list[Alert]:
+        """Alerts for limits projected to arrive before their reset, once per window."""
+        alerts = []
+        for forecast in forecasts:
+            if forecast is None or not forecast.before_reset:
+                continue
+            name = FORECAST_BUCKETS.get(forecast.key)
+            if name is None or self._warned(forecast):
+                continue
+            self._forecasts[forecast.key] = forecast.resets_at
+
+            limit_in = format_reset_time(forecast.limit_at, now=now)
+            body = f"At this rate, {name} usage will reach its limit in {limit_in}"
+            if forecast.resets_at is not None:
+                margin = (forecast.resets_at - forecast.limit_at).total_seconds()
+                body += f", {format_duration(margin)} before it resets"
+            alerts.append(Alert(f"forecast-{forecast.key}", f"Leeway: {name} limit in {limit_in}", f"{body}."))
+        return alerts
+
+    def _warned(self, forecast: Forecast) -> bool:
+        """Whether this forecast's window was already warned about."""
+        if forecast.key not in self._forecasts:
+            return False
+        warned = self._forecasts[forecast.key]
+        if warned is None or forecast.resets_at is None:
+            return warned is forecast.resets_at
+        return abs((forecast.resets_at - warned).total_seconds()) <= RESET_TOLERANCE_SECONDS
@@ -20,11 +20,18 @@
 """Pure protocol logic for the Anthropic usage API."""
 
 import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
+from . import tracing
 from .config import APP_ID, VERSION
+from .metrics import PARSE, get_metrics
 from .usage_model import UsageData, parse_usage_response
 
 API_URL = "https://api.anthropic.com/api/oauth/usage"
+API_URL_ENV = "LEEWAY_API_URL"  # overrides API_URL, e.g. to point at a local mock
 USER_AGENT = f"{APP_ID}/{VERSION}"
 
 
@@ -32,6 +39,11 @@ class ApiError(Exception):
     """Raised when an API request fails."""
 
 
+def get_api_url() -> str:
+    """Return the usage endpoint URL, honouring the LEEWAY_API_URL override."""
+    return os.environ.get(API_URL_ENV) or API_URL
+
+
 def build_request_headers(access_token: str) -> dict[str, str]:
     """Build the HTTP headers for the usage endpoint."""
     return {
@@ -41,18 +53,145 @@ def build_request_headers(access_token: str) -> dict[str, str]:
     }
 
 
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    """Parse a Retry-After header into a number of seconds.
+
+    Accepts both forms allowed by RFC 9110: delta-seconds and an HTTP-date.
+    Returns None if the header is absent or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    # email pulls in socket and urllib; only HTTP-dates need it.
+    from email.utils import parsedate_to_datetime
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
 def parse_response_body(body: str) -> UsageData:
     """Parse a JSON response body into UsageData.
 
     Raises:
         ApiError: If the body is not valid JSON or not a JSON object.
     """
-    try:
-        raw = json.loads(body)
-    except (json.JSONDecodeError, ValueError) as exc:
-        raise ApiError(f"Failed to parse API response: {exc}") from exc
+    started = time.perf_counter()
+    with tracing.span("parse", bytes=len(body)):
+        try:
+            raw = json.loads(body)
+        except (json.JSONDecodeError, ValueError) as exc:
+            raise ApiError(f"Failed to parse API response: {exc}") from exc
+
+        if not isinstance(raw, dict):
+            raise ApiError("Failed to parse API response: expected JSON object")
+
+        data = parse_usage_response(raw)
+    get_metrics().record(PARSE, time.perf_counter() - started)
+    return data
+
+
+def fingerprint_body(body: bytes) -> str:
+    """Return a short, stable fingerprint of a raw response body."""
+    import hashlib  # only the libsoup fetcher's cache needs it
+
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+@dataclass
+class FetchStats:
+    """Counters recording which path each successful response took."""
+
+    parsed: int = 0        # body changed and was parsed in full
+    unchanged: int = 0     # body matched the previous fingerprint
+    not_modified: int = 0  # server answered 304 Not Modified
+
+
+class ResponseCache:
+    """Remembers the last successful response so repeats skip parsing.
+
+    The cache is scoped to a single access token: responses for one
+    account must never be served for another.
+    """
+
+    def __init__(self):
+        self.stats = FetchStats()
+        self.clear()
+
+    def clear(self):
+        """Forget the cached response and validators (counters are kept)."""
+        self._token_key: str | None = None
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.fingerprint: str | None = None
+        self.data: UsageData | None = None
+
+    def bind_token(self, access_token: str):
+        """Scope the cache to an access token, clearing it if the token changed."""
+        key = fingerprint_body(access_token.encode("utf-8"))
+        if key != self._token_key:
+            self.clear()
+            self._token_key = key
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for the next request."""
+        if self.data is None:
+            return {}
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def resolve_not_modified(self) -> UsageData | None:
+        """Return the cached data for a 304 response, or None if nothing is cached."""
+        if self.data is None:
+            return None
+        self.stats.not_modified += 1
+        return self.data
+
+    def resolve(
+        self,
+        body: bytes,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> tuple[UsageData, bool]:
+        """Resolve a 200 response body into UsageData.
+
+        Returns:
+            A (data, unchanged) tuple. When the body matches the previous
+            one byte for byte, the cached UsageData is returned without
+            decoding or parsing, and unchanged is True.
+
+        Raises:
+            ApiError: If the body cannot be decoded or parsed.
+        """
+        fingerprint = fingerprint_body(body)
+
+        if self.data is not None and fingerprint == self.fingerprint:
+            self.etag = etag
+            self.last_modified = last_modified
+            self.stats.unchanged += 1
+            return self.data, True
 
-    if not isinstance(raw, dict):
-        raise ApiError("Failed to parse API response: expected JSON object")
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise ApiError(f"Failed to read response: {exc}") from exc
 
-    return parse_usage_response(raw)
+        data = parse_response_body(text)
+        self.fingerprint = fingerprint
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stats.parsed += 1
+        return data, False
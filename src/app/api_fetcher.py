@@ -19,66 +19,225 @@
 
 """Async HTTP layer for fetching usage data via libsoup3."""
 
+import time
+
 import gi
 
 gi.require_version("Soup", "3.0")
 
-from gi.repository import Gio, GLib, Soup
+from gi.repository import Gio, GLib
+
+from .api_client import (
+    ApiError,
+    FetchStats,
+    ResponseCache,
+    build_request_headers,
+    get_api_url,
+    parse_retry_after,
+)
+from . import tracing
+from .metrics import FETCH, get_metrics, request_phases
+from .request_governor import CircuitState, RequestGovernor
 
-from .api_client import API_URL, ApiError, build_request_headers, parse_response_body
+# Hard limit on a whole request, from connect to the last body byte.
+REQUEST_DEADLINE_SECONDS = 20
 
 # Module-level session — reused across requests, avoids GC disposal warnings.
-# Short idle timeout prevents stale keep-alive connections from causing
-# "Socket I/O timed out" errors when the refresh interval elapses.
-_session = Soup.Session()
-_session.set_idle_timeout(10)
+# Created by the first fetch, so that loading libsoup stays off the
+# startup path; see _get_session().
+_session = None
+
+# Last successful response, used to skip parsing when nothing has changed.
+_cache = ResponseCache()
+
+# Backoff and circuit breaker shared by every request through _session.
+_governor = RequestGovernor()
+
+
+def _get_session():
+    """Return the shared Soup.Session, creating it on first use."""
+    global _session
+    if _session is None:
+        from gi.repository import Soup
 
+        _session = Soup.Session()
+        # Short idle timeout prevents stale keep-alive connections from
+        # causing "Socket I/O timed out" errors when the refresh interval
+        # elapses.
+        _session.set_idle_timeout(10)
+    return _session
 
-def fetch_usage(access_token: str, callback, cancellable: Gio.Cancellable | None = None):
+
+def get_governor() -> RequestGovernor:
+    """Return the governor, e.g. to report how long until the next retry."""
+    return _governor
+
+
+def get_fetch_stats() -> FetchStats:
+    """Return counters for the parsed / unchanged / not-modified paths."""
+    return _cache.stats
+
+
+def fetch_usage(
+    access_token: str,
+    callback,
+    cancellable: Gio.Cancellable | None = None,
+    *,
+    cache: ResponseCache | None = None,
+    governor: RequestGovernor | None = None,
+):
     """Fetch usage data asynchronously using libsoup3.
 
     Args:
         access_token: OAuth Bearer token.
-        callback: Called with (UsageData | None, str | None).
-            On success: callback(data, None).
-            On failure: callback(None, error_message).
+        callback: Called with (UsageData | None, str | None, bool).
+            On success: callback(data, None, unchanged), where unchanged
+            is True when the response matched the previous one and data
+            is the cached UsageData.
+            On failure: callback(None, error_message, False).
+            While the governor is backing off, the callback is invoked
+            with the last error and no request is sent.
         cancellable: Optional GCancellable to abort the request.
+        cache: Response cache for this account; defaults to the shared one.
+        governor: Governor for this account; defaults to the shared one.
     """
-    message = Soup.Message.new("GET", API_URL)
+    if cache is None:
+        cache = _cache
+    if governor is None:
+        governor = _governor
+
+    if not governor.allow_request():
+        callback(None, governor.last_error or "Waiting before retrying", False)
+        return
+    probe = governor.state is CircuitState.HALF_OPEN
 
+    session = _get_session()
+    from gi.repository import Soup
+
+    message = Soup.Message.new("GET", get_api_url())
+    message.add_flags(Soup.MessageFlags.COLLECT_METRICS)
+    started = time.perf_counter()
+
+    cache.bind_token(access_token)
     headers = build_request_headers(access_token)
+    headers.update(cache.conditional_headers())
     request_headers = message.get_request_headers()
     for name, value in headers.items():
         request_headers.append(name, value)
 
-    def on_response(_session, result):
+    # The request gets its own cancellable so the deadline can abort it
+    # without cancelling the caller's, which may be shared.
+    request_cancellable = Gio.Cancellable()
+    timed_out = False
+
+    def on_deadline():
+        nonlocal timed_out, deadline_id
+        timed_out = True
+        deadline_id = None
+        request_cancellable.cancel()
+        return GLib.SOURCE_REMOVE
+
+    deadline_id = GLib.timeout_add_seconds(REQUEST_DEADLINE_SECONDS, on_deadline)
+
+    def on_cancelled(_cancellable):
+        # Release a half-open probe now rather than when libsoup reports
+        # the cancellation, so the forced refresh replacing it is let through.
+        if probe:
+            governor.record_cancelled()
+        request_cancellable.cancel()
+
+    caller_handler = None
+    if cancellable is not None:
+        caller_handler = cancellable.connect("cancelled", on_cancelled)
+        if cancellable.is_cancelled():
+            on_cancelled(cancellable)
+
+    def fail(error: str, retry_after: float | None = None):
+        governor.record_failure(error, retry_after=retry_after)
+        callback(None, error, False)
+
+    def handle_response(_session, result):
+        if deadline_id is not None:
+            GLib.source_remove(deadline_id)
+        if caller_handler is not None:
+            cancellable.disconnect(caller_handler)
+
         try:
             gbytes = _session.send_and_read_finish(result)
         except GLib.Error as exc:
-            # Silently ignore cancellation — the window is closing.
             if exc.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                if timed_out:
+                    fail(f"Request timed out after {REQUEST_DEADLINE_SECONDS} s")
+                    return
+                # Silently ignore cancellation: the window is closing or a
+                # newer request replaced this one. on_cancelled() has
+                # already released the governor.
                 return
-            callback(None, f"HTTP request failed: {exc.message}")
+            fail(f"HTTP request failed: {exc.message}")
             return
+        _record_metrics(message, time.perf_counter() - started)
 
         status = message.get_status()
-        if status != Soup.Status.OK:
-            phrase = Soup.Status.get_phrase(status)
-            callback(None, f"API returned {int(status)}: {phrase}")
+        if status == Soup.Status.NOT_MODIFIED:
+            data = cache.resolve_not_modified()
+            if data is None:
+                fail("API returned 304 without a cached response")
+                return
+            governor.record_success()
+            callback(data, None, True)
             return
 
-        try:
-            body = gbytes.get_data().decode("utf-8")
-        except Exception as exc:
-            callback(None, f"Failed to read response: {exc}")
+        if status != Soup.Status.OK:
+            phrase = Soup.Status.get_phrase(status)
+            retry_after = parse_retry_after(
+                message.get_response_headers().get_one("Retry-After")
+            )
+            fail(f"API returned {int(status)}: {phrase}", retry_after)
             return
 
+        response_headers = message.get_response_headers()
         try:
-            data = parse_response_body(body)
+            data, unchanged = cache.resolve(
+                gbytes.get_data() or b"",
+                etag=response_headers.get_one("ETag"),
+                last_modified=response_headers.get_one("Last-Modified"),
+            )
         except ApiError as exc:
-            callback(None, str(exc))
+            fail(str(exc))
             return
 
-        callback(data, None)
+        governor.record_success()
+        callback(data, None, unchanged)
+
+    send_span = tracing.start("soup send")
 
-    _session.send_and_read_async(message, GLib.PRIORITY_DEFAULT, cancellable, on_response)
+    def on_response(_session, result):
+        tracing.finish(send_span, status=int(message.get_status()))
+        with tracing.span("response callback"):
+            handle_response(_session, result)
+
+    session.send_and_read_async(
+        message, GLib.PRIORITY_DEFAULT, request_cancellable, on_response
+    )
+
+
+def _record_metrics(message, elapsed: float):
+    """Record the request's total time and libsoup's per-stage timings."""
+    metrics = get_metrics()
+    metrics.record(FETCH, elapsed)
+    soup_metrics = message.get_metrics()
+    if soup_metrics is None:
+        return
+    phases = request_phases(
+        dns_start=soup_metrics.get_dns_start(),
+        dns_end=soup_metrics.get_dns_end(),
+        connect_start=soup_metrics.get_connect_start(),
+        tls_start=soup_metrics.get_tls_start(),
+        connect_end=soup_metrics.get_connect_end(),
+        request_start=soup_metrics.get_request_start(),
+        response_start=soup_metrics.get_response_start(),
+        response_end=soup_metrics.get_response_end(),
+    )
+    for name, seconds in phases.items():
+        metrics.record(name, seconds)
+    metrics.count("connections.opened" if soup_metrics.get_connect_start() else "connections.reused")
@@ -0,0 +1,148 @@
+# burn_rate.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Burn-rate forecasting: when will usage hit the limit at the current pace?"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from .usage_model import SESSION, UsageData
+
+LIMIT_PCT = 100.0
+
+# Time constant of the rate average, in seconds: how far back the
+# estimate effectively looks. Session usage moves in minutes, weekly
+# usage in hours.
+SESSION_TIME_CONSTANT = 15 * 60
+DEFAULT_TIME_CONSTANT = 6 * 60 * 60
+
+# Don't forecast until the rate has been observed for at least this
+# fraction of its time constant; a couple of early samples are noise.
+MIN_SPAN_FRACTION = 0.2
+
+# A fall of more than this many points is a reset; smaller dips are noise
+# (e.g. a rounded "utilization" following a precise "utilization_pct").
+RESET_DROP_PCT = 5.0
+
+# Rates below this (points per second, ~0.036 points an hour) count as idle.
+MIN_RATE = 1e-5
+
+
+@dataclass(frozen=True, slots=True)
+class Forecast:
+    """Projected time at which a bucket reaches the limit."""
+
+    key: str
+    rate: float  # percentage points per second
+    limit_at: datetime
+    resets_at: datetime | None
+
+    @property
+    def before_reset(self) -> bool:
+        """True if the limit is projected to arrive before the bucket resets."""
+        return self.resets_at is None or self.limit_at < self.resets_at
+
+
+class BurnRateEstimator:
+    """Exponentially weighted rate of change for one bucket.
+
+    Each sample costs O(1) time and the estimator keeps O(1) state. The
+    weight of a new sample depends on how long ago the previous one was,
+    so irregular polling (backoff, adaptive intervals) does not skew the
+    average. A sharp drop in usage is a reset, which starts the estimate
+    over.
+    """
+
+    __slots__ = ("time_constant", "_average", "span", "last_at", "last_pct")
+
+    def __init__(self, time_constant: float):
+        self.time_constant = time_constant
+        self._average = 0.0
+        self.span = 0.0  # seconds of history behind the estimate
+        self.last_at: datetime | None = None
+        self.last_pct: float | None = None
+
+    def add(self, pct: float, at: datetime):
+        """Feed one sample."""
+        if self.last_at is None or pct < self.last_pct - RESET_DROP_PCT:
+            self._average = 0.0
+            self.span = 0.0
+        else:
+            elapsed = (at - self.last_at).total_seconds()
+            if elapsed <= 0:
+                return
+            alpha = 1.0 - math.exp(-elapsed / self.time_constant)
+            self._average += alpha * ((pct - self.last_pct) / elapsed - self._average)
+            self.span += elapsed
+        self.last_at = at
+        self.last_pct = pct
+
+    @property
+    def rate(self) -> float:
+        """Average rate of change, in percentage points per second."""
+        # The average starts at zero; divide out the weight that start still
+        # carries so young estimates aren't biased low.
+        weight = 1.0 - math.exp(-self.span / self.time_constant)
+        return self._average / weight if weight > 0 else 0.0
+
+    @property
+    def ready(self) -> bool:
+        """True once enough history has been seen to trust the rate."""
+        return self.span >= self.time_constant * MIN_SPAN_FRACTION
+
+    def limit_at(self, limit: float = LIMIT_PCT) -> datetime | None:
+        """Projected time of reaching limit, or None if not climbing."""
+        if not self.ready or self.rate < MIN_RATE or self.last_pct >= limit:
+            return None
+        return self.last_at + timedelta(seconds=(limit - self.last_pct) / self.rate)
+
+
+class BurnRateForecaster:
+    """Burn-rate estimators for every bucket, fed from UsageData."""
+
+    def __init__(self):
+        self._estimators: dict[str, BurnRateEstimator] = {}
+        self._resets_at: dict[str, datetime | None] = {}
+
+    def record(self, data: UsageData, *, now: datetime | None = None):
+        """Feed one fetched sample."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+        for bucket in data.buckets:
+            if bucket.pct is None:
+                continue
+            estimator = self._estimators.get(bucket.key)
+            if estimator is None:
+                time_constant = (
+                    SESSION_TIME_CONSTANT if bucket.key == SESSION else DEFAULT_TIME_CONSTANT
+                )
+                estimator = self._estimators[bucket.key] = BurnRateEstimator(time_constant)
+            estimator.add(bucket.pct, now)
+            self._resets_at[bucket.key] = bucket.resets_at
+
+    def forecast(self, key: str) -> Forecast | None:
+        """Return the bucket's projected limit time, or None if it isn't climbing."""
+        estimator = self._estimators.get(key)
+        if estimator is None:
+            return None
+        limit_at = estimator.limit_at()
+        if limit_at is None:
+            return None
+        return Forecast(key, estimator.rate, limit_at, self._resets_at.get(key))
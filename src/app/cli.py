@@ -0,0 +1,199 @@
+# cli.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Command-line entry points that run without GTK.
+
+The launcher hands argv here before importing gi, so these commands
+work without a display. Modules only one command needs are imported
+when it runs, to keep `leeway --once` quick to start.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+COMMANDS = ("export",)
+ONCE_OPTION = "--once"
+
+# Modules `leeway --once` must not import when answering from its
+# snapshot: GTK, the history database, argparse (see _parse_once), and
+# what only the app or `leeway export` needs.
+ONCE_AVOIDS = (
+    "gi", "sqlite3", "threading", "queue", "hashlib", "shutil", "argparse",
+    f"{__package__}.exporter",
+)
+
+# The same as exporter.FORMATS, which is only imported by `leeway export`.
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+def _parse_bound(text: str):
+    import argparse
+
+    from . import exporter
+
+    try:
+        return exporter.parse_time(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid time {text!r}; use an ISO date or an age such as 7d or 12h"
+        ) from None
+
+
+def _age_seconds(text: str) -> float | None:
+    """Parse a number of seconds, or return None if it is not one (or negative)."""
+    try:
+        seconds = float(text)
+    except ValueError:
+        return None
+    return seconds if seconds >= 0 else None
+
+
+def _parse_age(text: str) -> float:
+    seconds = _age_seconds(text)
+    if seconds is None:
+        import argparse
+
+        raise argparse.ArgumentTypeError(f"invalid age {text!r}; use a number of seconds")
+    return seconds
+
+
+def build_parser():
+    """Build the argparse parser for every command and option."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="leeway")
+    parser.add_argument(
+        ONCE_OPTION, action="store_true",
+        help="Print current usage and exit, without starting the application",
+    )
+    parser.add_argument("--json", action="store_true", help="With --once, print JSON")
+    parser.add_argument(
+        "--max-age", type=_parse_age, metavar="SECONDS",
+        help="With --once, answer from the last snapshot if it is at most this old",
+    )
+    parser.add_argument("--credentials", type=Path, help="With --once, credentials file to read")
+    commands = parser.add_subparsers(dest="command")
+
+    export = commands.add_parser("export", help="Export recorded usage history")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export.add_argument("--since", type=_parse_bound, help="Start time: ISO date or age (7d, 12h)")
+    export.add_argument("--until", type=_parse_bound, help="End time: ISO date or age")
+    export.add_argument(
+        "--bucket", action="append", dest="buckets", metavar="KEY",
+        help="Only this bucket, e.g. five_hour (repeatable)",
+    )
+    export.add_argument("--database", type=Path, help="History database to read")
+    export.add_argument("-o", "--output", type=Path, help="Output file (default: stdout)")
+    return parser
+
+
+def _once(args) -> int:
+    from . import oneshot
+    from .api_client import ApiError
+    from .credential_reader import CredentialError
+
+    try:
+        snapshot, cached = oneshot.query(max_age=args.max_age, credentials_path=args.credentials)
+    except (CredentialError, ApiError) as exc:
+        print(f"leeway: {exc}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(oneshot.format_json(snapshot, cached=cached))
+    else:
+        print(oneshot.format_line(snapshot.data))
+    return 0
+
+
+def _export(args) -> int:
+    import sqlite3
+
+    from . import exporter
+
+    try:
+        output = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8", newline="")
+    except OSError as exc:
+        print(f"leeway: cannot write {args.output}: {exc.strerror or exc}", file=sys.stderr)
+        return 1
+    try:
+        exporter.export(
+            output, args.format,
+            path=args.database, start=args.since, end=args.until, buckets=args.buckets,
+        )
+    except sqlite3.Error as exc:
+        print(f"leeway: cannot read usage history: {exc}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Piped into head or similar; not an error.
+        sys.stderr.close()
+        return 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def _parse_once(argv: list[str]):
+    """Parse a plain `--once` command line without building the full parser.
+
+    Importing argparse and building the parser cost several
+    milliseconds, much of the budget of a status-line query, so the
+    common forms are read here. Returns None for anything else, including any mistake, to
+    leave reporting it to argparse.
+    """
+    if ONCE_OPTION not in argv:
+        return None
+    options = {"once": True, "json": False, "max_age": None, "credentials": None, "command": None}
+    args = iter(argv)
+    for arg in args:
+        name, has_value, value = arg.partition("=")
+        if arg in (ONCE_OPTION, "--json"):
+            options[arg[2:]] = True
+        elif name in ("--max-age", "--credentials"):
+            if not has_value:
+                value = next(args, None)
+                if value is None:
+                    return None
+            if name == "--credentials":
+                options["credentials"] = Path(value)
+                continue
+            options["max_age"] = _age_seconds(value)
+            if options["max_age"] is None:
+                return None
+        else:
+            return None
+    return SimpleNamespace(**options)
+
+
+def main(argv: list[str]) -> int:
+    """Run a command; argv excludes the program name."""
+    args = _parse_once(argv)
+    if args is not None:
+        return _once(args)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.once:
+        if args.command is not None:
+            parser.error(f"{ONCE_OPTION} cannot be combined with a command")
+        return _once(args)
+    if args.json or args.max_age is not None or args.credentials is not None:
+        parser.error(f"--json, --max-age and --credentials need {ONCE_OPTION}")
+    if args.command == "export":
+        return _export(args)
+    parser.error(f"a command or {ONCE_OPTION} is required")
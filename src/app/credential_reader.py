@@ -20,10 +20,14 @@
 """Reads OAuth credentials from ~/.claude/.credentials.json."""
 
 import json
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
 
+from . import tracing
+from .metrics import CREDENTIALS_READ, get_metrics
+
 DEFAULT_CREDENTIALS_PATH = Path.home() / ".claude" / ".credentials.json"
 
 
@@ -46,27 +50,18 @@ class Credentials:
         return time.time() * 1000 >= self.expires_at
 
 
-def read_credentials(path: Path = DEFAULT_CREDENTIALS_PATH) -> Credentials:
-    """Read and parse OAuth credentials.
-
-    Args:
-        path: Path to the credentials JSON file.
-
-    Returns:
-        Credentials dataclass.
+def parse_credentials(text: str) -> Credentials:
+    """Parse the contents of a credentials file.
 
     Raises:
-        CredentialError: If the file is missing, malformed, or lacks required fields.
+        CredentialError: If the text is malformed or lacks required fields.
     """
-    if not path.exists():
-        raise CredentialError(f"Credentials file not found: {path}")
-
     try:
-        data = json.loads(path.read_text())
+        data = json.loads(text)
     except (json.JSONDecodeError, ValueError) as exc:
         raise CredentialError(f"Failed to parse credentials: {exc}") from exc
 
-    oauth = data.get("claudeAiOauth")
+    oauth = data.get("claudeAiOauth") if isinstance(data, dict) else None
     if oauth is None:
         raise CredentialError("Missing 'claudeAiOauth' key in credentials file")
 
@@ -81,3 +76,160 @@ def read_credentials(path: Path = DEFAULT_CREDENTIALS_PATH) -> Credentials:
         subscription_type=oauth.get("subscriptionType"),
         rate_limit_tier=oauth.get("rateLimitTier"),
     )
+
+
+def read_credentials(path: Path = DEFAULT_CREDENTIALS_PATH) -> Credentials:
+    """Read and parse OAuth credentials.
+
+    Args:
+        path: Path to the credentials JSON file.
+
+    Returns:
+        Credentials dataclass.
+
+    Raises:
+        CredentialError: If the file is missing, malformed, or lacks required fields.
+    """
+    started = time.perf_counter()
+    with tracing.span("read credentials"):
+        if not path.exists():
+            raise CredentialError(f"Credentials file not found: {path}")
+
+        credentials = parse_credentials(path.read_text())
+    get_metrics().record(CREDENTIALS_READ, time.perf_counter() - started)
+    return credentials
+
+
+def stat_signature(mtime_ns: int, inode: int, size: int) -> tuple[int, int, int]:
+    """Identify one version of a file.
+
+    The modification time is kept to microseconds, the precision GIO
+    reports, so a signature from ``os.stat`` matches one built from a
+    ``Gio.FileInfo`` for the same file.
+    """
+    return (mtime_ns // 1000, inode, size)
+
+
+class CredentialCache:
+    """The parsed credentials file, re-read only when it changes.
+
+    The cache does no I/O of its own beyond the synchronous ``get()``;
+    callers stat and read the file (asynchronously, in the app) and
+    report back through ``lookup()`` and ``store()``.
+
+    While ``watched`` is True a file monitor is expected to call
+    ``invalidate()`` on every change, so ``peek()`` can answer without
+    touching the disk. Even then the file is re-checked every
+    ``verify_interval`` seconds, in case the monitor misses a change
+    (network filesystems rarely report remote writes).
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CREDENTIALS_PATH,
+        *,
+        verify_interval: float = 300.0,
+        clock=time.monotonic,
+    ):
+        self.path = path
+        self.verify_interval = verify_interval
+        self.watched = False
+        self.stat_count = 0
+        self.parse_count = 0
+        self._clock = clock
+        self._credentials: Credentials | None = None
+        self._signature: tuple[int, int, int] | None = None
+        self._verified_at: float | None = None
+
+    def invalidate(self):
+        """Forget that the file was checked; the next lookup stats it again."""
+        self._verified_at = None
+
+    def peek(self) -> Credentials | None:
+        """Return the credentials if they are known to be current, without I/O."""
+        if not self.watched or self._credentials is None or self._verified_at is None:
+            return None
+        if self._clock() - self._verified_at >= self.verify_interval:
+            return None
+        return self._credentials
+
+    def lookup(self, signature: tuple[int, int, int]) -> Credentials | None:
+        """Return the cached credentials if the file still has this signature.
+
+        Each call counts as one stat. None means the file must be read
+        and passed to ``store()``.
+        """
+        self.stat_count += 1
+        if self._credentials is None or signature != self._signature:
+            return None
+        self._verified_at = self._clock()
+        return self._credentials
+
+    def store(self, text: str, signature: tuple[int, int, int] | None) -> Credentials:
+        """Parse freshly read file contents and remember them.
+
+        Raises:
+            CredentialError: If the text cannot be parsed. The previous
+                credentials are dropped, so the error repeats until the
+                file is fixed.
+        """
+        self.parse_count += 1
+        self._credentials = None
+        self._signature = None
+        credentials = parse_credentials(text)
+        self._credentials = credentials
+        self._signature = signature
+        self._verified_at = self._clock()
+        return credentials
+
+    def get(self) -> Credentials:
+        """Synchronously return current credentials, reading only on change.
+
+        Raises:
+            CredentialError: If the file is missing or invalid.
+        """
+        credentials = self.peek()
+        if credentials is not None:
+            return credentials
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self.stat_count += 1
+            raise CredentialError(f"Credentials file not found: {self.path}") from None
+        except OSError as exc:
+            self.stat_count += 1
+            raise CredentialError(f"Failed to read credentials: {exc}") from exc
+        signature = stat_signature(st.st_mtime_ns, st.st_ino, st.st_size)
+        credentials = self.lookup(signature)
+        if credentials is not None:
+            return credentials
+        try:
+            text = self.path.read_text()
+        except OSError as exc:
+            raise CredentialError(f"Failed to read credentials: {exc}") from exc
+        return self.store(text, signature)
+
+
+def discover_credential_files(sources) -> list[Path]:
+    """Expand a list of credential files and directories into credential files.
+
+    Directories contribute every ``*.json`` file directly inside them, in
+    name order. Missing paths are skipped and duplicates are dropped, so
+    the result is stable from one call to the next.
+    """
+    found: list[Path] = []
+    seen: set[Path] = set()
+    for source in sources:
+        source = Path(source).expanduser()
+        if source.is_dir():
+            candidates = sorted(p for p in source.glob("*.json") if p.is_file())
+        elif source.is_file():
+            candidates = [source]
+        else:
+            continue
+        for candidate in candidates:
+            resolved = candidate.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                found.append(candidate)
+    return found
@@ -0,0 +1,151 @@
+# credential_watcher.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Credentials kept current by a file monitor and loaded without blocking."""
+
+from pathlib import Path
+
+from gi.repository import Gio, GLib
+
+from .credential_reader import (
+    DEFAULT_CREDENTIALS_PATH,
+    CredentialCache,
+    CredentialError,
+    stat_signature,
+)
+
+_STAT_ATTRIBUTES = ",".join((
+    Gio.FILE_ATTRIBUTE_TIME_MODIFIED,
+    Gio.FILE_ATTRIBUTE_TIME_MODIFIED_USEC,
+    Gio.FILE_ATTRIBUTE_UNIX_INODE,
+    Gio.FILE_ATTRIBUTE_STANDARD_SIZE,
+))
+
+
+def _info_signature(info: Gio.FileInfo) -> tuple[int, int, int]:
+    seconds = info.get_attribute_uint64(Gio.FILE_ATTRIBUTE_TIME_MODIFIED)
+    usec = info.get_attribute_uint32(Gio.FILE_ATTRIBUTE_TIME_MODIFIED_USEC)
+    return stat_signature(
+        (seconds * 1_000_000 + usec) * 1000,
+        info.get_attribute_uint64(Gio.FILE_ATTRIBUTE_UNIX_INODE),
+        info.get_size(),
+    )
+
+
+def _is_cancelled(exc: GLib.Error) -> bool:
+    return exc.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED)
+
+
+class CredentialWatcher:
+    """Load a credentials file asynchronously, re-parsing it only on change.
+
+    With ``watch=True`` a Gio.FileMonitor invalidates the cache whenever
+    the file changes, so most loads complete without any I/O. Without a
+    monitor (or if one cannot be created) each load costs one async
+    stat, and the file is only read when its mtime, inode or size moves.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CREDENTIALS_PATH, *, watch: bool = True):
+        self.cache = CredentialCache(path)
+        self._file = Gio.File.new_for_path(str(path))
+        self._monitor = None
+        self._monitor_handler = 0
+        if watch:
+            try:
+                self._monitor = self._file.monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            except GLib.Error:
+                self._monitor = None  # fall back to stat checks
+            else:
+                self._monitor_handler = self._monitor.connect("changed", self._on_file_changed)
+                self.cache.watched = True
+
+    @property
+    def path(self) -> Path:
+        return self.cache.path
+
+    def close(self):
+        """Stop watching the file."""
+        if self._monitor is not None:
+            self._monitor.disconnect(self._monitor_handler)
+            self._monitor.cancel()
+            self._monitor = None
+        self.cache.watched = False
+
+    def load(self, callback, cancellable: Gio.Cancellable | None = None):
+        """Fetch current credentials.
+
+        Args:
+            callback: Called with (credentials, error) on the main thread;
+                immediately when the cache is known to be current. Not
+                called at all if the load is cancelled.
+            cancellable: Optional Gio.Cancellable to abandon the load.
+        """
+        credentials = self.cache.peek()
+        if credentials is not None:
+            callback(credentials, None)
+            return
+
+        def on_loaded(gfile, result, signature):
+            try:
+                _ok, contents, _etag = gfile.load_contents_finish(result)
+            except GLib.Error as exc:
+                if not _is_cancelled(exc):
+                    callback(None, self._describe(exc))
+                return
+            try:
+                credentials = self.cache.store(
+                    contents.decode("utf-8", errors="replace"), signature
+                )
+            except CredentialError as exc:
+                callback(None, str(exc))
+                return
+            callback(credentials, None)
+
+        def on_info(gfile, result):
+            try:
+                info = gfile.query_info_finish(result)
+            except GLib.Error as exc:
+                if not _is_cancelled(exc):
+                    self.cache.stat_count += 1
+                    callback(None, self._describe(exc))
+                return
+            signature = _info_signature(info)
+            credentials = self.cache.lookup(signature)
+            if credentials is not None:
+                callback(credentials, None)
+                return
+            gfile.load_contents_async(
+                cancellable, lambda f, r: on_loaded(f, r, signature)
+            )
+
+        self._file.query_info_async(
+            _STAT_ATTRIBUTES,
+            Gio.FileQueryInfoFlags.NONE,
+            GLib.PRIORITY_DEFAULT,
+            cancellable,
+            on_info,
+        )
+
+    def _describe(self, exc: GLib.Error) -> str:
+        if exc.matches(Gio.io_error_quark(), Gio.IOErrorEnum.NOT_FOUND):
+            return f"Credentials file not found: {self.path}"
+        return f"Failed to read credentials: {exc.message}"
+
+    def _on_file_changed(self, _monitor, _file, _other_file, _event):
+        self.cache.invalidate()
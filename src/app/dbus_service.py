@@ -0,0 +1,162 @@
+# dbus_service.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""D-Bus interface exposing the latest usage to other desktop consumers."""
+
+import math
+
+from gi.repository import Gio, GLib
+
+from .usage_model import UsageData
+
+INTERFACE_NAME = 'me.stephenlewis.Leeway.Usage'
+OBJECT_PATH = '/me/stephenlewis/Leeway/Usage'
+ERROR_FAILED = 'me.stephenlewis.Leeway.Error.Failed'
+
+# Percentages are NaN and timestamps 0 when unknown, since D-Bus has no null.
+INTERFACE_XML = f'''<node>
+  <interface name="{INTERFACE_NAME}">
+    <method name="Refresh"/>
+    <signal name="Changed">
+      <arg name="properties" type="a{{sv}}"/>
+    </signal>
+    <property name="SessionPercent" type="d" access="read"/>
+    <property name="SessionResetsAt" type="x" access="read"/>
+    <property name="WeeklyPercent" type="d" access="read"/>
+    <property name="WeeklyResetsAt" type="x" access="read"/>
+    <property name="OpusPercent" type="d" access="read"/>
+    <property name="OpusResetsAt" type="x" access="read"/>
+    <property name="Buckets" type="a(sdx)" access="read"/>
+    <property name="UpdatedAt" type="x" access="read"/>
+    <property name="LastError" type="s" access="read"/>
+  </interface>
+</node>'''
+
+
+def _pct(value: float | None) -> GLib.Variant:
+    return GLib.Variant('d', math.nan if value is None else float(value))
+
+
+def _epoch(value) -> GLib.Variant:
+    return GLib.Variant('x', 0 if value is None else int(value.timestamp()))
+
+
+def usage_properties(data: UsageData | None, updated_at, error: str | None) -> dict[str, GLib.Variant]:
+    """Convert the monitor's state into D-Bus property values."""
+    data = data or UsageData()
+    return {
+        'SessionPercent': _pct(data.session_pct),
+        'SessionResetsAt': _epoch(data.session_resets_at),
+        'WeeklyPercent': _pct(data.weekly_pct),
+        'WeeklyResetsAt': _epoch(data.weekly_resets_at),
+        'OpusPercent': _pct(data.opus_pct),
+        'OpusResetsAt': _epoch(data.opus_resets_at),
+        'Buckets': GLib.Variant('a(sdx)', [
+            (
+                bucket.key,
+                math.nan if bucket.pct is None else float(bucket.pct),
+                0 if bucket.resets_at is None else int(bucket.resets_at.timestamp()),
+            )
+            for bucket in data.buckets
+        ]),
+        'UpdatedAt': _epoch(updated_at),
+        'LastError': GLib.Variant('s', error or ''),
+    }
+
+
+class LeewayUsageService:
+    """Exports a usage monitor on a D-Bus connection.
+
+    Args:
+        monitor: The LeewayUsageMonitor to publish.
+        on_used: Optional callable invoked on every method call or
+            property read, e.g. so the application can hold itself alive
+            once something depends on it.
+    """
+
+    def __init__(self, monitor, on_used=None):
+        self._monitor = monitor
+        self._on_used = on_used
+        self._connection: Gio.DBusConnection | None = None
+        self._registration_id = 0
+        self._handlers = []
+        self._info = Gio.DBusNodeInfo.new_for_xml(INTERFACE_XML).interfaces[0]
+
+    def register(self, connection: Gio.DBusConnection):
+        """Export the interface on connection. Raises GLib.Error on failure."""
+        self._registration_id = connection.register_object(
+            OBJECT_PATH, self._info, self._on_method_call, self._on_get_property, None,
+        )
+        self._connection = connection
+        self._handlers = [
+            self._monitor.connect('updated', self._on_changed),
+            self._monitor.connect('failed', self._on_changed),
+        ]
+
+    def unregister(self):
+        """Withdraw the interface and stop listening to the monitor."""
+        for handler in self._handlers:
+            self._monitor.disconnect(handler)
+        self._handlers.clear()
+        if self._connection is not None and self._registration_id:
+            self._connection.unregister_object(self._registration_id)
+        self._connection = None
+        self._registration_id = 0
+
+    def _properties(self) -> dict[str, GLib.Variant]:
+        monitor = self._monitor
+        return usage_properties(monitor.data, monitor.updated_at, monitor.error)
+
+    def _notify_used(self):
+        if self._on_used is not None:
+            self._on_used()
+
+    def _on_method_call(self, _connection, _sender, _path, _interface, method, _params, invocation):
+        self._notify_used()
+        if method != 'Refresh':
+            invocation.return_dbus_error(
+                'org.freedesktop.DBus.Error.UnknownMethod', f'Unknown method {method}'
+            )
+            return
+
+        def on_done(_data, error):
+            if error:
+                invocation.return_dbus_error(ERROR_FAILED, error)
+            else:
+                invocation.return_value(None)
+
+        # Joins any request already in flight.
+        self._monitor.refresh(on_done)
+
+    def _on_get_property(self, _connection, _sender, _path, _interface, name):
+        self._notify_used()
+        return self._properties().get(name)
+
+    def _on_changed(self, *_args):
+        if self._connection is None:
+            return
+        properties = self._properties()
+        self._connection.emit_signal(
+            None, OBJECT_PATH, INTERFACE_NAME, 'Changed',
+            GLib.Variant('(a{sv})', (properties,)),
+        )
+        self._connection.emit_signal(
+            None, OBJECT_PATH, 'org.freedesktop.DBus.Properties', 'PropertiesChanged',
+            GLib.Variant('(sa{sv}as)', (INTERFACE_NAME, properties, [])),
+        )
@@ -0,0 +1,103 @@
+# diagnostics.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Diagnostics dialog: refresh pipeline timings and counters."""
+
+from gi.repository import Adw, Gtk
+
+from .api_fetcher import get_fetch_stats
+from .metrics import COUNTER_TITLES, STAGE_TITLES, describe, get_metrics
+
+
+@Gtk.Template(resource_path='/me/stephenlewis/Leeway/diagnostics-dialog.ui')
+class LeewayDiagnosticsDialog(Adw.PreferencesDialog):
+    __gtype_name__ = 'LeewayDiagnosticsDialog'
+
+    timings_group = Gtk.Template.Child()
+    counters_group = Gtk.Template.Child()
+    reset_button = Gtk.Template.Child()
+
+    def __init__(self, monitor, window=None, **kwargs):
+        super().__init__(**kwargs)
+        self._monitor = monitor
+        self._window = window
+        self._rows: dict[tuple[Adw.PreferencesGroup, str], Adw.ActionRow] = {}
+
+        # Follow each refresh, but only while the dialog is open; the
+        # pipeline itself just bumps counters.
+        self._handlers = [
+            monitor.connect("updated", lambda *_: self._update()),
+            monitor.connect("failed", lambda *_: self._update()),
+        ]
+        self.connect("closed", self._on_closed)
+        self.reset_button.connect("clicked", self._on_reset)
+        self._update()
+
+    def _on_closed(self, _dialog):
+        for handler in self._handlers:
+            self._monitor.disconnect(handler)
+        self._handlers.clear()
+
+    def _on_reset(self, _button):
+        get_metrics().reset()
+        self._update()
+
+    def _row(self, group: Adw.PreferencesGroup, title: str) -> Adw.ActionRow:
+        row = self._rows.get((group, title))
+        if row is None:
+            row = Adw.ActionRow(title=title, subtitle_selectable=True)
+            row.add_css_class("property")
+            group.add(row)
+            self._rows[group, title] = row
+        return row
+
+    def _update(self):
+        metrics = get_metrics()
+        for name, title in STAGE_TITLES.items():
+            histogram = metrics.histograms.get(name)
+            self._row(self.timings_group, title).set_subtitle(
+                describe(histogram) if histogram is not None else "No samples yet"
+            )
+
+        for title, value in self._counters():
+            self._row(self.counters_group, title).set_subtitle(str(value))
+
+    def _counters(self) -> list[tuple[str, int]]:
+        """Every counter worth showing, as (title, value)."""
+        counters = get_metrics().counters
+        rows = [(title, counters.get(name, 0)) for name, title in COUNTER_TITLES.items()]
+
+        fetch = get_fetch_stats()
+        flight = self._monitor.flight_stats
+        cache = self._monitor.credentials.cache
+        history = self._monitor.history
+        rows += [
+            ("Responses parsed", fetch.parsed),
+            ("Responses unchanged", fetch.unchanged),
+            ("Responses not modified (304)", fetch.not_modified),
+            ("Refresh triggers joining a pending request", flight.coalesced),
+            ("Credential file checks", cache.stat_count),
+            ("Credential file parses", cache.parse_count),
+            ("History samples written", history.samples_written),
+        ]
+
+        view_state = getattr(self._window, "view_state", None)
+        if view_state is not None:
+            rows.append(("Widget changes in the last refresh", view_state.refresh_updates))
+        return rows
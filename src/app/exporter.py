@@ -0,0 +1,181 @@
+# exporter.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Streaming export of the usage history to CSV or JSON Lines."""
+
+import csv
+import io
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+FORMATS = ("csv", "jsonl")
+CSV_HEADER = ("timestamp", "bucket", "utilization_pct", "resets_at")
+
+# Rows fetched from SQLite at a time, so memory use does not grow with the
+# history; also how often cancellation is checked.
+BATCH_SIZE = 1000
+
+_RELATIVE = re.compile(r"^(\d+)([mhdw])$")
+_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled part way through."""
+
+
+def parse_time(text: str, *, now: datetime | None = None) -> datetime:
+    """Parse an export bound.
+
+    Accepts a relative age ("30m", "12h", "7d", "2w", meaning that long
+    before now) or an ISO 8601 date or date-time; times without an
+    offset are taken as local time.
+
+    Raises:
+        ValueError: If the text is neither.
+    """
+    match = _RELATIVE.match(text.strip())
+    if match:
+        if now is None:
+            now = datetime.now(timezone.utc)
+        return now - timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+    result = datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+    if result.tzinfo is None:
+        result = result.astimezone()
+    return result
+
+
+def iter_samples(
+    path: Path | None = None,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    buckets: Iterable[str] | None = None,
+) -> Iterator[tuple[int, str, float | None, int | None]]:
+    """Yield (ts, bucket, pct, resets_at) rows in time order.
+
+    Args:
+        path: History database; the default location if None.
+        start: Only samples at or after this time.
+        end: Only samples before this time.
+        buckets: Only these bucket keys; all buckets if None.
+
+    Raises:
+        sqlite3.Error: If the history cannot be read.
+    """
+    clauses = ["ts >= ?", "ts < ?"]
+    params: list = [
+        int(start.timestamp()) if start is not None else 0,
+        int(end.timestamp()) if end is not None else 2**62,
+    ]
+    if buckets is not None:
+        buckets = list(buckets)
+        clauses.append(f"bucket IN ({', '.join('?' * len(buckets))})")
+        params.extend(buckets)
+
+    from .history_store import connect_readonly  # sqlite3 only when reading
+
+    conn = connect_readonly(path)
+    try:
+        cursor = conn.execute(
+            "SELECT ts, bucket, pct, resets_at FROM samples"
+            f" INDEXED BY samples_by_time WHERE {' AND '.join(clauses)} ORDER BY ts, bucket",
+            params,
+        )
+        while rows := cursor.fetchmany(BATCH_SIZE):
+            yield from rows
+    finally:
+        conn.close()
+
+
+def _iso(ts: int | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def format_rows(rows: Iterable[tuple], fmt: str) -> Iterator[str]:
+    """Yield the rows as CSV (with a header) or JSON Lines text."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+        for ts, bucket, pct, resets_at in rows:
+            writer.writerow((_iso(ts), bucket, "" if pct is None else pct, _iso(resets_at) or ""))
+            if buffer.tell() >= 8192:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    elif fmt == "jsonl":
+        for ts, bucket, pct, resets_at in rows:
+            yield json.dumps({
+                "timestamp": _iso(ts),
+                "bucket": bucket,
+                "utilization_pct": pct,
+                "resets_at": _iso(resets_at),
+            }) + "\n"
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def export(
+    output,
+    fmt: str,
+    *,
+    path: Path | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    buckets: Iterable[str] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Stream history rows to a text file object.
+
+    Args:
+        output: Writable text file.
+        fmt: "csv" or "jsonl".
+        path, start, end, buckets: As for iter_samples().
+        cancelled: Polled every BATCH_SIZE rows; return True to stop.
+
+    Returns:
+        The number of samples written.
+
+    Raises:
+        ExportCancelled: If cancelled returned True.
+        ValueError: If fmt is not supported.
+        sqlite3.Error: If the history cannot be read.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            if cancelled is not None and count % BATCH_SIZE == 0 and cancelled():
+                raise ExportCancelled()
+            yield row
+
+    rows = iter_samples(path, start=start, end=end, buckets=buckets)
+    for chunk in format_rows(counted(rows), fmt):
+        output.write(chunk)
+    return count
@@ -28,8 +28,12 @@ def format_reset_time(dt: datetime | None, *, now: datetime | None = None) -> st
         return "\u2014"
     if now is None:
         now = datetime.now(timezone.utc)
-    delta = dt - now
-    total_seconds = int(delta.total_seconds())
+    return format_duration((dt - now).total_seconds())
+
+
+def format_duration(seconds: float) -> str:
+    """Format a number of seconds as a compact countdown, e.g. "3h 15m"."""
+    total_seconds = int(seconds)
 
     if total_seconds <= 0:
         return "now"
@@ -47,6 +51,56 @@ def format_reset_time(dt: datetime | None, *, now: datetime | None = None) -> st
     return "< 1m"
 
 
+def next_countdown_change(dt: datetime | None, *, now: datetime | None = None) -> float | None:
+    """Seconds until format_reset_time(dt) next shows something different.
+
+    Countdowns have minute granularity down to "< 1m", so the text changes
+    each time the remaining time drops below a whole minute, and finally
+    when it reaches "now". The text changes just after the returned delay.
+    Returns None once it says "now" for good.
+    """
+    if dt is None:
+        return None
+    if now is None:
+        now = datetime.now(timezone.utc)
+    remaining = (dt - now).total_seconds()
+    if remaining < 1:
+        return None
+    if remaining < 60:
+        # "< 1m" until format_duration() truncates to zero seconds.
+        return remaining - 1
+    return remaining % 60
+
+
+def format_latency(seconds: float) -> str:
+    """Format a short duration for diagnostics, e.g. "0.42 ms", "37 ms", "1.2 s"."""
+    if seconds < 0.01:
+        return f"{seconds * 1000:.2f} ms"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.1f} s"
+
+
+def format_age(dt: datetime, *, now: datetime | None = None) -> str:
+    """Format how long ago a datetime was, e.g. "3m ago"."""
+    if now is None:
+        now = datetime.now(timezone.utc)
+    seconds = (now - dt).total_seconds()
+    if seconds < 60:
+        return "just now"
+    return f"{format_duration(seconds)} ago"
+
+
+def format_forecast(
+    limit_at: datetime, before_reset: bool, *, now: datetime | None = None
+) -> str:
+    """Describe a projected limit time, e.g. "At this rate: limit in 47m (before reset)"."""
+    when = format_reset_time(limit_at, now=now)
+    if when == "now":
+        return "At this rate: limit imminent"
+    return f"At this rate: limit in {when} ({'before' if before_reset else 'after'} reset)"
+
+
 def truncate_error(message: str, *, max_length: int = 120) -> str:
     """Truncate an error message to a sensible display length."""
     if len(message) <= max_length:
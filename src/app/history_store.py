@@ -0,0 +1,329 @@
+# history_store.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Usage history: every fetched sample, kept in SQLite with hourly and daily rollups."""
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .usage_model import UsageData
+
+# Stored in PRAGMA user_version; bump whenever the layout changes.
+SCHEMA_VERSION = 1
+
+HOUR = 3600
+DAY = 86400
+
+# Rollup tables, named rollup_<name>, and the period each aggregates.
+# Periods are aligned to UTC, so a daily row covers one UTC day.
+ROLLUP_PERIODS = {"hourly": HOUR, "daily": DAY}
+
+# Raw samples are pruned after this many days (0 keeps them forever);
+# hourly rollups after HOURLY_RETENTION_DAYS; daily rollups never.
+DEFAULT_RETENTION_DAYS = 30
+HOURLY_RETENTION_DAYS = 400
+
+# How often the writer applies the retention policy.
+PRUNE_INTERVAL_SECONDS = 3600
+
+# Most samples committed in a single transaction.
+MAX_BATCH = 512
+
+# Longest a query waits for the writer to create or migrate the database.
+READY_TIMEOUT_SECONDS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    bucket TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    pct REAL,
+    resets_at INTEGER,
+    PRIMARY KEY (bucket, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_by_time ON samples (ts);
+""" + "".join(
+    f"""
+CREATE TABLE IF NOT EXISTS rollup_{name} (
+    bucket TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    pct_min REAL NOT NULL,
+    pct_max REAL NOT NULL,
+    pct_sum REAL NOT NULL,
+    pct_last REAL NOT NULL,
+    last_ts INTEGER NOT NULL,
+    PRIMARY KEY (bucket, start)
+) WITHOUT ROWID;
+"""
+    for name in ROLLUP_PERIODS
+)
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollup_{name} (bucket, start, count, pct_min, pct_max, pct_sum, pct_last, last_ts)
+VALUES (?1, ?2, 1, ?3, ?3, ?3, ?3, ?4)
+ON CONFLICT (bucket, start) DO UPDATE SET
+    count = count + 1,
+    pct_min = min(pct_min, excluded.pct_min),
+    pct_max = max(pct_max, excluded.pct_max),
+    pct_sum = pct_sum + excluded.pct_sum,
+    pct_last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.pct_last ELSE pct_last END,
+    last_ts = max(last_ts, excluded.last_ts)
+"""
+
+_STOP = object()
+
+
+def default_history_path() -> Path:
+    """Return $XDG_DATA_HOME/leeway/history.sqlite3 (~/.local/share by default)."""
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "leeway" / "history.sqlite3"
+
+
+@dataclass(frozen=True, slots=True)
+class Rollup:
+    """Aggregate of one bucket's samples over an hour or a day."""
+
+    start: int  # Unix seconds
+    count: int
+    pct_min: float
+    pct_max: float
+    pct_mean: float
+    pct_last: float
+
+
+def connect_readonly(path: Path | None = None) -> sqlite3.Connection:
+    """Open the history for reading, alongside a running Leeway.
+
+    Raises:
+        sqlite3.Error: If the database does not exist or cannot be read.
+    """
+    if path is None:
+        path = default_history_path()
+    return sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+
+
+class HistoryStore:
+    """Append-only usage history with a background writer.
+
+    append() only queues the snapshot. A writer thread commits everything
+    queued in one transaction, updating the rollup tables in the same
+    transaction, and periodically prunes old rows. The database is in
+    WAL mode, so queries (here, or from another process) never wait for
+    the writer.
+
+    Times are Unix seconds throughout. Queries raise sqlite3.Error if
+    the database cannot be opened.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        clock=time.time,
+    ):
+        self.path = path or default_history_path()
+        self.retention_days = retention_days
+        self.samples_written = 0
+        self.batches_written = 0
+        self._clock = clock
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        # append() runs on the main thread and queries on workers; either
+        # may be first, and only one of them may start the writer.
+        self._thread_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._reader: sqlite3.Connection | None = None
+        self._reader_lock = threading.Lock()
+
+    def append(self, data: UsageData, fetched_at: datetime):
+        """Queue a snapshot for writing. Never blocks on I/O."""
+        ts = int(fetched_at.timestamp())
+        rows = [
+            (
+                bucket.key,
+                ts,
+                bucket.pct,
+                int(bucket.resets_at.timestamp()) if bucket.resets_at is not None else None,
+            )
+            for bucket in data.buckets
+        ]
+        if rows:
+            self._ensure_writer()
+            self._queue.put(rows)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything queued so far has been committed."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit queued samples, then stop the writer and close connections."""
+        with self._thread_lock:
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join()
+                self._thread = None
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def samples(self, bucket: str, start: int, end: int) -> list[tuple[int, float | None]]:
+        """Return (ts, pct) for every raw sample of bucket in [start, end)."""
+        return self._query(
+            "SELECT ts, pct FROM samples WHERE bucket = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (bucket, start, end),
+        )
+
+    def rollups(self, bucket: str, start: int, end: int, period: int = HOUR) -> list[Rollup]:
+        """Return the hourly or daily rollups of bucket starting in [start, end)."""
+        names = {p: n for n, p in ROLLUP_PERIODS.items()}
+        if period not in names:
+            raise ValueError(f"No rollup for a period of {period} s")
+        name = names[period]
+        rows = self._query(
+            f"SELECT start, count, pct_min, pct_max, pct_sum / count, pct_last"
+            f" FROM rollup_{name} WHERE bucket = ? AND start >= ? AND start < ? ORDER BY start",
+            (bucket, start, end),
+        )
+        return [Rollup(*row) for row in rows]
+
+    def buckets(self) -> list[str]:
+        """Return the keys of every bucket with history."""
+        return [row[0] for row in self._query("SELECT DISTINCT bucket FROM rollup_daily", ())]
+
+    def _query(self, sql: str, params: tuple) -> list:
+        self._ensure_writer()
+        if not self._ready.wait(READY_TIMEOUT_SECONDS):
+            raise sqlite3.OperationalError(f"history database {self.path} is not ready")
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = connect_readonly(self.path)
+            return self._reader.execute(sql, params).fetchall()
+
+    def _ensure_writer(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="leeway-history", daemon=True
+                )
+                self._thread.start()
+
+    def _open(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] not in (0, SCHEMA_VERSION):
+            raise sqlite3.DatabaseError(f"unsupported history schema in {self.path}")
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return conn
+
+    def _run(self):
+        """Writer thread: commit queued snapshots in batches."""
+        try:
+            conn = self._open()
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Usage history disabled: {exc}", file=sys.stderr)
+            conn = None
+        finally:
+            self._ready.set()
+
+        pruned_at = 0.0
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = [row for item in batch if isinstance(item, list) for row in item]
+            if conn is not None and rows:
+                try:
+                    self._write(conn, rows)
+                    now = self._clock()
+                    if now - pruned_at >= PRUNE_INTERVAL_SECONDS:
+                        self._prune(conn, now)
+                        pruned_at = now
+                except sqlite3.Error as exc:
+                    print(f"Failed to write usage history: {exc}", file=sys.stderr)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is _STOP for item in batch):
+                break
+
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, rows: list[tuple]):
+        upserts = [
+            (_UPSERT_ROLLUP.format(name=name), period) for name, period in ROLLUP_PERIODS.items()
+        ]
+        written = 0
+        with _transaction(conn):
+            for row in rows:
+                bucket, ts, pct, _resets_at = row
+                cursor = conn.execute("INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?)", row)
+                if cursor.rowcount != 1:
+                    continue  # already recorded
+                written += 1
+                if pct is not None:
+                    for sql, period in upserts:
+                        conn.execute(sql, (bucket, ts - ts % period, pct, ts))
+        self.samples_written += written
+        self.batches_written += 1
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Apply the retention policy."""
+        with _transaction(conn):
+            if self.retention_days > 0:
+                conn.execute(
+                    "DELETE FROM samples WHERE ts < ?", (int(now) - self.retention_days * DAY,)
+                )
+            conn.execute(
+                "DELETE FROM rollup_hourly WHERE start < ?",
+                (int(now) - HOURLY_RETENTION_DAYS * DAY,),
+            )
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    conn.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
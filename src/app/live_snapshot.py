@@ -0,0 +1,197 @@
+# live_snapshot.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Latest usage in a small memory-mapped file, for status lines that poll often."""
+
+import math
+import mmap
+import os
+import struct
+import zlib
+
+from .config import APP_ID
+
+MAGIC = b"LWAY"
+LAYOUT_VERSION = 2
+CAPACITY = 16  # buckets; the API reports about half a dozen
+KEY_BYTES = 32
+
+# Layout, little-endian. Header: magic, layout version, bucket capacity,
+# sequence, updated at (Unix seconds), bucket count, checksum. Each
+# bucket: key (UTF-8, NUL padded), percent (NaN when unknown), resets at
+# (Unix seconds, 0 when unknown).
+#
+# The sequence is a seqlock: odd while the writer is changing the file.
+# Without memory fences another process may see the stores out of order
+# (e.g. on aarch64), so a CRC-32 of everything but the sequence and
+# checksum, over the buckets in use, catches copies the sequence misses.
+_HEADER = struct.Struct("<4sHHQdII")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+_CHECKSUM = struct.Struct("<I")
+_CHECKSUM_OFFSET = 28
+_BUCKET = struct.Struct(f"<{KEY_BYTES}sdq")
+SIZE = _HEADER.size + CAPACITY * _BUCKET.size
+
+# A reader gives up after this many torn or in-progress copies, e.g. if
+# the writer died halfway through an update or the file is corrupt.
+MAX_RETRIES = 1000
+
+
+def default_live_snapshot_path() -> str | None:
+    """Return $XDG_RUNTIME_DIR/app/<app id>/usage.bin, or None without a runtime directory."""
+    # The directory Flatpak shares with the host, so readers find the file
+    # in the same place however Leeway was installed.
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        return None
+    return os.path.join(runtime_dir, "app", APP_ID, "usage.bin")
+
+
+class LiveSnapshotWriter:
+    """Publishes UsageData to the live snapshot file.
+
+    Not thread-safe: publish from one thread. Buckets beyond CAPACITY,
+    and keys longer than KEY_BYTES, are left out.
+
+    Raises:
+        OSError: From the constructor, if the file cannot be created.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != SIZE:
+                os.ftruncate(fd, SIZE)
+            self._map = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+        # Carry on from an earlier run's sequence so readers that saw it
+        # never mistake a new update for the one they already have.
+        magic, version, _capacity, sequence, *_rest = _HEADER.unpack_from(self._map)
+        self._sequence = sequence + sequence % 2 if (magic, version) == (MAGIC, LAYOUT_VERSION) else 0
+
+    def publish(self, data, updated_at: float):
+        """Write a UsageData and when it was fetched (Unix seconds)."""
+        buckets = [b for b in data.buckets if len(b.key.encode()) <= KEY_BYTES][:CAPACITY]
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+        _HEADER.pack_into(
+            self._map, 0, MAGIC, LAYOUT_VERSION, CAPACITY, self._sequence, updated_at, len(buckets), 0,
+        )
+        for index, bucket in enumerate(buckets):
+            _BUCKET.pack_into(
+                self._map, _HEADER.size + index * _BUCKET.size,
+                bucket.key.encode(),
+                bucket.pct if bucket.pct is not None else math.nan,
+                int(bucket.resets_at.timestamp()) if bucket.resets_at is not None else 0,
+            )
+        _CHECKSUM.pack_into(self._map, _CHECKSUM_OFFSET, _checksum(self._map, len(buckets)))
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+
+    def close(self):
+        """Unmap the file. It is left in place: its contents are still the latest known."""
+        self._map.close()
+
+
+class LiveSnapshotReader:
+    """Reads the live snapshot file, keeping it mapped between reads."""
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        if path is None:
+            path = default_live_snapshot_path()
+            if path is None:
+                raise FileNotFoundError("XDG_RUNTIME_DIR is not set")
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self) -> tuple[float, dict[str, tuple[float | None, int | None]]] | None:
+        """Return (updated_at, {key: (percent, resets_at)}), or None.
+
+        Times are Unix seconds; percent and resets_at are None when
+        unknown. Returns None if the file has another layout, or if no
+        copy with a steady sequence and a matching checksum could be
+        made within MAX_RETRIES attempts.
+        """
+        view = self._map
+        if len(view) < SIZE:
+            return None
+        for _ in range(MAX_RETRIES):
+            (before,) = _SEQUENCE.unpack_from(view, _SEQUENCE_OFFSET)
+            if before % 2:
+                continue
+            copy = view[:SIZE]
+            (after,) = _SEQUENCE.unpack_from(view, _SEQUENCE_OFFSET)
+            if before != after:
+                continue
+            header = _HEADER.unpack_from(copy)
+            if not _known_layout(header):
+                return None
+            count, checksum = header[-2:]
+            if checksum == _checksum(copy, count):
+                return _decode(header, copy)
+        return None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _checksum(buffer, count: int) -> int:
+    """CRC-32 of the header without its sequence and checksum, then count buckets."""
+    crc = zlib.crc32(buffer[:_SEQUENCE_OFFSET])
+    crc = zlib.crc32(buffer[_SEQUENCE_OFFSET + _SEQUENCE.size:_CHECKSUM_OFFSET], crc)
+    return zlib.crc32(buffer[_HEADER.size:_HEADER.size + count * _BUCKET.size], crc)
+
+
+def _known_layout(header: tuple) -> bool:
+    magic, version, capacity, _sequence, _updated_at, count, _crc = header
+    return magic == MAGIC and version == LAYOUT_VERSION and capacity == CAPACITY and count <= CAPACITY
+
+
+def _decode(header: tuple, copy: bytes) -> tuple[float, dict[str, tuple[float | None, int | None]]]:
+    _magic, _version, _capacity, _sequence, updated_at, count, _crc = header
+    buckets = {}
+    for key, pct, resets_at in _BUCKET.iter_unpack(copy[_HEADER.size:_HEADER.size + count * _BUCKET.size]):
+        buckets[key.rstrip(b"\0").decode()] = (
+            None if math.isnan(pct) else pct,
+            resets_at or None,
+        )
+    return updated_at, buckets
+
+
+def read_live_snapshot(path: str | os.PathLike | None = None):
+    """Map, read and unmap the live snapshot; see LiveSnapshotReader.read().
+
+    Returns None if the file is missing as well.
+    """
+    try:
+        reader = LiveSnapshotReader(path)
+    except (OSError, ValueError):
+        return None  # ValueError: mmap of an empty file
+    with reader:
+        return reader.read()
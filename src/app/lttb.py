@@ -0,0 +1,79 @@
+# lttb.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Largest-Triangle-Three-Buckets downsampling for line charts."""
+
+from collections.abc import Sequence
+
+Point = tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> list[Point]:
+    """Reduce a series to at most threshold points, keeping its visual shape.
+
+    The first and last points are always kept. The rest are split into
+    threshold - 2 equal buckets, and from each bucket the point forming
+    the largest triangle with the previously kept point and the average
+    of the next bucket is kept. Runs in O(n).
+
+    Args:
+        points: (x, y) pairs sorted by x.
+        threshold: Maximum number of points to return.
+
+    Returns:
+        The selected points, in order. The input is returned as a list
+        unchanged if it already fits (or threshold is below 3).
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a_x, a_y = points[0]
+
+    for i in range(threshold - 2):
+        # Average of the next bucket (the last point for the final bucket).
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        count = next_end - next_start
+        avg_x = avg_y = 0.0
+        for x, y in points[next_start:next_end]:
+            avg_x += x
+            avg_y += y
+        avg_x /= count
+        avg_y /= count
+
+        # The point in this bucket making the largest triangle.
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        dx = a_x - avg_x
+        dy = avg_y - a_y
+        best_area = -1.0
+        best = points[start]
+        for point in points[start:end]:
+            area = abs(dx * (point[1] - a_y) - (a_x - point[0]) * dy)
+            if area > best_area:
+                best_area = area
+                best = point
+        sampled.append(best)
+        a_x, a_y = best
+
+    sampled.append(points[-1])
+    return sampled
@@ -23,10 +23,12 @@ import sys
 gi.require_version('Adw', '1')
 gi.require_version('Gtk', '4.0')
 
-from gi.repository import Adw, Gio, Gtk
-from .config import VERSION
-from .preferences import LeewayPreferencesDialog  # noqa: F401 — registers the GType
-from .window import LeewayWindow
+from gi.repository import Adw, Gio, GLib, Gtk
+from . import tracing
+from .alerts import FORECAST_BUCKETS, SESSION_THRESHOLDS, UsageAlerts
+from .config import APP_ID, VERSION
+from .dbus_service import LeewayUsageService
+from .monitor import LeewayUsageMonitor
 
 class LeewayApplication(Adw.Application):
     """The main application singleton class."""
@@ -39,7 +41,72 @@ class LeewayApplication(Adw.Application):
         self.create_action('about', self.on_about_action)
         self.create_action('preferences', self.on_preferences_action, ['<control>comma'])
         self.create_action('refresh', self.on_refresh_action, ['<control>r'])
+        self.create_action('diagnostics', self.on_diagnostics_action)
         self.set_accels_for_action('window.close', ['<control>w'])
+        self.add_main_option(
+            'background', ord('b'), GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+            'Start without a window and keep monitoring in the background', None,
+        )
+
+        # One fetch loop for the whole desktop: windows and D-Bus clients
+        # all read from the same monitor.
+        self.monitor = LeewayUsageMonitor()
+        self._service = LeewayUsageService(self.monitor, on_used=self._on_service_used)
+        self._service_held = False
+
+        # Notifications are driven by the fetch loop rather than the
+        # window, so they keep working with no window open.
+        self._alerts = UsageAlerts()
+        self._settings = Gio.Settings.new(APP_ID)
+        self.monitor.connect("updated", self._on_usage_updated)
+
+        # In background mode closing the window destroys it, but the
+        # application stays alive to keep monitoring.
+        self._background_option = False
+        self._skip_first_window = False
+        self._background_held = False
+        self._settings.connect("changed::run-in-background", self._on_background_changed)
+        self._settings.connect("changed::trace-enabled", self._on_trace_changed)
+
+    def do_handle_local_options(self, options):
+        if options.contains('background'):
+            # Set before register(), whose startup takes the hold.
+            self._background_option = True
+            self._skip_first_window = True
+            self.register(None)
+            if self.get_is_remote():
+                return 0  # Already running; leave its window alone.
+        return -1
+
+    def do_startup(self):
+        Adw.Application.do_startup(self)
+        self._update_tracing()
+        self.monitor.start()
+        self._update_background_hold()
+
+    def do_shutdown(self):
+        self.monitor.stop()
+        tracing.disable()
+        Adw.Application.do_shutdown(self)
+
+    def do_dbus_register(self, connection, object_path):
+        if not Adw.Application.do_dbus_register(self, connection, object_path):
+            return False
+        try:
+            self._service.register(connection)
+        except GLib.Error as exc:
+            print(f"Failed to export usage service: {exc.message}", file=sys.stderr)
+        return True
+
+    def do_dbus_unregister(self, connection, object_path):
+        self._service.unregister()
+        Adw.Application.do_dbus_unregister(self, connection, object_path)
+
+    def _on_service_used(self):
+        """Keep serving D-Bus clients after the last window closes."""
+        if not self._service_held:
+            self._service_held = True
+            self.hold()
 
     def do_activate(self):
         """Called when the application is activated.
@@ -47,11 +114,89 @@ class LeewayApplication(Adw.Application):
         We raise the application's main window, creating it if
         necessary.
         """
+        if self._skip_first_window:
+            self._skip_first_window = False
+            return
         win = self.props.active_window
         if not win:
-            win = LeewayWindow(application=self)
+            # Imported on first use: nothing needs the widget tree before
+            # the first window, and background mode may never build one.
+            from .window import LeewayWindow
+
+            # Also the way back from background mode, e.g. by clicking a
+            # notification: the new window paints the monitor's latest data.
+            win = LeewayWindow(application=self, monitor=self.monitor)
         win.present()
 
+    def _on_background_changed(self, _settings, _key):
+        self._update_background_hold()
+
+    def _update_background_hold(self):
+        """Hold the application while background mode is on."""
+        try:
+            wanted = self._background_option or self._settings.get_boolean('run-in-background')
+        except GLib.Error:
+            wanted = self._background_option
+        if wanted and not self._background_held:
+            self._background_held = True
+            self.hold()
+        elif not wanted and self._background_held:
+            self._background_held = False
+            self.release()
+
+    def _on_trace_changed(self, _settings, _key):
+        self._update_tracing()
+
+    def _update_tracing(self):
+        """Record a trace if LEEWAY_TRACE or the trace-enabled setting asks for one."""
+        path = tracing.trace_path_from_env()
+        if path is None:
+            try:
+                enabled = self._settings.get_boolean('trace-enabled')
+            except GLib.Error:
+                enabled = False
+            path = tracing.default_trace_path() if enabled else None
+        if path is None:
+            tracing.disable()
+        elif not tracing.is_enabled():
+            tracing.enable(path)
+            print(f"Recording a performance trace to {path}", file=sys.stderr)
+
+    def _on_usage_updated(self, _monitor, data, unchanged):
+        """Send any notifications a new result warrants."""
+        with tracing.span("notification check"):
+            self._send_alerts(data, unchanged)
+
+    def _send_alerts(self, data, unchanged):
+        """Notify about session thresholds crossed and limits forecast to arrive early."""
+        # An unchanged result cannot cross a threshold, but forecasts
+        # still move with time.
+        alerts = [] if unchanged else self._alerts.threshold_alerts(data, self._get_thresholds())
+        try:
+            notify_before_limit = self._settings.get_boolean('notify-before-limit')
+        except GLib.Error:
+            notify_before_limit = False
+        if notify_before_limit:
+            forecaster = self.monitor.forecaster
+            alerts += self._alerts.forecast_alerts(
+                forecaster.forecast(key) for key in FORECAST_BUCKETS
+            )
+
+        for alert in alerts:
+            notification = Gio.Notification.new(alert.title)
+            notification.set_body(alert.body)
+            self.send_notification(alert.id, notification)
+
+    def _get_thresholds(self) -> list[int]:
+        """Get the enabled session notification thresholds from GSettings, with fallback."""
+        try:
+            return [
+                threshold for threshold in SESSION_THRESHOLDS
+                if self._settings.get_boolean(f'notify-at-{threshold}')
+            ]
+        except GLib.Error:
+            return list(SESSION_THRESHOLDS)
+
     def on_about_action(self, *args):
         """Callback for the app.about action."""
         about = Adw.AboutDialog(application_name='Leeway',
@@ -67,14 +212,26 @@ class LeewayApplication(Adw.Application):
 
     def on_preferences_action(self, widget, _):
         """Callback for the app.preferences action."""
+        from .preferences import LeewayPreferencesDialog
+
         dialog = LeewayPreferencesDialog()
         dialog.present(self.props.active_window)
 
+    def on_diagnostics_action(self, widget, _):
+        """Callback for the app.diagnostics action."""
+        from .diagnostics import LeewayDiagnosticsDialog
+
+        win = self.props.active_window
+        dialog = LeewayDiagnosticsDialog(self.monitor, win)
+        dialog.present(win)
+
     def on_refresh_action(self, widget, _):
         """Callback for the app.refresh action."""
         win = self.props.active_window
         if win:
             win.refresh()
+        else:
+            self.monitor.refresh(force=True)
 
     def create_action(self, name, callback, shortcuts=None):
         """Add an application action.
@@ -0,0 +1,188 @@
+# metrics.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Timings and counters for the refresh pipeline.
+
+Each timing goes into a fixed-size histogram with power-of-two
+microsecond buckets, so recording is a few integer operations and
+memory use never grows. Nothing here touches GTK; the diagnostics
+dialog reads the numbers only while it is open.
+"""
+
+import math
+
+from .formatting import format_latency
+
+# Bucket i holds durations below 2**i µs (bucket 0: under 1 µs); the
+# last bucket also holds anything longer, from about 36 minutes.
+BUCKET_COUNT = 32
+
+# Stage names used across the application, in pipeline order.
+REFRESH = "refresh"
+CREDENTIALS = "credentials"
+CREDENTIALS_READ = "credentials.read"
+FETCH = "fetch"
+FETCH_DNS = "fetch.dns"
+FETCH_CONNECT = "fetch.connect"
+FETCH_TLS = "fetch.tls"
+FETCH_TTFB = "fetch.ttfb"
+FETCH_BODY = "fetch.body"
+PARSE = "parse"
+UI_UPDATE = "ui.update"
+UI_APPLY = "ui.apply"
+
+STAGE_TITLES = {
+    REFRESH: "Whole refresh",
+    CREDENTIALS: "Credentials",
+    CREDENTIALS_READ: "Credentials (blocking read)",
+    FETCH: "Request",
+    FETCH_DNS: "DNS lookup",
+    FETCH_CONNECT: "TCP connect",
+    FETCH_TLS: "TLS handshake",
+    FETCH_TTFB: "Time to first byte",
+    FETCH_BODY: "Response body",
+    PARSE: "JSON parsing",
+    UI_UPDATE: "Dashboard update",
+    UI_APPLY: "Widget changes (one frame)",
+}
+
+COUNTER_TITLES = {
+    "refresh.succeeded": "Refreshes succeeded",
+    "refresh.failed": "Refreshes failed",
+    "connections.opened": "Requests on a new connection",
+    "connections.reused": "Requests on a reused connection",
+    "ui.widget_changes": "Widget properties changed",
+}
+
+
+class Histogram:
+    """Count, mean, maximum and approximate percentiles of durations."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Add a duration in seconds."""
+        index = max(0, int(seconds * 1_000_000)).bit_length()
+        self.counts[index if index < BUCKET_COUNT else BUCKET_COUNT - 1] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound, in seconds, of the bucket holding the given fraction of samples.
+
+        Accurate to within a factor of two, and never above the maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) / 1_000_000, self.max)
+        return self.max
+
+
+def describe(histogram: Histogram) -> str:
+    """Summarise a histogram, e.g. "p50 12 ms · p95 40 ms · max 120 ms · 34 samples"."""
+    if not histogram.count:
+        return "No samples yet"
+    samples = "1 sample" if histogram.count == 1 else f"{histogram.count} samples"
+    return (
+        f"p50 {format_latency(histogram.percentile(0.5))}"
+        f" \u00b7 p95 {format_latency(histogram.percentile(0.95))}"
+        f" \u00b7 max {format_latency(histogram.max)}"
+        f" \u00b7 {samples}"
+    )
+
+
+class Metrics:
+    """Named histograms and counters, created on first use."""
+
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+
+    def record(self, name: str, seconds: float):
+        """Add a duration to the named histogram."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(seconds)
+
+    def count(self, name: str, n: int = 1):
+        """Add n to the named counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.histograms.clear()
+        self.counters.clear()
+
+
+def request_phases(
+    *,
+    dns_start: int,
+    dns_end: int,
+    connect_start: int,
+    tls_start: int,
+    connect_end: int,
+    request_start: int,
+    response_start: int,
+    response_end: int,
+) -> dict[str, float]:
+    """Split libsoup's message timestamps (µs, 0 if not reached) into stage durations.
+
+    DNS, connect and TLS only appear for requests that opened a new
+    connection; connect_end includes the TLS handshake.
+    """
+    phases = {}
+    if dns_start and dns_end:
+        phases[FETCH_DNS] = (dns_end - dns_start) / 1_000_000
+    if connect_start and connect_end:
+        handshake_from = tls_start or connect_end
+        phases[FETCH_CONNECT] = (handshake_from - connect_start) / 1_000_000
+        if tls_start:
+            phases[FETCH_TLS] = (connect_end - tls_start) / 1_000_000
+    if request_start and response_start:
+        phases[FETCH_TTFB] = (response_start - request_start) / 1_000_000
+    if response_start and response_end:
+        phases[FETCH_BODY] = (response_end - response_start) / 1_000_000
+    return phases
+
+
+# Shared by every part of the pipeline.
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Return the application-wide metrics."""
+    return _metrics
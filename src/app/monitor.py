@@ -0,0 +1,423 @@
+# monitor.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Application-wide usage polling, shared by the window and the D-Bus service."""
+
+import math
+import sys
+import time
+from datetime import datetime, timezone
+
+from gi.repository import Gio, GLib, GObject
+
+from .api_fetcher import fetch_usage, get_governor
+from .config import APP_ID
+from .burn_rate import BurnRateForecaster
+from .credential_reader import Credentials
+from .credential_watcher import CredentialWatcher
+from .history_store import DEFAULT_RETENTION_DAYS, HistoryStore
+from .live_snapshot import LiveSnapshotWriter, default_live_snapshot_path
+from . import tracing
+from .metrics import CREDENTIALS, REFRESH, get_metrics
+from .poll_policy import PollPolicy, SuspendDetector
+from .poll_scheduler import PollScheduler
+from .single_flight import FlightStats, SingleFlight
+from .snapshot_cache import load_snapshot, save_snapshot
+from .usage_model import UsageData
+
+
+class LeewayUsageMonitor(GObject.Object):
+    """Owns the fetch loop for the default account.
+
+    There is one monitor per application, so every consumer (windows,
+    the D-Bus service) shares a single timer and a single request.
+
+    Signals:
+        refreshing: A request is about to be sent.
+        updated(data, unchanged): A request succeeded. unchanged is True
+            when the response matched the previous one.
+        failed(message): A request failed.
+        resumed: Polling resumed after the network returned or the
+            machine woke; emitted once per catch-up refresh.
+    """
+
+    __gtype_name__ = 'LeewayUsageMonitor'
+
+    # Rewrite an unchanged snapshot at most this often, just to refresh its age.
+    SNAPSHOT_REFRESH_SECONDS = 300
+
+    # Let connectivity settle after resume/reconnect before the catch-up refresh.
+    CATCH_UP_DELAY_SECONDS = 2
+
+    __gsignals__ = {
+        'refreshing': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'updated': (GObject.SignalFlags.RUN_FIRST, None, (object, bool)),
+        'failed': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        'resumed': (GObject.SignalFlags.RUN_FIRST, None, ()),
+    }
+
+    def __init__(self):
+        super().__init__()
+
+        self.data: UsageData | None = None
+        self.error: str | None = None
+        self.updated_at: datetime | None = None
+        # True while data is the snapshot from a previous run, not yet revalidated.
+        self.stale = False
+        self._saved_at: datetime | None = None
+        self._live: LiveSnapshotWriter | None = None
+        self._live_failed = False
+
+        self._timer_id = None
+        self._debounce_id = None
+        self._cancellable = Gio.Cancellable()
+        self._flight = SingleFlight()
+        self._waiters = []
+        self._started_at = 0.0  # perf_counter() when the pending refresh began
+        self._polled_at: datetime | None = None  # when the last refresh began
+        self._refresh_span = None
+        self._credentials_span = None
+        self.credentials = CredentialWatcher()
+
+        # Pause, stretch and catch up polling as the environment changes.
+        self.policy = PollPolicy()
+        # Hidden until a window maps: background and D-Bus activated
+        # starts may never show one.
+        self.policy.update(visible=False)
+        self._suspend = SuspendDetector()
+        self._catch_up_id = None
+        self._network_monitor = None
+        self._power_monitor = None
+        self._environment_handlers = []
+        self._system_bus = None
+        self._sleep_subscription = 0
+
+        # Listen for settings changes to restart the timer
+        self._settings = Gio.Settings.new(APP_ID)
+        self._settings.connect("changed::refresh-interval", self._on_interval_changed)
+        self._settings.connect("changed::minimum-refresh-interval", self._on_interval_changed)
+        self._scheduler = PollScheduler(*self._get_refresh_bounds())
+        self.forecaster = BurnRateForecaster()
+
+        # Every fetched sample is kept, written by a background thread.
+        self.history = HistoryStore(retention_days=self._get_history_retention())
+        self._settings.connect("changed::history-retention-days", self._on_retention_changed)
+
+    @property
+    def in_flight(self) -> bool:
+        return self._flight.in_flight
+
+    @property
+    def flight_stats(self) -> FlightStats:
+        """Counters of started, coalesced and restarted refresh triggers."""
+        return self._flight.stats
+
+    def start(self):
+        """Load the last snapshot, then revalidate it and keep polling."""
+        snapshot = load_snapshot()
+        if snapshot is not None and self.data is None:
+            self.data = snapshot.data
+            self.updated_at = self._saved_at = snapshot.fetched_at
+            self.stale = True
+            self._publish_live()
+        self._watch_environment()
+        if not self.policy.paused:
+            self.refresh()
+        self._start_timer()
+
+    def stop(self):
+        """Stop polling and abandon any in-flight request."""
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        if self._debounce_id is not None:
+            GLib.source_remove(self._debounce_id)
+            self._debounce_id = None
+        if self._catch_up_id is not None:
+            GLib.source_remove(self._catch_up_id)
+            self._catch_up_id = None
+        self._unwatch_environment()
+        self.credentials.close()
+        self._cancellable.cancel()
+        self._flight.end()
+        self.history.close()
+        if self._live is not None:
+            self._live.close()
+            self._live = None
+
+    def set_visible(self, visible: bool):
+        """Tell the monitor whether any window is showing its data."""
+        if visible != self.policy.conditions.visible:
+            self.policy.update(visible=visible)
+            self._start_timer()
+
+    def refresh(self, callback=None, *, force: bool = False):
+        """Read credentials and fetch usage data.
+
+        Triggers that arrive while a request is pending (timer, refresh
+        button, app action, D-Bus) attach to it rather than starting
+        another round trip.
+
+        Args:
+            callback: Optional callable invoked with (data, error) once
+                the request this trigger started or joined completes.
+            force: Restart the pending request if it has been outstanding
+                for at least MIN_RESTART_AGE seconds.
+        """
+        if callback is not None:
+            self._waiters.append(callback)
+        if not self._flight.begin(force=force):
+            return
+
+        self.emit('refreshing')
+
+        # Cancel a stale request being restarted by a forced refresh.
+        self._cancellable.cancel()
+        self._cancellable = Gio.Cancellable()
+
+        self._polled_at = datetime.now(timezone.utc)
+        self._started_at = time.perf_counter()
+        tracing.finish(self._refresh_span, restarted=True)
+        self._refresh_span = tracing.start("refresh", forced=force)
+        self._credentials_span = tracing.start("credentials")
+        self.credentials.load(self._on_credentials, self._cancellable)
+
+    def _on_credentials(self, creds: Credentials | None, error: str | None):
+        """Send the request once credentials are known."""
+        get_metrics().record(CREDENTIALS, time.perf_counter() - self._started_at)
+        tracing.finish(self._credentials_span)
+        self._credentials_span = None
+        if error:
+            self._finish(None, error)
+            return
+
+        if creds.is_expired:
+            self._finish(None, "OAuth token has expired. Re-authenticate via Claude Code CLI.")
+            return
+
+        fetch_usage(creds.access_token, self._on_usage_result, self._cancellable)
+
+    def retry_in(self) -> float:
+        """Seconds until the governor permits the next request."""
+        return get_governor().retry_in()
+
+    def _get_refresh_bounds(self) -> tuple[int, int]:
+        """Get the (floor, ceiling) refresh interval from GSettings, with fallback."""
+        try:
+            ceiling = max(15, min(300, self._settings.get_uint("refresh-interval")))
+            floor = max(15, min(300, self._settings.get_uint("minimum-refresh-interval")))
+        except GLib.Error:
+            return 15, 60
+        return min(floor, ceiling), ceiling
+
+    def _get_history_retention(self) -> int:
+        """Get the raw history retention in days from GSettings, with fallback."""
+        try:
+            return self._settings.get_uint("history-retention-days")
+        except GLib.Error:
+            return DEFAULT_RETENTION_DAYS
+
+    def _on_retention_changed(self, _settings, _key):
+        self.history.retention_days = self._get_history_retention()
+
+    def _start_timer(self):
+        """Schedule the next auto-refresh, replacing any pending one.
+
+        The delay counts from the last refresh, so visibility, power
+        saving and interval changes move the next poll rather than
+        restarting the wait; one already overdue runs straight away.
+        """
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        now = datetime.now(timezone.utc)
+        interval = self._scheduler.next_delay(now=self._polled_at or now)
+        since_poll = (now - self._polled_at).total_seconds() if self._polled_at else math.inf
+        delay = self.policy.remaining(interval, since_poll)
+        if delay is None:
+            return  # offline: the catch-up refresh restarts polling
+        if delay == 0 and self.in_flight:
+            # Overdue, but the request in flight reschedules when it ends;
+            # this is only the fallback in case it never reports back.
+            delay = self.policy.adjust(interval)
+        # Never wake up just to be refused by the governor.
+        delay = max(delay, self.retry_in())
+        if delay == 0:
+            self._timer_id = GLib.idle_add(self._on_timer)
+        else:
+            self._timer_id = GLib.timeout_add_seconds(max(1, round(delay)), self._on_timer)
+
+    def _watch_environment(self):
+        """Follow connectivity, power saving and suspend/resume."""
+        self._network_monitor = Gio.NetworkMonitor.get_default()
+        self._power_monitor = Gio.PowerProfileMonitor.dup_default()
+        self.policy.update(
+            online=self._network_monitor.get_network_available(),
+            power_saver=self._power_monitor.get_power_saver_enabled(),
+        )
+        self._environment_handlers = [
+            (self._network_monitor,
+             self._network_monitor.connect("network-changed", self._on_network_changed)),
+            (self._power_monitor,
+             self._power_monitor.connect("notify::power-saver-enabled", self._on_power_saver_changed)),
+        ]
+        Gio.bus_get(Gio.BusType.SYSTEM, None, self._on_system_bus)
+
+    def _unwatch_environment(self):
+        for source, handler in self._environment_handlers:
+            source.disconnect(handler)
+        self._environment_handlers.clear()
+        if self._system_bus is not None and self._sleep_subscription:
+            self._system_bus.signal_unsubscribe(self._sleep_subscription)
+        self._sleep_subscription = 0
+
+    def _on_system_bus(self, _source, result):
+        try:
+            self._system_bus = Gio.bus_get_finish(result)
+        except GLib.Error:
+            return  # no system bus (e.g. sandboxed): rely on SuspendDetector
+        self._sleep_subscription = self._system_bus.signal_subscribe(
+            "org.freedesktop.login1", "org.freedesktop.login1.Manager", "PrepareForSleep",
+            "/org/freedesktop/login1", None, Gio.DBusSignalFlags.NONE, self._on_prepare_for_sleep,
+        )
+
+    def _on_prepare_for_sleep(self, _conn, _sender, _path, _interface, _signal, params, *_args):
+        (going_to_sleep,) = params.unpack()
+        if not going_to_sleep:
+            self._suspend.check()
+            self._schedule_catch_up()
+
+    def _on_network_changed(self, network_monitor, available: bool):
+        # NetworkManager reconnecting is often the first sign of a resume.
+        resumed = self._suspend.check() > 0
+        if self.policy.update(online=available) or resumed:
+            self._schedule_catch_up()
+        elif not available:
+            self._start_timer()  # pauses polling
+
+    def _on_power_saver_changed(self, power_monitor, _pspec):
+        self.policy.update(power_saver=power_monitor.get_power_saver_enabled())
+        self._start_timer()
+
+    def _schedule_catch_up(self):
+        """Run exactly one refresh once things settle, however many signals arrive."""
+        if self._catch_up_id is not None:
+            return
+        self.policy.request_catch_up()
+        self._catch_up_id = GLib.timeout_add_seconds(
+            self.CATCH_UP_DELAY_SECONDS, self._on_catch_up
+        )
+
+    def _on_catch_up(self) -> bool:
+        self._catch_up_id = None
+        self.policy.catch_up_done()
+        if not self.policy.paused:
+            self.refresh()
+            self.emit('resumed')
+        self._start_timer()
+        return GLib.SOURCE_REMOVE
+
+    def _on_interval_changed(self, _settings, _key):
+        """Restart the timer when the refresh interval changes (debounced)."""
+        if self._debounce_id is not None:
+            GLib.source_remove(self._debounce_id)
+        self._debounce_id = GLib.timeout_add(300, self._apply_interval_change)
+
+    def _apply_interval_change(self) -> bool:
+        """Actually restart the timer after the debounce delay."""
+        self._debounce_id = None
+        self._scheduler.set_bounds(*self._get_refresh_bounds())
+        self._start_timer()
+        return GLib.SOURCE_REMOVE
+
+    def _on_timer(self) -> bool:
+        """Timer callback. The next poll is rescheduled once the result is known."""
+        self._timer_id = None
+        tracing.instant("timer")
+        self.refresh()
+        # Fallback in case this refresh fails; a successful result reschedules.
+        self._start_timer()
+        return GLib.SOURCE_REMOVE
+
+    def _on_usage_result(
+        self, data: UsageData | None, error: str | None, unchanged: bool = False
+    ):
+        """Callback from fetch_usage — runs on the GLib main thread."""
+        if not error and data is None:
+            error = "No data received"
+        if not error:
+            self._scheduler.record(data)
+            self.forecaster.record(data)
+        self._start_timer()
+        self._finish(data, error, unchanged)
+
+    def _save_snapshot(self, unchanged: bool):
+        """Persist the latest data for the next startup."""
+        if (
+            unchanged
+            and self._saved_at is not None
+            and (self.updated_at - self._saved_at).total_seconds() < self.SNAPSHOT_REFRESH_SECONDS
+        ):
+            return
+        try:
+            save_snapshot(self.data, self.updated_at)
+        except OSError as exc:
+            print(f"Failed to save usage snapshot: {exc}", file=sys.stderr)
+            return
+        self._saved_at = self.updated_at
+
+    def _publish_live(self):
+        """Update the memory-mapped snapshot read by status lines."""
+        if self._live is None:
+            path = default_live_snapshot_path()
+            if path is None or self._live_failed:
+                return
+            try:
+                self._live = LiveSnapshotWriter(path)
+            except OSError as exc:
+                # Report once; the JSON snapshot and D-Bus still work.
+                self._live_failed = True
+                print(f"Failed to create live usage snapshot: {exc}", file=sys.stderr)
+                return
+        self._live.publish(self.data, self.updated_at.timestamp())
+
+    def _finish(self, data: UsageData | None, error: str | None, unchanged: bool = False):
+        """Publish a result to signal handlers and waiting callers."""
+        self._flight.end()
+        metrics = get_metrics()
+        metrics.record(REFRESH, time.perf_counter() - self._started_at)
+        metrics.count("refresh.failed" if error else "refresh.succeeded")
+        tracing.finish(self._refresh_span, error=error, unchanged=unchanged)
+        self._refresh_span = None
+        if error:
+            self.error = error
+            self.emit('failed', error)
+        else:
+            self.error = None
+            self.data = data
+            self.updated_at = datetime.now(timezone.utc)
+            self.stale = False
+            self._save_snapshot(unchanged)
+            self._publish_live()
+            self.history.append(data, self.updated_at)
+            self.emit('updated', data, unchanged)
+
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            waiter(self.data if not error else None, error)
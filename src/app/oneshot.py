@@ -0,0 +1,149 @@
+# oneshot.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""One-shot usage query for scripts and status lines (`leeway --once`)."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .api_client import (
+    ApiError,
+    build_request_headers,
+    get_api_url,
+    parse_response_body,
+    parse_retry_after,
+)
+from .credential_reader import DEFAULT_CREDENTIALS_PATH, CredentialError, read_credentials
+from .formatting import format_duration, format_reset_time
+from .snapshot_cache import Snapshot, load_snapshot, save_snapshot
+from .usage_calculator import status_for_pct
+from .usage_model import UsageData, bucket_title
+
+TIMEOUT_SECONDS = 10
+
+
+def fetch(access_token: str, *, url: str | None = None, timeout: float = TIMEOUT_SECONDS) -> UsageData:
+    """Fetch and parse usage data synchronously.
+
+    Raises:
+        ApiError: If the request fails or the response cannot be parsed.
+    """
+    # Imported here: answers from the snapshot never need urllib.
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url or get_api_url(), headers=build_request_headers(access_token))
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+    except urllib.error.HTTPError as exc:
+        message = f"API returned {exc.code}: {exc.reason}"
+        retry_after = parse_retry_after(exc.headers.get("Retry-After"))
+        if retry_after:
+            message += f"; retry in {format_duration(retry_after)}"
+        raise ApiError(message) from None
+    except (urllib.error.URLError, OSError) as exc:
+        raise ApiError(f"HTTP request failed: {getattr(exc, 'reason', exc)}") from None
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise ApiError(f"Failed to read response: {exc}") from exc
+    return parse_response_body(text)
+
+
+def query(
+    *,
+    max_age: float | None = None,
+    credentials_path: Path | None = None,
+    snapshot_path: Path | None = None,
+    url: str | None = None,
+    now: datetime | None = None,
+) -> tuple[Snapshot, bool]:
+    """Return current usage and whether it was answered from the snapshot cache.
+
+    With max_age, a snapshot saved by Leeway (or an earlier query) at most
+    that many seconds ago is returned without touching the network or the
+    credentials. Fresh results are saved as the new snapshot.
+
+    The default snapshot belongs to the default account, so a query for
+    other credentials neither reads nor replaces it unless snapshot_path
+    names a snapshot of its own.
+
+    Raises:
+        CredentialError: If the credentials are missing, malformed or expired.
+        ApiError: If the request fails.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    if credentials_path is None:
+        credentials_path = DEFAULT_CREDENTIALS_PATH
+    use_snapshot = snapshot_path is not None or credentials_path == DEFAULT_CREDENTIALS_PATH
+    if max_age is not None and use_snapshot:
+        snapshot = load_snapshot(snapshot_path)
+        if snapshot is not None and 0 <= (now - snapshot.fetched_at).total_seconds() <= max_age:
+            return snapshot, True
+
+    creds = read_credentials(credentials_path)
+    if creds.is_expired:
+        raise CredentialError("OAuth token has expired. Re-authenticate via Claude Code CLI.")
+    data = fetch(creds.access_token, url=url)
+    if use_snapshot:
+        try:
+            save_snapshot(data, now, snapshot_path)
+        except OSError:
+            pass  # The answer is still good; the next query just fetches again.
+    return Snapshot(data=data, fetched_at=now), False
+
+
+def format_json(snapshot: Snapshot, *, cached: bool, now: datetime | None = None) -> str:
+    """Render a snapshot as a single JSON object."""
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return json.dumps({
+        "fetched_at": snapshot.fetched_at.isoformat(),
+        "cached": cached,
+        "buckets": [
+            {
+                "key": bucket.key,
+                "title": bucket_title(bucket.key),
+                "utilization_pct": bucket.pct,
+                "status": status_for_pct(bucket.pct).name.lower() if bucket.pct is not None else None,
+                "resets_at": bucket.resets_at.isoformat() if bucket.resets_at is not None else None,
+                "resets_in_seconds": (
+                    max(0, int((bucket.resets_at - now).total_seconds()))
+                    if bucket.resets_at is not None else None
+                ),
+            }
+            for bucket in snapshot.data.buckets
+        ],
+    })
+
+
+def format_line(data: UsageData, *, now: datetime | None = None) -> str:
+    """Render usage as one line, e.g. "Session (5-hour) 44.2 % (resets in 4h 59m) · …"."""
+    parts = []
+    for bucket in data.buckets:
+        if bucket.pct is None:
+            continue
+        part = f"{bucket_title(bucket.key)} {bucket.pct:.1f} %"
+        if bucket.resets_at is not None:
+            part += f" (resets in {format_reset_time(bucket.resets_at, now=now)})"
+        parts.append(part)
+    return " · ".join(parts) or "No usage data"
@@ -0,0 +1,124 @@
+# poll_policy.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Adjust polling for connectivity, power saving, window visibility and suspend."""
+
+import time
+from dataclasses import dataclass
+
+POWER_SAVER_FACTOR = 3.0  # stretch delays while power saving is on
+HIDDEN_FACTOR = 2.0       # stretch delays while no window is visible
+
+# Ignore differences below this between the boot and monotonic clocks.
+SUSPEND_THRESHOLD_SECONDS = 5.0
+
+
+@dataclass
+class PollConditions:
+    """What the desktop tells us about the current environment."""
+
+    online: bool = True
+    power_saver: bool = False
+    visible: bool = True
+
+
+class PollPolicy:
+    """Turns the scheduler's delay into the delay actually used.
+
+    Polling pauses while offline and stretches while power saving or
+    hidden. When connectivity returns or the machine resumes, exactly
+    one catch-up refresh is requested, however many signals arrive.
+    """
+
+    def __init__(self):
+        self.conditions = PollConditions()
+        self._catch_up_pending = False
+
+    @property
+    def paused(self) -> bool:
+        return not self.conditions.online
+
+    def adjust(self, delay: float) -> float | None:
+        """Return the delay to use, or None to stop polling until conditions change."""
+        if self.paused:
+            return None
+        if self.conditions.power_saver:
+            delay *= POWER_SAVER_FACTOR
+        if not self.conditions.visible:
+            delay *= HIDDEN_FACTOR
+        return delay
+
+    def remaining(self, delay: float, since_poll: float) -> float | None:
+        """Return what is left of delay, counted from the last poll, or None while paused.
+
+        Counting from the poll, not from now, means changes in conditions
+        only move the next poll, so toggling them cannot put it off forever.
+        """
+        delay = self.adjust(delay)
+        return None if delay is None else max(0.0, delay - since_poll)
+
+    def update(self, **changes) -> bool:
+        """Apply changed conditions.
+
+        Returns:
+            True if a catch-up refresh should be scheduled, i.e. polling
+            was paused and no longer is.
+        """
+        was_paused = self.paused
+        for name, value in changes.items():
+            setattr(self.conditions, name, value)
+        return was_paused and not self.paused and self.request_catch_up()
+
+    def request_catch_up(self) -> bool:
+        """Ask for a catch-up refresh; True only if one is not already pending."""
+        if self._catch_up_pending or self.paused:
+            return False
+        self._catch_up_pending = True
+        return True
+
+    def catch_up_done(self):
+        self._catch_up_pending = False
+
+
+class SuspendDetector:
+    """Detects suspend/resume from the gap between the boot and monotonic clocks.
+
+    CLOCK_MONOTONIC stops while the machine is suspended; CLOCK_BOOTTIME
+    does not. Each call to check() reports the time spent suspended since
+    the previous call.
+    """
+
+    def __init__(self, clock=None):
+        self._clock = clock or _clock_offset
+        self._offset = self._clock()
+
+    def check(self) -> float:
+        """Return seconds spent suspended since the last check (0 if none)."""
+        offset = self._clock()
+        slept = offset - self._offset
+        self._offset = offset
+        return slept if slept >= SUSPEND_THRESHOLD_SECONDS else 0.0
+
+
+def _clock_offset() -> float:
+    try:
+        boottime = time.clock_gettime(time.CLOCK_BOOTTIME)
+    except (AttributeError, OSError):
+        return 0.0  # not Linux: rely on the logind signal alone
+    return boottime - time.monotonic()
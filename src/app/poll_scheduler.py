@@ -0,0 +1,134 @@
+# poll_scheduler.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Adaptive polling: choose the next refresh time from recent usage."""
+
+from collections import deque
+from datetime import datetime, timezone
+
+from .usage_model import UsageData
+
+# Percentages at which something visible happens: notifications fire at
+# 75/90/95 %, and requests start failing at 100 %.
+THRESHOLDS = (75.0, 90.0, 95.0, 100.0)
+
+# Within this many points of a threshold we poll at the floor interval.
+NEAR_THRESHOLD_PCT = 2.0
+
+# Poll this many times before usage is projected to cross a threshold.
+POLLS_BEFORE_THRESHOLD = 2
+
+# Delay after a reset before polling, so the server has rolled over.
+RESET_GRACE_SECONDS = 5.0
+
+# Number of samples used to estimate the rate of change.
+HISTORY_SIZE = 6
+
+
+def _next_threshold(pct: float) -> float | None:
+    """Return the first threshold strictly above pct, if any."""
+    for threshold in THRESHOLDS:
+        if pct < threshold:
+            return threshold
+    return None
+
+
+class PollScheduler:
+    """Pick the delay until the next poll.
+
+    Idle usage is polled at the ceiling interval, climbing usage more
+    often the closer it is projected to come to a threshold, and a poll
+    is always scheduled just after the next known reset.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float):
+        self._samples: deque[tuple[datetime, dict[str, float]]] = deque(maxlen=HISTORY_SIZE)
+        self._latest: UsageData | None = None
+        self.set_bounds(min_interval, max_interval)
+
+    def set_bounds(self, min_interval: float, max_interval: float):
+        """Set the floor and ceiling, in seconds."""
+        self.min_interval = float(min(min_interval, max_interval))
+        self.max_interval = float(max(min_interval, max_interval))
+
+    def record(self, data: UsageData, *, now: datetime | None = None):
+        """Record a fetched sample."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        levels = {b.key: b.pct for b in data.buckets if b.pct is not None}
+        if self._samples:
+            _, last = self._samples[-1]
+            if any(key in last and pct < last[key] for key, pct in levels.items()):
+                # A reset happened; the old samples say nothing about the new window.
+                self._samples.clear()
+
+        self._samples.append((now, levels))
+        self._latest = data
+
+    def velocity(self) -> dict[str, float]:
+        """Return each bucket's rate of change in percentage points per second."""
+        if len(self._samples) < 2:
+            return {}
+        first_at, first = self._samples[0]
+        last_at, last = self._samples[-1]
+        elapsed = (last_at - first_at).total_seconds()
+        if elapsed <= 0:
+            return {}
+        return {
+            key: (pct - first[key]) / elapsed for key, pct in last.items() if key in first
+        }
+
+    def next_delay(self, *, now: datetime | None = None) -> float:
+        """Return the number of seconds until the next poll."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        data = self._latest
+        if data is None:
+            return self.min_interval
+
+        delay = self.max_interval
+        rates = self.velocity()
+        for bucket in data.buckets:
+            delay = min(delay, self._delay_for(bucket.pct, rates.get(bucket.key, 0.0)))
+
+        for bucket in data.buckets:
+            if bucket.resets_at is None:
+                continue
+            until_reset = (bucket.resets_at - now).total_seconds() + RESET_GRACE_SECONDS
+            if 0 < until_reset < delay:
+                delay = until_reset
+
+        return max(self.min_interval, min(self.max_interval, delay))
+
+    def _delay_for(self, pct: float | None, rate: float) -> float:
+        """Delay implied by one bucket's level and rate of change."""
+        if pct is None:
+            return self.max_interval
+        threshold = _next_threshold(pct)
+        if threshold is None:
+            return self.max_interval
+        headroom = threshold - pct
+        if headroom <= NEAR_THRESHOLD_PCT:
+            return self.min_interval
+        if rate <= 0:
+            return self.max_interval
+        return headroom / rate / POLLS_BEFORE_THRESHOLD
+
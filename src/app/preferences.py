@@ -29,9 +29,12 @@ class LeewayPreferencesDialog(Adw.PreferencesDialog):
     __gtype_name__ = 'LeewayPreferencesDialog'
 
     interval_row = Gtk.Template.Child()
+    min_interval_row = Gtk.Template.Child()
     notify_75_row = Gtk.Template.Child()
     notify_90_row = Gtk.Template.Child()
     notify_95_row = Gtk.Template.Child()
+    notify_forecast_row = Gtk.Template.Child()
+    background_row = Gtk.Template.Child()
     test_notification_button = Gtk.Template.Child()
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -47,6 +50,14 @@ class LeewayPreferencesDialog(Adw.PreferencesDialog):
             ),
         )
 
+        self.min_interval_row.set_value(self._settings.get_uint('minimum-refresh-interval'))
+        self.min_interval_row.connect(
+            'notify::value',
+            lambda row, _: self._settings.set_uint(
+                'minimum-refresh-interval', int(row.get_value())
+            ),
+        )
+
         # Notification switches: boolean↔boolean, direct bind
         self._settings.bind(
             'notify-at-75', self.notify_75_row, 'active',
@@ -60,6 +71,14 @@ class LeewayPreferencesDialog(Adw.PreferencesDialog):
             'notify-at-95', self.notify_95_row, 'active',
             Gio.SettingsBindFlags.DEFAULT,
         )
+        self._settings.bind(
+            'notify-before-limit', self.notify_forecast_row, 'active',
+            Gio.SettingsBindFlags.DEFAULT,
+        )
+        self._settings.bind(
+            'run-in-background', self.background_row, 'active',
+            Gio.SettingsBindFlags.DEFAULT,
+        )
 
         # Test notification button
         self.test_notification_button.connect(
@@ -0,0 +1,128 @@
+# request_governor.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Backoff and circuit breaking for requests to the usage endpoint."""
+
+import random
+import time
+from enum import Enum, auto
+
+BASE_DELAY = 15.0       # seconds — first backoff step
+MAX_DELAY = 1800.0      # seconds — longest backoff step
+FAILURE_THRESHOLD = 3   # consecutive failures before the circuit opens
+OPEN_DURATION = 300.0   # seconds — minimum time the circuit stays open
+
+
+class CircuitState(Enum):
+    CLOSED = auto()     # requests flow normally
+    OPEN = auto()       # requests are refused until the open period ends
+    HALF_OPEN = auto()  # a single probe request is in flight
+
+
+class RequestGovernor:
+    """Decides whether a request may be sent now.
+
+    Each failure pushes the next permitted request back by an
+    exponentially growing, jittered delay, or by the server's
+    Retry-After if that is longer. After FAILURE_THRESHOLD consecutive
+    failures the circuit opens; once the open period has passed a single
+    half-open probe is let through, and its outcome closes or re-opens
+    the circuit.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        open_duration: float = OPEN_DURATION,
+        rng=random.random,
+    ):
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._failure_threshold = failure_threshold
+        self._open_duration = open_duration
+        self._rng = rng
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.last_error: str | None = None
+        self._next_allowed_at = 0.0
+
+    def allow_request(self, *, now: float | None = None) -> bool:
+        """Return True if a request may be sent now, and account for it."""
+        if now is None:
+            now = time.monotonic()
+        if self.state is CircuitState.HALF_OPEN:
+            return False  # the probe is still in flight
+        if now < self._next_allowed_at:
+            return False
+        if self.state is CircuitState.OPEN:
+            self.state = CircuitState.HALF_OPEN
+        return True
+
+    def retry_in(self, *, now: float | None = None) -> float:
+        """Seconds until the next request is permitted (0 if it is now)."""
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self._next_allowed_at - now)
+
+    def record_success(self):
+        """Close the circuit and forget earlier failures."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.last_error = None
+        self._next_allowed_at = 0.0
+
+    def record_cancelled(self):
+        """Release a half-open probe that was cancelled before it completed."""
+        if self.state is CircuitState.HALF_OPEN:
+            self.state = CircuitState.OPEN
+
+    def record_failure(
+        self,
+        error: str,
+        *,
+        retry_after: float | None = None,
+        now: float | None = None,
+    ):
+        """Push the next request back after a failed one.
+
+        Args:
+            error: Message describing the failure, repeated while backing off.
+            retry_after: Seconds requested by the server's Retry-After header.
+            now: Current monotonic time.
+        """
+        if now is None:
+            now = time.monotonic()
+        self.failures += 1
+        self.last_error = error
+
+        step = min(self._max_delay, self._base_delay * 2 ** (self.failures - 1))
+        # "Equal jitter": keep at least half the step so backoff still grows.
+        delay = step / 2 + self._rng() * step / 2
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if self.state is CircuitState.HALF_OPEN or self.failures >= self._failure_threshold:
+            self.state = CircuitState.OPEN
+            delay = max(delay, self._open_duration)
+
+        self._next_allowed_at = now + delay
@@ -0,0 +1,72 @@
+# single_flight.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Single-flight coalescing of refresh triggers."""
+
+import time
+from dataclasses import dataclass
+
+# A forced refresh only restarts a request that has been pending this long;
+# younger requests are probably nearly done, so the trigger joins them.
+MIN_RESTART_AGE = 5.0  # seconds
+
+
+@dataclass
+class FlightStats:
+    """Counters for refresh triggers."""
+
+    started: int = 0    # triggers that sent a request with none pending
+    coalesced: int = 0  # triggers that joined the pending request
+    restarted: int = 0  # forced triggers that replaced an old pending request
+
+
+class SingleFlight:
+    """Tracks the one pending request that refresh triggers share."""
+
+    def __init__(self, min_restart_age: float = MIN_RESTART_AGE):
+        self.min_restart_age = min_restart_age
+        self.stats = FlightStats()
+        self._started_at: float | None = None
+
+    @property
+    def in_flight(self) -> bool:
+        return self._started_at is not None
+
+    def begin(self, *, force: bool = False, now: float | None = None) -> bool:
+        """Register a trigger.
+
+        Returns:
+            True if the caller should send a new request (cancelling any
+            pending one), False if it should wait for the pending one.
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._started_at is None:
+            self.stats.started += 1
+        elif force and now - self._started_at >= self.min_restart_age:
+            self.stats.restarted += 1
+        else:
+            self.stats.coalesced += 1
+            return False
+        self._started_at = now
+        return True
+
+    def end(self):
+        """Mark the pending request as finished."""
+        self._started_at = None
@@ -0,0 +1,126 @@
+# snapshot_cache.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Last-known usage snapshot, persisted for instant startup."""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .usage_model import UsageBucket, UsageData
+
+# Bump whenever the on-disk layout changes; other versions are ignored.
+SCHEMA_VERSION = 2
+
+
+def default_snapshot_path() -> Path:
+    """Return $XDG_CACHE_HOME/leeway/snapshot.json (~/.cache by default)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "leeway" / "snapshot.json"
+
+
+@dataclass
+class Snapshot:
+    """A UsageData and when it was fetched."""
+
+    data: UsageData
+    fetched_at: datetime
+
+
+def _encode_time(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _decode_time(value) -> datetime | None:
+    if value is None:
+        return None
+    result = datetime.fromisoformat(value)
+    if result.tzinfo is None:
+        raise ValueError("naive datetime")
+    return result
+
+
+def save_snapshot(data: UsageData, fetched_at: datetime, path: Path | None = None):
+    """Write the snapshot atomically.
+
+    The file is written to a temporary sibling and renamed over the old
+    one, so readers see either the previous snapshot or the new one.
+
+    Raises:
+        OSError: If the cache directory cannot be written.
+    """
+    if path is None:
+        path = default_snapshot_path()
+    record = {
+        "version": SCHEMA_VERSION,
+        "fetched_at": _encode_time(fetched_at),
+        "buckets": [
+            {"key": b.key, "pct": b.pct, "resets_at": _encode_time(b.resets_at)}
+            for b in data.buckets
+        ],
+    }
+
+    import tempfile  # not needed by readers such as `leeway --once`
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".snapshot-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(record, handle, separators=(",", ":"))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def load_snapshot(path: Path | None = None) -> Snapshot | None:
+    """Load the snapshot, or return None if it is missing, corrupt or from another schema version."""
+    if path is None:
+        path = default_snapshot_path()
+    try:
+        record = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or record.get("version") != SCHEMA_VERSION:
+        return None
+
+    try:
+        fetched_at = _decode_time(record["fetched_at"])
+        buckets = [_decode_bucket(item) for item in record["buckets"]]
+    except (KeyError, TypeError, ValueError):
+        return None
+    if fetched_at is None:
+        return None
+
+    return Snapshot(data=UsageData(buckets), fetched_at=fetched_at)
+
+
+def _decode_bucket(item: dict) -> UsageBucket:
+    key = item["key"]
+    pct = item.get("pct")
+    if not isinstance(key, str):
+        raise TypeError("bucket key")
+    if pct is not None and not isinstance(pct, (int, float)):
+        raise TypeError("bucket pct")
+    return UsageBucket(key, pct, _decode_time(item.get("resets_at")))
@@ -0,0 +1,273 @@
+# tracing.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Opt-in Trace Event Format recording of the refresh pipeline.
+
+When enabled, each step of a refresh is written as a span to a JSON
+trace that loads in Perfetto (ui.perfetto.dev) or chrome://tracing.
+Recording only appends a small tuple to a list; a background thread
+serialises and writes events in batches, and picks up whatever is
+buffered every FLUSH_SECONDS, so tracing barely perturbs the timings it
+records and a crash loses at most the last couple of seconds. When disabled, every entry point returns at once.
+
+Steps that finish within one call use span(); steps that finish in a
+later main-loop callback (a request, the whole refresh) use
+start()/finish(), which appear on their own async track.
+"""
+
+import itertools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+TRACE_ENV = "LEEWAY_TRACE"  # "1" for the default path, or a path of its own
+
+MAX_BYTES = 16 * 1024 * 1024  # Rotate the trace at this size...
+BACKUPS = 3                   # ...keeping this many older files.
+BATCH_EVENTS = 256            # Hand events to the writer this many at a time;
+FLUSH_SECONDS = 2.0           # it takes any still buffered after this long idle.
+
+_STOP = object()
+
+
+def default_trace_path() -> Path:
+    """Return $XDG_CACHE_HOME/leeway/trace.json (~/.cache by default)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "leeway" / "trace.json"
+
+
+def trace_path_from_env(environ=os.environ) -> Path | None:
+    """Trace path requested by LEEWAY_TRACE, or None if unset."""
+    value = environ.get(TRACE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    return default_trace_path() if value == "1" else Path(value).expanduser()
+
+
+class Tracer:
+    """Buffers trace events and writes them to a rotating file.
+
+    Times are from time.perf_counter_ns(), in microseconds as the format
+    expects.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = MAX_BYTES,
+        backups: int = BACKUPS,
+        flush_seconds: float = FLUSH_SECONDS,
+        clock=time.perf_counter_ns,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_seconds = flush_seconds
+        self.events_written = 0
+        self._clock = clock
+        self._pid = os.getpid()
+        self._ids = itertools.count(1)
+        self._buffer: list[tuple] = []
+
+        # Imported only once tracing is on, so that importing this
+        # module (as every instrumented one does) stays cheap.
+        import queue
+        import threading
+
+        self._thread_id = threading.get_native_id
+        self._main_thread_id = threading.main_thread().native_id
+        self._lock = threading.Lock()  # guards _buffer against the writer's timed pickup
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="leeway-trace", daemon=True)
+        self._thread.start()
+
+    # -- Recording (any thread; normally the main loop) --
+
+    def _add(self, event: tuple):
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) < BATCH_EVENTS:
+                return
+            batch, self._buffer = self._buffer, []
+        self._queue.put(batch)
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Record the enclosed block as a complete event."""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._add(("X", name, started, self._clock() - started, self._thread_id(), args))
+
+    def start(self, name: str, **args) -> tuple[str, int]:
+        """Begin a span that finish() ends, possibly in another callback."""
+        token = (name, next(self._ids))
+        self._add(("b", name, self._clock(), token[1], self._thread_id(), args))
+        return token
+
+    def finish(self, token: tuple[str, int], **args):
+        """End a span begun by start()."""
+        self._add(("e", token[0], self._clock(), token[1], self._thread_id(), args))
+
+    def instant(self, name: str, **args):
+        """Record a point in time, e.g. a timer firing."""
+        self._add(("i", name, self._clock(), 0, self._thread_id(), args))
+
+    def flush(self):
+        """Hand buffered events to the writer thread."""
+        batch = self._take()
+        if batch:
+            self._queue.put(batch)
+
+    def _take(self) -> list[tuple]:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        return batch
+
+    def close(self):
+        """Write everything recorded and close the trace file."""
+        self.flush()
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    # -- Writing (background thread) --
+
+    def _encode(self, event: tuple) -> str:
+        phase, name, at, extra, tid, args = event
+        record = {"name": name, "cat": "leeway", "ph": phase, "ts": at / 1000, "pid": self._pid, "tid": tid}
+        if phase == "X":
+            record["dur"] = extra / 1000
+        elif phase in ("b", "e"):
+            record["id"] = extra
+        elif phase == "i":
+            record["s"] = "t"
+        if args:
+            record["args"] = args
+        return json.dumps(record, separators=(",", ":"), default=str)
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size:
+            self._shift_backups()  # keep the previous run's trace
+        output = open(self.path, "w", encoding="utf-8")
+        # The array is closed on rotation or close(); Perfetto also
+        # accepts a file cut short by a crash.
+        output.write("[")
+        thread_name = {"name": "thread_name", "ph": "M", "pid": self._pid,
+                       "tid": self._main_thread_id, "args": {"name": "main loop"}}
+        output.write(json.dumps(thread_name))
+        return output
+
+    def _rotate(self, output):
+        output.write("\n]\n")
+        output.close()
+        return self._open()
+
+    def _shift_backups(self):
+        """Move trace.json to trace.json.1, .1 to .2 and so on, dropping the oldest."""
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+
+    def _run(self):
+        import queue
+
+        try:
+            output = self._open()
+        except OSError as exc:
+            print(f"Failed to open trace file: {exc}", file=sys.stderr)
+            output = None
+        while True:
+            try:
+                batch = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                batch = self._take()
+            if batch is _STOP:
+                break
+            if output is None or not batch:
+                continue
+            try:
+                output.write("".join(",\n" + self._encode(event) for event in batch))
+                output.flush()
+                self.events_written += len(batch)
+                if output.tell() >= self.max_bytes:
+                    output = self._rotate(output)
+            except OSError as exc:
+                print(f"Failed to write trace: {exc}", file=sys.stderr)
+        if output is not None:
+            output.write("\n]\n")
+            output.close()
+
+
+# The active tracer, or None while tracing is off.
+_tracer: Tracer | None = None
+
+
+def enable(path: Path) -> Tracer:
+    """Start tracing to path, replacing any active tracer."""
+    global _tracer
+    disable()
+    _tracer = Tracer(path)
+    return _tracer
+
+
+def disable():
+    """Stop tracing, writing out anything buffered."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **args):
+    """Context manager recording the block as a span, if tracing."""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.span(name, **args)
+
+
+def start(name: str, **args):
+    """Begin an async span; pass the result to finish(). None if not tracing."""
+    if _tracer is None:
+        return None
+    return _tracer.start(name, **args)
+
+
+def finish(token, **args):
+    """End a span from start(); does nothing for None."""
+    if token is not None and _tracer is not None:
+        _tracer.finish(token, **args)
+
+
+def instant(name: str, **args):
+    """Record an instant event, if tracing."""
+    if _tracer is not None:
+        _tracer.instant(name, **args)
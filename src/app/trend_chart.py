@@ -0,0 +1,148 @@
+# trend_chart.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Usage trend chart, drawn with Gtk.Snapshot."""
+
+from gi.repository import Gsk, Gtk
+
+from .lttb import lttb
+
+# LTTB runs for a width rounded up to this many pixels, so resizing the
+# window only resamples when a step is crossed; drawing a few more
+# points than pixels costs nothing visible.
+WIDTH_STEP = 64
+
+# Points appended since the last resample are drawn as they are until
+# they exceed this fraction of the sampled count.
+MAX_TAIL_FRACTION = 1 / 8
+
+LINE_WIDTH = 1.5
+
+
+class LeewayTrendChart(Gtk.Widget):
+    """A line of usage percentage (0–100) over a fixed time range.
+
+    Geometry is only rebuilt inside the snapshot, which GTK runs on the
+    frame clock, and only after the points or the size change. New
+    points extend the previous downsample instead of resampling, and a
+    sample that repeats the last value is only remembered, not drawn, so
+    a poll that changes nothing costs nothing.
+    """
+
+    __gtype_name__ = 'LeewayTrendChart'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.set_overflow(Gtk.Overflow.HIDDEN)
+
+        self._points: list[tuple[float, float]] = []
+        self._hold: float | None = None  # latest x at which the last y was seen again
+        self._start = 0.0
+        self._end = 0.0
+
+        self._sampled: list[tuple[float, float]] = []
+        self._sampled_threshold = 0
+        self._sampled_count = 0
+        self._path: Gsk.Path | None = None
+        self._path_size = (0, 0)
+
+        # Counters for verifying how often the expensive steps run.
+        self.resample_count = 0
+        self.path_count = 0
+
+    @property
+    def time_range(self) -> tuple[float, float]:
+        return self._start, self._end
+
+    def set_range(self, start: float, end: float):
+        """Set the x-axis range, in Unix seconds."""
+        if (start, end) != (self._start, self._end):
+            self._start, self._end = start, end
+            self._invalidate()
+
+    def set_points(self, points):
+        """Replace the series with (x, pct) pairs sorted by x; None values are skipped."""
+        self._points = [(x, y) for x, y in points if y is not None]
+        self._hold = None
+        self._sampled_count = 0
+        self._sampled_threshold = 0
+        self._invalidate()
+
+    def append(self, x: float, y: float | None):
+        """Add a newer sample."""
+        if y is None or (self._points and x <= self._points[-1][0]):
+            return
+        if self._points and y == self._points[-1][1]:
+            self._hold = x  # the line is flat up to here; nothing to redraw yet
+            return
+        if self._hold is not None:
+            self._points.append((self._hold, self._points[-1][1]))
+            self._hold = None
+        self._points.append((x, y))
+        self._invalidate()
+
+    def _invalidate(self):
+        self._path = None
+        self.queue_draw()
+
+    def _downsampled(self, width: int) -> list[tuple[float, float]]:
+        threshold = max(WIDTH_STEP, -(-width // WIDTH_STEP) * WIDTH_STEP)
+        tail = len(self._points) - self._sampled_count
+        if (
+            threshold != self._sampled_threshold
+            or tail < 0
+            or tail > max(1, len(self._sampled)) * MAX_TAIL_FRACTION
+        ):
+            self._sampled = lttb(self._points, threshold)
+            self._sampled_threshold = threshold
+            self._sampled_count = len(self._points)
+            self.resample_count += 1
+            return self._sampled
+        if tail:
+            return self._sampled + self._points[self._sampled_count:]
+        return self._sampled
+
+    def _build_path(self, width: int, height: int) -> Gsk.Path:
+        span = self._end - self._start
+        inset = LINE_WIDTH / 2
+        scale_x = width / span
+        scale_y = (height - LINE_WIDTH) / 100
+
+        builder = Gsk.PathBuilder.new()
+        for index, (x, y) in enumerate(self._downsampled(width)):
+            px = (x - self._start) * scale_x
+            py = height - inset - min(max(y, 0.0), 100.0) * scale_y
+            if index == 0:
+                builder.move_to(px, py)
+            else:
+                builder.line_to(px, py)
+        self.path_count += 1
+        return builder.to_path()
+
+    def do_snapshot(self, snapshot: Gtk.Snapshot):
+        width = self.get_width()
+        height = self.get_height()
+        if width <= 0 or height <= 0 or len(self._points) < 2 or self._end <= self._start:
+            return
+
+        if self._path is None or self._path_size != (width, height):
+            self._path = self._build_path(width, height)
+            self._path_size = (width, height)
+
+        snapshot.append_stroke(self._path, Gsk.Stroke.new(LINE_WIDTH), self.get_color())
@@ -49,6 +49,14 @@ STATUS_COLORS: dict[StatusLevel, tuple[float, float, float]] = {
 }
 
 
+# CSS classes for each level, styled by the bundled style.css.
+STATUS_CSS_CLASSES: dict[StatusLevel, str] = {
+    StatusLevel.SAFE: "status-safe",
+    StatusLevel.MODERATE: "status-moderate",
+    StatusLevel.CRITICAL: "status-critical",
+}
+
+
 def color_for_status(level: StatusLevel) -> tuple[float, float, float]:
     """Return an (R, G, B) tuple for the given status level."""
     return STATUS_COLORS[level]
@@ -20,6 +20,8 @@
 from gi.repository import Adw
 from gi.repository import Gtk
 
+from .trend_chart import LeewayTrendChart  # noqa: F401 — registers the GType
+
 
 @Gtk.Template(resource_path='/me/stephenlewis/Leeway/usage-group.ui')
 class LeewayUsageGroup(Adw.PreferencesGroup):
@@ -28,3 +30,4 @@ class LeewayUsageGroup(Adw.PreferencesGroup):
     reset_label = Gtk.Template.Child()
     row = Gtk.Template.Child()
     bar = Gtk.Template.Child()
+    chart = Gtk.Template.Child()
@@ -17,25 +17,163 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-"""Data classes for usage data."""
+"""Usage data: any number of rate-limit buckets, keyed by name."""
 
+import builtins
+import sys
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Keys of the buckets Leeway knows by name.
+SESSION = "five_hour"
+WEEKLY = "seven_day"
+OPUS = "seven_day_opus"
+
+
+def N_(message: str) -> str:
+    """Mark a string for translation; it is translated when displayed."""
+    return message
+
+
+# Titles of known buckets, in display order. Buckets not listed here are
+# shown after these, in response order, titled from their key.
+BUCKET_TITLES = {
+    SESSION: N_("Session (5-hour)"),
+    WEEKLY: N_("Weekly (7-day)"),
+    OPUS: N_("Opus (7-day)"),
+    "seven_day_sonnet": N_("Sonnet (7-day)"),
+}
+
+# Length of the window each bucket measures, by key prefix, so that
+# "seven_day_sonnet" is known to be a weekly bucket.
+_WINDOWS = (("five_hour", timedelta(hours=5)), ("seven_day", timedelta(days=7)))
+
+# Reset times wobble by a few seconds between responses; a move within
+# this many seconds is still the same window.
+RESET_TOLERANCE_SECONDS = 60
+
+# Utilisation fields, in order of preference. The API uses "utilization_pct"
+# (a float) in some responses and "utilization" (sometimes rounded) in others.
+PCT_FIELDS = ("utilization_pct", "utilization")
+
+# Any object carrying one of these fields is treated as a bucket.
+_BUCKET_FIELDS = frozenset((*PCT_FIELDS, "resets_at"))
+
+
+def bucket_title(key: str) -> str:
+    """Return the display title for a bucket key."""
+    title = BUCKET_TITLES.get(key)
+    if title is not None:
+        # The launcher installs _() for the leeway domain; without it
+        # (tests, other tools importing the module) titles stay English.
+        translate = getattr(builtins, "_", None)
+        return translate(title) if translate is not None else title
+    return key.replace("_", " ").strip().capitalize() or key
+
+
+def bucket_window(key: str) -> timedelta | None:
+    """Return how long a bucket's window is, or None if unknown."""
+    for prefix, window in _WINDOWS:
+        if key.startswith(prefix):
+            return window
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class UsageBucket:
+    """One rate-limit bucket: how much of it is used, and when it resets."""
+
+    key: str
+    pct: float | None = None
+    resets_at: datetime | None = None
+
+    @property
+    def title(self) -> str:
+        return bucket_title(self.key)
+
+
+def _bucket_field(key: str, name: str) -> property:
+    def getter(self) -> object:
+        bucket = self.get(key)
+        return getattr(bucket, name) if bucket is not None else None
+
+    return property(getter, doc=f"{name} of the {key!r} bucket, or None.")
+
+
+def _legacy_buckets(
+    *,
+    session_pct: float | None = None,
+    session_resets_at: datetime | None = None,
+    weekly_pct: float | None = None,
+    weekly_resets_at: datetime | None = None,
+    opus_pct: float | None = None,
+    opus_resets_at: datetime | None = None,
+) -> tuple[UsageBucket, ...]:
+    return tuple(
+        UsageBucket(key, pct, resets_at)
+        for key, pct, resets_at in (
+            (SESSION, session_pct, session_resets_at),
+            (WEEKLY, weekly_pct, weekly_resets_at),
+            (OPUS, opus_pct, opus_resets_at),
+        )
+        if pct is not None or resets_at is not None
+    )
 
 
-@dataclass
 class UsageData:
-    """Parsed API usage data."""
+    """Parsed API usage data.
+
+    An immutable, ordered collection of UsageBucket records. The
+    ``session_*``, ``weekly_*`` and ``opus_*`` attributes (and keyword
+    arguments) address the three buckets Leeway has always shown.
+    """
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, buckets=(), **legacy):
+        buckets = tuple(buckets)
+        if legacy:
+            buckets += _legacy_buckets(**legacy)
+        object.__setattr__(self, "buckets", buckets)
 
-    session_pct: float | None = None
-    session_resets_at: datetime | None = None
-    weekly_pct: float | None = None
-    weekly_resets_at: datetime | None = None
-    opus_pct: float | None = None
-    opus_resets_at: datetime | None = None
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, UsageData):
+            return NotImplemented
+        return self.buckets == other.buckets
+
+    def __hash__(self):
+        return hash(self.buckets)
+
+    def __repr__(self):
+        return f"UsageData({list(self.buckets)!r})"
+
+    def get(self, key: str) -> UsageBucket | None:
+        """Return the bucket with this key, if the response had one."""
+        # A linear scan beats a dict for the handful of buckets there are.
+        for bucket in self.buckets:
+            if bucket.key == key:
+                return bucket
+        return None
 
+    session_pct = _bucket_field(SESSION, "pct")
+    session_resets_at = _bucket_field(SESSION, "resets_at")
+    weekly_pct = _bucket_field(WEEKLY, "pct")
+    weekly_resets_at = _bucket_field(WEEKLY, "resets_at")
+    opus_pct = _bucket_field(OPUS, "pct")
+    opus_resets_at = _bucket_field(OPUS, "resets_at")
+
+
+@lru_cache(maxsize=64)
 def _parse_iso_datetime(value: str | None) -> datetime | None:
+    # Cached: reset times are repeated verbatim poll after poll, and
+    # datetimes are immutable, so a hit can be shared safely.
     if not value:
         return None
     try:
@@ -51,32 +189,57 @@ def _parse_iso_datetime(value: str | None) -> datetime | None:
 
 
 def _get_pct(bucket: dict) -> float | None:
-    """Get the utilisation percentage, trying both field names."""
-    # The API uses "utilization_pct" in some responses and "utilization" in others.
-    pct = bucket.get("utilization_pct")
-    if pct is None:
-        pct = bucket.get("utilization")
-    return pct
+    """Get the utilisation percentage from the first PCT_FIELDS entry present."""
+    for name in PCT_FIELDS:
+        pct = bucket.get(name)
+        if type(pct) is float:
+            return pct
+        if type(pct) is int:
+            return float(pct)
+    return None
+
+
+@lru_cache(maxsize=64)
+def _make_bucket(key: str, pct: float | None, resets_at: str | None) -> UsageBucket:
+    # Cached like _parse_iso_datetime: between resets a bucket's fields
+    # repeat poll after poll, and building a frozen dataclass costs more
+    # than the rest of parsing it. Buckets are immutable, so sharing one
+    # is safe, and a history of snapshots keeps one copy of each.
+    return UsageBucket(sys.intern(key), pct, _parse_iso_datetime(resets_at))
+
+
+def _parse_bucket(key: str, raw) -> UsageBucket | None:
+    if not isinstance(raw, dict) or _BUCKET_FIELDS.isdisjoint(raw):
+        return None
+    resets_at = raw.get("resets_at")
+    bucket = _make_bucket(key, _get_pct(raw), resets_at if isinstance(resets_at, str) else None)
+    # An all-null object (e.g. Opus on plans without it) is no bucket at all.
+    if bucket.pct is None and bucket.resets_at is None:
+        return None
+    return bucket
 
 
 def parse_usage_response(raw: dict) -> UsageData:
     """Parse the API JSON response into a UsageData instance.
 
+    Every top-level object with a utilisation or ``resets_at`` value
+    becomes a bucket, so buckets the endpoint adds later are kept.
+    Objects whose fields are all null are skipped.
+
     Args:
         raw: Decoded JSON dict from the usage endpoint.
 
     Returns:
-        UsageData with whatever fields are present.
+        UsageData with whatever buckets are present, known ones first.
     """
-    five_hour = raw.get("five_hour", {})
-    seven_day = raw.get("seven_day", {})
-    seven_day_opus = raw.get("seven_day_opus")
-
-    return UsageData(
-        session_pct=_get_pct(five_hour),
-        session_resets_at=_parse_iso_datetime(five_hour.get("resets_at")),
-        weekly_pct=_get_pct(seven_day),
-        weekly_resets_at=_parse_iso_datetime(seven_day.get("resets_at")),
-        opus_pct=_get_pct(seven_day_opus) if seven_day_opus else None,
-        opus_resets_at=_parse_iso_datetime(seven_day_opus.get("resets_at")) if seven_day_opus else None,
-    )
+    buckets = []
+    for key in BUCKET_TITLES:
+        bucket = _parse_bucket(key, raw.get(key))
+        if bucket is not None:
+            buckets.append(bucket)
+    for key, value in raw.items():
+        if key not in BUCKET_TITLES:
+            bucket = _parse_bucket(key, value)
+            if bucket is not None:
+                buckets.append(bucket)
+    return UsageData(buckets)
@@ -0,0 +1,109 @@
+# view_state.py
+#
+# Copyright 2026 Stephen Lewis
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Remembers what each widget shows, so refreshes only touch what changed.
+
+Every GTK setter invalidates styling or layout even when it is handed
+the value the widget already has. The window describes each widget as
+a dict of rendered outputs (strings, bar values, status levels) and
+applies only the fields diff() reports as changed.
+
+usage_fields() and countdown_fields() render those dicts for a usage
+group; they are plain functions so benchmarks can run them headless.
+"""
+
+from datetime import datetime
+
+from .burn_rate import Forecast
+from .formatting import format_forecast, format_reset_time
+from .usage_calculator import status_for_pct
+from .usage_model import UsageBucket
+
+
+def usage_fields(bucket: UsageBucket | None) -> dict[str, object]:
+    """Subtitle, bar value and status level for a bucket's usage group."""
+    if bucket is None or bucket.pct is None:
+        return {"subtitle": "\u2014", "value": 0}
+    return {
+        "subtitle": f"{bucket.pct:.1f} %",
+        "value": min(bucket.pct, 100),
+        "status": status_for_pct(bucket.pct),
+    }
+
+
+def countdown_fields(
+    bucket: UsageBucket | None, forecast: Forecast | None, *, now: datetime | None = None
+) -> dict[str, object]:
+    """Reset countdown and limit forecast text for a bucket's usage group."""
+    return {
+        "reset": (
+            f"Resets in {format_reset_time(bucket.resets_at, now=now)}"
+            if bucket is not None and bucket.resets_at is not None else ""
+        ),
+        "description": (
+            format_forecast(forecast.limit_at, forecast.before_reset, now=now)
+            if forecast is not None else None
+        ),
+    }
+
+
+class ViewState:
+    """Last-rendered outputs per widget, with update counters.
+
+    Widgets are identified by any hashable id; fields by name. Values
+    are compared with ==, so they should be plain data, not widgets.
+    """
+
+    __slots__ = ("_shown", "updates", "refreshes", "_refresh_start")
+
+    def __init__(self):
+        self._shown: dict[tuple, object] = {}
+        self.updates = 0         # Fields changed since creation
+        self.refreshes = 0       # begin_refresh() calls
+        self._refresh_start = 0
+
+    def begin_refresh(self):
+        """Start counting updates for a new refresh."""
+        self.refreshes += 1
+        self._refresh_start = self.updates
+
+    @property
+    def refresh_updates(self) -> int:
+        """Fields changed since the last begin_refresh()."""
+        return self.updates - self._refresh_start
+
+    def diff(self, widget, fields: dict[str, object]) -> dict[str, object]:
+        """Record fields as shown by widget and return those that changed."""
+        changed = {}
+        shown = self._shown
+        for name, value in fields.items():
+            slot = (widget, name)
+            if slot not in shown or shown[slot] != value:
+                shown[slot] = value
+                changed[name] = value
+        self.updates += len(changed)
+        return changed
+
+    def forget(self, widget=None):
+        """Drop what is recorded for widget (or every widget), forcing a redraw."""
+        if widget is None:
+            self._shown.clear()
+        else:
+            for slot in [slot for slot in self._shown if slot[0] == widget]:
+                del self._shown[slot]
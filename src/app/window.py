@@ -19,46 +19,46 @@
 
 """Main window for Leeway."""
 
-from datetime import datetime, timezone
-
-from gi.repository import Adw, Gio, GLib, Gtk
-
-from .usage_group import LeewayUsageGroup  # noqa: F401 — registers the GType
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from gi.repository import Adw, Gdk, Gio, GLib, Gtk
+
+from .usage_group import LeewayUsageGroup
+from .account_table import LeewayAccountItem, LeewayAccountTable  # noqa: F401
+from .accounts import DEFAULT_CONCURRENCY, Account, ConcurrencyLimiter
 from .api_fetcher import fetch_usage
 from .config import APP_ID
-from .credential_reader import CredentialError, read_credentials
-from .formatting import format_reset_time, truncate_error
-from .usage_calculator import color_for_pct
-from .usage_model import UsageData
-
-
-def _apply_color_to_bar(
-    bar: Gtk.LevelBar,
-    pct: float,
-    bar_css: dict[Gtk.LevelBar, tuple[str, Gtk.CssProvider]],
-):
-    """Apply a CSS colour to a LevelBar based on usage percentage."""
-    if bar in bar_css:
-        css_class, old_provider = bar_css[bar]
-        Gtk.StyleContext.remove_provider_for_display(
-            bar.get_display(), old_provider
-        )
-    else:
-        css_class = f"usage-bar-{len(bar_css)}"
-        bar.add_css_class(css_class)
-
-    r, g, b = color_for_pct(pct)
-    css = (
-        f"levelbar.{css_class} block.filled {{"
-        f" background-color: rgba({int(r*255)}, {int(g*255)}, {int(b*255)}, 1.0);"
-        f" }}"
-    )
-    provider = Gtk.CssProvider()
-    provider.load_from_string(css)
-    Gtk.StyleContext.add_provider_for_display(
-        bar.get_display(), provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-    )
-    bar_css[bar] = (css_class, provider)
+from .credential_reader import discover_credential_files
+from .credential_watcher import CredentialWatcher
+from .formatting import (
+    format_age,
+    format_duration,
+    format_reset_time,
+    next_countdown_change,
+    truncate_error,
+)
+from . import tracing
+from .metrics import UI_APPLY, UI_UPDATE, get_metrics
+from .history_store import HistoryStore
+from .monitor import LeewayUsageMonitor
+from .poll_scheduler import PollScheduler
+from .usage_calculator import STATUS_CSS_CLASSES, StatusLevel
+from .usage_model import (
+    RESET_TOLERANCE_SECONDS, SESSION, WEEKLY, UsageData, bucket_title, bucket_window,
+)
+from .view_state import ViewState, countdown_fields, usage_fields
+
+
+def _apply_status_class(bar: Gtk.LevelBar, level: StatusLevel):
+    """Colour a LevelBar by swapping its status class (see style.css)."""
+    for css_class in STATUS_CSS_CLASSES.values():
+        bar.remove_css_class(css_class)
+    bar.add_css_class(STATUS_CSS_CLASSES[level])
 
 
 def _strip_default_offsets(bar: Gtk.LevelBar):
@@ -68,40 +68,97 @@ def _strip_default_offsets(bar: Gtk.LevelBar):
     bar.remove_offset_value(Gtk.LEVEL_BAR_OFFSET_FULL)
 
 
+# Buckets shown (as "—" if need be) even before, or without, data for them.
+ALWAYS_SHOWN_BUCKETS = (SESSION, WEEKLY)
+
+# Countdown wakeups land this long after the label changes, never before it.
+COUNTDOWN_SLACK_MS = 20
+
+# Time ranges offered when exporting from the window, as (label, age).
+EXPORT_RANGES = (
+    ("Last 24 Hours", timedelta(days=1)),
+    ("Last 7 Days", timedelta(days=7)),
+    ("Last 30 Days", timedelta(days=30)),
+    ("All History", None),
+)
+
+
 @Gtk.Template(resource_path='/me/stephenlewis/Leeway/window.ui')
 class LeewayWindow(Adw.ApplicationWindow):
     __gtype_name__ = 'LeewayWindow'
 
     refresh_button = Gtk.Template.Child()
-    session_group = Gtk.Template.Child()
-    weekly_group = Gtk.Template.Child()
-    opus_group = Gtk.Template.Child()
+    usage_box = Gtk.Template.Child()
     status_label = Gtk.Template.Child()
+    view_stack = Gtk.Template.Child()
+    account_table = Gtk.Template.Child()
+    toast_overlay = Gtk.Template.Child()
 
-    def __init__(self, **kwargs):
+    def __init__(self, monitor: LeewayUsageMonitor, **kwargs):
         super().__init__(**kwargs)
 
         self._timer_id = None
         self._debounce_id = None
-        self._notification_tracker = set()
-        self._cancellable = Gio.Cancellable()
-        self._bar_css: dict[Gtk.LevelBar, tuple[str, Gtk.CssProvider]] = {}
+        self._countdown_id = None
+        self._last_data: UsageData | None = None
+
+        # Widgets are only touched when what they show changes, and the
+        # changes are applied together on the next frame; see _render().
+        self.view_state = ViewState()
+        self._pending: dict[tuple[str, str], object] = {}
+        self._tick_id = None
 
-        # Remove default level bar offsets (can't be done in XML)
-        _strip_default_offsets(self.session_group.bar)
-        _strip_default_offsets(self.weekly_group.bar)
-        _strip_default_offsets(self.opus_group.bar)
+        # One group per usage bucket, created as buckets first appear.
+        self._usage_groups: dict[str, LeewayUsageGroup] = {}
+        for key in ALWAYS_SHOWN_BUCKETS:
+            self._usage_group(key)
 
         # Wire up the refresh button
         self.refresh_button.connect("clicked", self._on_refresh_clicked)
 
-        # Listen for settings changes to restart the timer
+        # Listen for settings changes to restart the multi-account timer
         self._settings = Gio.Settings.new(APP_ID)
         self._settings.connect("changed::refresh-interval", self._on_interval_changed)
-
-        # Initial fetch and auto-refresh timer
-        self._refresh()
-        self._start_timer()
+        self._settings.connect("changed::minimum-refresh-interval", self._on_interval_changed)
+
+        # The default account is polled by the application-wide monitor.
+        self._monitor = monitor
+        self._monitor_handlers = [
+            monitor.connect("refreshing", self._on_monitor_refreshing),
+            monitor.connect("updated", self._on_monitor_updated),
+            monitor.connect("failed", self._on_monitor_failed),
+            monitor.connect("resumed", self._on_monitor_resumed),
+        ]
+
+        # Multi-account mode, enabled by listing credential files or directories
+        self._accounts: list[Account] = []
+        self._account_items: dict[Account, LeewayAccountItem] = {}
+        self._account_credentials: dict[Path, CredentialWatcher] = {}
+        self._accounts_cancellable = Gio.Cancellable()
+        self._limiter = ConcurrencyLimiter(DEFAULT_CONCURRENCY)
+        self._team_mode = False
+        self._settings.connect("changed::account-sources", self._on_account_sources_changed)
+        self._settings.connect("changed::account-concurrency", self._on_account_concurrency_changed)
+        self._load_accounts()
+
+        # History export runs on a worker thread; see _on_export_action.
+        self._export_cancel: threading.Event | None = None
+        self._export_toast: Adw.Toast | None = None
+        export_action = Gio.SimpleAction.new("export", None)
+        export_action.connect("activate", self._on_export_action)
+        self.add_action(export_action)
+
+        # Polling stretches while this window is hidden or minimised.
+        self._surface_handler = None
+        self.connect("map", self._on_map_changed)
+        self.connect("unmap", self._on_map_changed)
+
+        # Paint whatever the monitor already has, e.g. when reopening the window.
+        self._show_monitor_state()
+
+        if self._team_mode:
+            self._refresh_accounts()
+            self._start_timer()
 
     def do_close_request(self):
         """Clean up resources before the window is destroyed."""
@@ -111,31 +168,76 @@ class LeewayWindow(Adw.ApplicationWindow):
         if self._debounce_id is not None:
             GLib.source_remove(self._debounce_id)
             self._debounce_id = None
-        self._cancellable.cancel()
-        for _bar, (_, provider) in self._bar_css.items():
-            Gtk.StyleContext.remove_provider_for_display(
-                self.get_display(), provider
-            )
-        self._bar_css.clear()
+        if self._tick_id is not None:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+        if self._countdown_id is not None:
+            GLib.source_remove(self._countdown_id)
+            self._countdown_id = None
+        for handler in self._monitor_handlers:
+            self._monitor.disconnect(handler)
+        self._monitor_handlers.clear()
+        self._monitor.set_visible(False)
+        self._accounts_cancellable.cancel()
+        if self._export_cancel is not None:
+            self._export_cancel.set()
+        for watcher in self._account_credentials.values():
+            watcher.close()
+        self._account_credentials.clear()
         return Adw.ApplicationWindow.do_close_request(self)
 
+    def _on_map_changed(self, *_args):
+        surface = self.get_surface()
+        if self.get_mapped() and surface is not None and self._surface_handler is None:
+            self._surface_handler = surface.connect("notify::state", self._on_map_changed)
+        shown = self._is_shown()
+        self._monitor.set_visible(shown)
+        if shown and self._last_data is not None:
+            # Catch the countdowns up, which also restarts their timer.
+            self._update_reset_labels(self._last_data)
+        else:
+            self._schedule_countdown()
+
+    def _is_shown(self) -> bool:
+        """True if the window is mapped and not minimised."""
+        if not self.get_mapped():
+            return False
+        surface = self.get_surface()
+        if isinstance(surface, Gdk.Toplevel):
+            return not surface.get_state() & Gdk.ToplevelState.MINIMIZED
+        return True
+
     def refresh(self):
         """Public entry point for triggering a refresh (e.g. from app action)."""
-        self._refresh()
+        self._refresh(force=True)
 
-    def _get_refresh_interval(self) -> int:
-        """Get refresh interval from GSettings, with fallback."""
+    def _get_refresh_bounds(self) -> tuple[int, int]:
+        """Get the (floor, ceiling) refresh interval from GSettings, with fallback."""
         try:
-            return max(15, min(300, self._settings.get_uint("refresh-interval")))
+            ceiling = max(15, min(300, self._settings.get_uint("refresh-interval")))
+            floor = max(15, min(300, self._settings.get_uint("minimum-refresh-interval")))
         except GLib.Error:
-            return 60
+            return 15, 60
+        return min(floor, ceiling), ceiling
 
     def _start_timer(self):
-        """Start the auto-refresh timer."""
+        """Schedule the next multi-account poll, replacing any pending one."""
         if self._timer_id is not None:
             GLib.source_remove(self._timer_id)
-        interval = self._get_refresh_interval()
-        self._timer_id = GLib.timeout_add_seconds(interval, self._on_timer)
+            self._timer_id = None
+        if not self._team_mode:
+            return
+        delay = self._monitor.policy.adjust(self._next_poll_delay())
+        if delay is None:
+            return  # offline: the monitor's "resumed" signal restarts polling
+        self._timer_id = GLib.timeout_add_seconds(max(1, round(delay)), self._on_timer)
+
+    def _next_poll_delay(self) -> float:
+        """Seconds until the next account is due; in-flight ones reschedule on completion."""
+        idle = [account.next_due for account in self._accounts if not account.in_flight]
+        if not idle:
+            return self._get_refresh_bounds()[1]
+        return max(0.0, min(idle) - time.monotonic())
 
     def _on_interval_changed(self, _settings, _key):
         """Restart the timer when the refresh interval changes (debounced)."""
@@ -146,146 +248,524 @@ class LeewayWindow(Adw.ApplicationWindow):
     def _apply_interval_change(self) -> bool:
         """Actually restart the timer after the debounce delay."""
         self._debounce_id = None
+        bounds = self._get_refresh_bounds()
+        for account in self._accounts:
+            account.scheduler.set_bounds(*bounds)
         self._start_timer()
         return GLib.SOURCE_REMOVE
 
     def _on_timer(self) -> bool:
-        """Timer callback. Returns True to keep the timer running."""
-        self._refresh()
-        return True
+        """Timer callback. The next poll is rescheduled once the result is known."""
+        self._timer_id = None
+        if self._monitor.policy.paused:
+            return GLib.SOURCE_REMOVE  # went offline since it was scheduled
+        self._refresh_accounts(due_only=True)
+        self._start_timer()
+        return GLib.SOURCE_REMOVE
 
     def _on_refresh_clicked(self, _button):
-        self._refresh()
-
-    def _refresh(self):
-        """Read credentials and fetch usage data."""
-        self.status_label.set_text("Refreshing\u2026")
+        self._refresh(force=True)
 
-        try:
-            creds = read_credentials()
-        except CredentialError as exc:
-            self._show_error(str(exc))
-            return
-
-        if creds.is_expired:
-            self._show_error("OAuth token has expired. Re-authenticate via Claude Code CLI.")
+    def _refresh(self, force: bool = False):
+        """Refresh the accounts on display, joining any requests already pending."""
+        if self._team_mode:
+            self._refresh_accounts()
+        else:
+            self._monitor.refresh(force=force)
+
+    def _show_monitor_state(self):
+        """Paint the monitor's latest result without sending notifications."""
+        if self._monitor.data is not None:
+            self._last_data = self._monitor.data
+            self._update_ui(self._monitor.data)
+        if self._monitor.error is not None and not self._team_mode:
+            self._show_error(self._monitor.error)
+
+    def _on_monitor_refreshing(self, _monitor):
+        if not self._team_mode:
+            self._set_status("Refreshing\u2026")
+
+    def _on_monitor_failed(self, _monitor, message: str):
+        if not self._team_mode:
+            self._show_error(message)
+
+    def _on_monitor_resumed(self, _monitor):
+        """Catch every account up once when polling resumes, then keep polling."""
+        if self._team_mode:
+            self._refresh_accounts()
+            self._start_timer()
+
+    def _on_monitor_updated(self, _monitor, data: UsageData, unchanged: bool):
+        """Render a result from the monitor."""
+        self.view_state.begin_refresh()
+        # Fast path: the response matched the last one, so the bars and
+        # colours are already correct.
+        if unchanged and self._last_data is data:
+            self._update_reset_labels(data)
+            self._update_charts(data)
+            if not self._team_mode:
+                self._update_footer()
             return
 
-        # Cancel any in-flight request before starting a new one.
-        self._cancellable.cancel()
-        self._cancellable = Gio.Cancellable()
-
-        fetch_usage(creds.access_token, self._on_usage_result, self._cancellable)
-
-    def _on_usage_result(self, data: UsageData | None, error: str | None):
-        """Callback from fetch_usage — runs on the GLib main thread."""
-        if error:
-            self._show_error(error)
-            return
+        self._last_data = data
+        self._update_ui(data)
 
-        if data is None:
-            self._show_error("No data received")
-            return
+    def _get_account_concurrency(self) -> int:
+        """Get the multi-account concurrency cap from GSettings, with fallback."""
+        try:
+            return max(1, min(32, self._settings.get_uint("account-concurrency")))
+        except GLib.Error:
+            return DEFAULT_CONCURRENCY
 
-        self._update_ui(data)
-        self._check_notifications(data)
+    def _load_accounts(self):
+        """(Re)build the account list from the account-sources setting."""
+        self._accounts_cancellable.cancel()
+        self._accounts_cancellable = Gio.Cancellable()
+        self._limiter = ConcurrencyLimiter(self._get_account_concurrency())
 
-    def _update_ui(self, data: UsageData):
-        """Populate the UI with fresh usage data."""
-        # Session
-        if data.session_pct is not None:
-            self.session_group.row.set_subtitle(f"{data.session_pct:.1f} %")
-            self.session_group.bar.set_value(min(data.session_pct, 100))
-            _apply_color_to_bar(self.session_group.bar, data.session_pct, self._bar_css)
-        else:
-            self.session_group.row.set_subtitle("\u2014")
-            self.session_group.bar.set_value(0)
+        try:
+            sources = self._settings.get_strv("account-sources")
+        except GLib.Error:
+            sources = []
+
+        bounds = self._get_refresh_bounds()
+        self._team_mode = bool(sources)
+        self._accounts = [
+            Account(path=path, scheduler=PollScheduler(*bounds))
+            for path in discover_credential_files(sources)
+        ]
+        self._account_items = {
+            account: LeewayAccountItem(name=account.label) for account in self._accounts
+        }
+        # Keep watchers (and their parsed credentials) for files still listed.
+        watchers, self._account_credentials = self._account_credentials, {}
+        for account in self._accounts:
+            watcher = watchers.pop(account.path, None) or CredentialWatcher(account.path)
+            self._account_credentials[account.path] = watcher
+        for watcher in watchers.values():
+            watcher.close()
+        self.account_table.set_items(list(self._account_items.values()))
+        self.view_stack.set_visible_child_name("accounts" if self._team_mode else "single")
+        if self._team_mode:
+            self.set_default_size(720, 480)
+
+    def _on_account_sources_changed(self, _settings, _key):
+        self._load_accounts()
+        self._refresh()
+        self._start_timer()
+        if not self._team_mode:
+            self._show_monitor_state()
 
-        reset_text = format_reset_time(data.session_resets_at)
-        if data.session_resets_at is not None:
-            self.session_group.reset_label.set_label(f"Resets in {reset_text}")
-        else:
-            self.session_group.reset_label.set_label("")
+    def _on_account_concurrency_changed(self, _settings, _key):
+        self._limiter.limit = self._get_account_concurrency()
 
-        # Weekly
-        if data.weekly_pct is not None:
-            self.weekly_group.row.set_subtitle(f"{data.weekly_pct:.1f} %")
-            self.weekly_group.bar.set_value(min(data.weekly_pct, 100))
-            _apply_color_to_bar(self.weekly_group.bar, data.weekly_pct, self._bar_css)
-        else:
-            self.weekly_group.row.set_subtitle("\u2014")
-            self.weekly_group.bar.set_value(0)
+    def _refresh_accounts(self, due_only: bool = False):
+        """Queue a fetch for every account, at most account-concurrency at once.
 
-        weekly_reset_text = format_reset_time(data.weekly_resets_at)
-        if data.weekly_resets_at is not None:
-            self.weekly_group.reset_label.set_label(f"Resets in {weekly_reset_text}")
-        else:
-            self.weekly_group.reset_label.set_label("")
+        Args:
+            due_only: Only fetch accounts whose own schedule is due (timer
+                ticks); manual refreshes fetch everything.
+        """
+        if not self._accounts:
+            self._show_error("No credential files found in the configured account sources")
+            return
 
-        # Opus
-        if data.opus_pct is not None:
-            self.opus_group.row.set_subtitle(f"{data.opus_pct:.1f} %")
-            self.opus_group.bar.set_value(min(data.opus_pct, 100))
-            _apply_color_to_bar(self.opus_group.bar, data.opus_pct, self._bar_css)
+        now = time.monotonic()
+        queued = 0
+        for account in self._accounts:
+            if account.in_flight or (due_only and account.next_due > now + 1):
+                continue
+            account.in_flight = True
+            self._limiter.submit(
+                lambda done, account=account: self._fetch_account(account, done)
+            )
+            queued += 1
+        if queued:
+            self._set_status(f"Refreshing {queued} accounts\u2026")
+
+    def _fetch_account(self, account: Account, done):
+        """Limiter job: fetch one account, calling done() when finished."""
+        def on_result(data, error, unchanged=False):
+            done()
+            self._on_account_result(account, data, error, unchanged)
+
+        def on_credentials(creds, error):
+            if error:
+                on_result(None, error)
+                return
+            if creds.is_expired:
+                on_result(None, "OAuth token has expired")
+                return
+            fetch_usage(
+                creds.access_token,
+                on_result,
+                self._accounts_cancellable,
+                cache=account.cache,
+                governor=account.governor,
+            )
 
-            opus_reset_text = format_reset_time(data.opus_resets_at)
-            if data.opus_resets_at is not None:
-                self.opus_group.reset_label.set_label(f"Resets in {opus_reset_text}")
-            else:
-                self.opus_group.reset_label.set_label("")
+        self._account_credentials[account.path].load(
+            on_credentials, self._accounts_cancellable
+        )
 
-            self.opus_group.set_visible(True)
+    def _on_account_result(
+        self, account: Account, data: UsageData | None, error: str | None, unchanged: bool
+    ):
+        """Record one account's result and update only its row."""
+        account.in_flight = False
+        if error or data is None:
+            account.error = truncate_error(error or "No data received", max_length=60)
         else:
-            self.opus_group.set_visible(False)
+            account.error = None
+            account.data = data
+            account.scheduler.record(data)
+        account.next_due = time.monotonic() + max(
+            account.scheduler.next_delay(), account.governor.retry_in()
+        )
 
-        # Footer
-        now = datetime.now(timezone.utc).astimezone().strftime("%H:%M:%S")
-        self.status_label.set_text(f"Connected \u00b7 Updated {now}")
+        item = self._account_items.get(account)
+        if item is not None:
+            item.update(**self._account_row(account))
+
+        if not self._limiter.active and not self._limiter.pending:
+            failed = sum(1 for a in self._accounts if a.error)
+            now = datetime.now(timezone.utc).astimezone().strftime("%H:%M:%S")
+            summary = f"{len(self._accounts)} accounts"
+            if failed:
+                summary += f" ({failed} failing)"
+            self._set_status(f"{summary} \u00b7 Updated {now}")
+            self._start_timer()
+
+    @staticmethod
+    def _account_row(account: Account) -> dict[str, str]:
+        """Display strings for an account's table row."""
+        data = account.data
+        if data is None:
+            return {"status": account.error or ""}
 
-    def _show_error(self, message: str):
-        """Display an error message in the status label."""
-        self.status_label.set_text(f"Error: {truncate_error(message)}")
+        def pct(value: float | None) -> str:
+            return f"{value:.1f} %" if value is not None else "\u2014"
 
-    def _check_notifications(self, data: UsageData):
-        """Send desktop notifications when session usage crosses thresholds.
+        resets = (
+            format_reset_time(data.session_resets_at)
+            if data.session_resets_at is not None else ""
+        )
+        return {
+            "session": pct(data.session_pct),
+            "weekly": pct(data.weekly_pct),
+            "resets": resets,
+            "status": account.error or "OK",
+        }
 
-        Only session usage is tracked for notifications. Session limits reset
-        every 5 hours and are the most immediately actionable; weekly limits
-        are informational and shown in the dashboard but do not trigger alerts.
+    def _update_ui(self, data: UsageData):
+        """Populate the UI with fresh usage data."""
+        started = time.perf_counter()
+        with tracing.span("ui update"):
+            self._sync_usage_groups(data)
+            for key in self._usage_groups:
+                self._render(key, **usage_fields(data.get(key)))
+
+            self._update_reset_labels(data)
+            self._update_charts(data)
+            if not self._team_mode:
+                self._update_footer()
+        get_metrics().record(UI_UPDATE, time.perf_counter() - started)
+
+    def _update_charts(self, data: UsageData):
+        """Extend each bucket's trend chart, reloading it when a new window starts."""
+        updated_at = self._monitor.updated_at
+        loads = []
+        for key, group in self._usage_groups.items():
+            bucket = data.get(key)
+            window = bucket_window(key)
+            if bucket is None or bucket.resets_at is None or window is None:
+                group.chart.set_visible(False)
+                continue
+
+            chart = group.chart
+            end = bucket.resets_at.timestamp()
+            start = end - window.total_seconds()
+            if abs(chart.time_range[1] - end) > RESET_TOLERANCE_SECONDS:
+                chart.set_range(start, end)
+                chart.set_points([])
+                loads.append((key, start, end))
+            if updated_at is not None:
+                chart.append(updated_at.timestamp(), bucket.pct)
+            chart.set_visible(True)
+        if loads:
+            self._load_history(loads)
+
+    def _load_history(self, loads: list[tuple[str, float, float]]):
+        """Read each (bucket, start, end) window's samples on a worker thread.
+
+        A week of samples is tens of thousands of rows, and the first
+        query waits for the writer to open the database, so none of it
+        runs on the main loop; _on_history_loaded() fills the charts in.
         """
-        if data.session_pct is None:
+        history = self._monitor.history
+
+        def run():
+            results = []
+            for key, start, end in loads:
+                try:
+                    points = history.samples(key, int(start), int(end) + 1)
+                except sqlite3.Error:
+                    points = []
+                results.append((key, (start, end), points))
+            GLib.idle_add(self._on_history_loaded, results)
+
+        threading.Thread(target=run, name="leeway-chart-history", daemon=True).start()
+
+    def _on_history_loaded(self, results: list) -> bool:
+        updated_at = self._monitor.updated_at
+        for key, time_range, points in results:
+            group = self._usage_groups.get(key)
+            if group is None or group.chart.time_range != time_range:
+                continue  # a newer window started while loading
+            group.chart.set_points(points)
+            # Keep the sample shown while loading, if it was not yet written.
+            bucket = self._last_data.get(key) if self._last_data is not None else None
+            if bucket is not None and updated_at is not None:
+                group.chart.append(updated_at.timestamp(), bucket.pct)
+        return GLib.SOURCE_REMOVE
+
+    def _on_export_action(self, _action, _param):
+        """Ask which usage history to export, then where to save it."""
+        if self._export_cancel is not None:
+            return
+        range_row = Adw.ComboRow(
+            title="Time Range",
+            model=Gtk.StringList.new([label for label, _age in EXPORT_RANGES]),
+        )
+        bucket_keys = list(self._usage_groups)
+        bucket_row = Adw.ComboRow(
+            title="Limits",
+            model=Gtk.StringList.new(["All Limits", *map(bucket_title, bucket_keys)]),
+        )
+        rows = Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE, css_classes=["boxed-list"])
+        rows.append(range_row)
+        rows.append(bucket_row)
+
+        dialog = Adw.AlertDialog(heading="Export History", extra_child=rows)
+        dialog.add_response("cancel", "Cancel")
+        dialog.add_response("export", "Export\u2026")
+        dialog.set_response_appearance("export", Adw.ResponseAppearance.SUGGESTED)
+        dialog.set_default_response("export")
+        dialog.set_close_response("cancel")
+        dialog.connect("response", self._on_export_options_chosen, range_row, bucket_row, bucket_keys)
+        dialog.present(self)
+
+    def _on_export_options_chosen(self, _dialog, response, range_row, bucket_row, bucket_keys):
+        if response != "export":
             return
+        age = EXPORT_RANGES[range_row.get_selected()][1]
+        start = datetime.now(timezone.utc) - age if age is not None else None
+        selected = bucket_row.get_selected()
+        buckets = [bucket_keys[selected - 1]] if selected > 0 else None
+
+        filters = Gio.ListStore.new(Gtk.FileFilter)
+        for name, suffix in (("CSV", "csv"), ("JSON Lines", "jsonl")):
+            file_filter = Gtk.FileFilter(name=name)
+            file_filter.add_suffix(suffix)
+            filters.append(file_filter)
+        dialog = Gtk.FileDialog(
+            title="Export History",
+            initial_name="leeway-history.csv",
+            filters=filters,
+        )
+        dialog.save(
+            self, None,
+            lambda dialog, result: self._on_export_file_chosen(dialog, result, start, buckets),
+        )
 
+    def _on_export_file_chosen(
+        self, dialog: Gtk.FileDialog, result, start: datetime | None, buckets: list[str] | None
+    ):
         try:
-            thresholds = []
-            if self._settings.get_boolean("notify-at-75"):
-                thresholds.append(75)
-            if self._settings.get_boolean("notify-at-90"):
-                thresholds.append(90)
-            if self._settings.get_boolean("notify-at-95"):
-                thresholds.append(95)
+            file = dialog.save_finish(result)
         except GLib.Error:
-            thresholds = [75, 90, 95]
-
-        app = self.get_application()
-        if not app:
+            return  # Dismissed
+        path = Path(file.get_path())
+        fmt = "jsonl" if path.suffix.lower() in (".jsonl", ".json") else "csv"
+
+        self._export_cancel = threading.Event()
+        self._export_toast = Adw.Toast(title="Exporting history…", timeout=0, button_label="Cancel")
+        self._export_toast.connect("button-clicked", lambda _toast: self._export_cancel.set())
+        self.toast_overlay.add_toast(self._export_toast)
+
+        threading.Thread(
+            target=self._run_export,
+            args=(path, fmt, self._monitor.history, start, buckets, self._export_cancel),
+            name="leeway-export",
+            daemon=True,
+        ).start()
+
+    def _run_export(
+        self,
+        path: Path,
+        fmt: str,
+        history: HistoryStore,
+        start: datetime | None,
+        buckets: list[str] | None,
+        cancel: threading.Event,
+    ):
+        """Worker thread: stream the history to path, reporting back on the main loop."""
+        from .exporter import ExportCancelled, export
+
+        # Include the sample that was just fetched.
+        history.flush(timeout=1)
+        count, error = 0, None
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as output:
+                count = export(
+                    output, fmt,
+                    path=history.path, start=start, buckets=buckets, cancelled=cancel.is_set,
+                )
+        except ExportCancelled:
+            error = "Export cancelled"
+        except (OSError, sqlite3.Error) as exc:
+            error = f"Export failed: {exc}"
+        if error is not None:
+            path.unlink(missing_ok=True)
+        GLib.idle_add(self._on_export_finished, count, error)
+
+    def _on_export_finished(self, count: int, error: str | None):
+        if self._export_toast is not None:
+            self._export_toast.dismiss()
+        self._export_cancel = None
+        self._export_toast = None
+        self.toast_overlay.add_toast(Adw.Toast(title=error or f"Exported {count} samples"))
+
+    def _usage_group(self, key: str) -> LeewayUsageGroup:
+        """Return the group showing a bucket, creating it on first use."""
+        group = self._usage_groups.get(key)
+        if group is None:
+            group = LeewayUsageGroup(title=bucket_title(key))
+            # Remove default level bar offsets (can't be done in XML)
+            _strip_default_offsets(group.bar)
+            self.usage_box.append(group)
+            self._usage_groups[key] = group
+        return group
+
+    def _sync_usage_groups(self, data: UsageData):
+        """Show a group for each bucket in data, in order, and hide the rest."""
+        shown = list(dict.fromkeys(
+            [*ALWAYS_SHOWN_BUCKETS, *(bucket.key for bucket in data.buckets)]
+        ))
+        for key in shown:
+            self._usage_group(key)
+        if not self.view_state.diff(self.usage_box, {"order": tuple(shown)}):
+            return
+        previous = None
+        for key in shown:
+            group = self._usage_groups[key]
+            self.usage_box.reorder_child_after(group, previous)
+            group.set_visible(True)
+            previous = group
+        for key, group in self._usage_groups.items():
+            if key not in shown:
+                group.set_visible(False)
+
+    def _update_reset_labels(self, data: UsageData):
+        """Refresh the reset and limit countdowns, which change even when data doesn't."""
+        forecaster = self._monitor.forecaster
+        for key in self._usage_groups:
+            self._render(key, **countdown_fields(data.get(key), forecaster.forecast(key)))
+        self._schedule_countdown()
+
+    def _schedule_countdown(self):
+        """Wake once, when the first reset or limit countdown label next changes.
+
+        The labels count down locally from the times already fetched, so
+        they stay accurate however long the refresh interval is. Nothing
+        is scheduled while the window is hidden.
+        """
+        if self._countdown_id is not None:
+            GLib.source_remove(self._countdown_id)
+            self._countdown_id = None
+        data = self._last_data
+        if data is None or self._team_mode or not self._is_shown():
             return
 
-        for threshold in thresholds:
-            if data.session_pct >= threshold and threshold not in self._notification_tracker:
-                self._notification_tracker.add(threshold)
+        now = datetime.now(timezone.utc)
+        forecaster = self._monitor.forecaster
+        delays = []
+        for key in self._usage_groups:
+            bucket = data.get(key)
+            forecast = forecaster.forecast(key)
+            for when in (
+                bucket.resets_at if bucket is not None else None,
+                forecast.limit_at if forecast is not None else None,
+            ):
+                delay = next_countdown_change(when, now=now)
+                if delay is not None:
+                    delays.append(delay)
+        if delays:
+            self._countdown_id = GLib.timeout_add(
+                math.ceil(min(delays) * 1000) + COUNTDOWN_SLACK_MS, self._on_countdown
+            )
 
-                reset_text = format_reset_time(data.session_resets_at)
-                if reset_text == "now":
-                    body = f"Session usage has reached {threshold} %. Resets now."
-                else:
-                    body = f"Session usage has reached {threshold} %. Resets in {reset_text}."
+    def _on_countdown(self) -> bool:
+        self._countdown_id = None
+        if self._last_data is not None:
+            self._update_reset_labels(self._last_data)
+        return GLib.SOURCE_REMOVE
 
-                notification = Gio.Notification.new(f"Leeway: {data.session_pct:.0f} %")
-                notification.set_body(body)
-                app.send_notification(f"threshold-{threshold}", notification)
+    def _set_status(self, text: str):
+        """Show text in the status label below the usage groups."""
+        self._render("status", text=text)
 
-        # Reset tracker when usage drops below 50% (i.e. after a session reset),
-        # so that notifications fire again for the new session.
-        if data.session_pct < 50:
-            self._notification_tracker.clear()
+    def _render(self, widget: str, **fields):
+        """Queue the fields of a usage group (or "status") that differ from what it shows."""
+        changed = self.view_state.diff(widget, fields)
+        if not changed:
+            return
+        for name, value in changed.items():
+            self._pending[widget, name] = value
+        if self._tick_id is None:
+            # Runs once the window is next drawn; a hidden window just
+            # keeps the latest value of each field until then.
+            self._tick_id = self.add_tick_callback(self._apply_pending)
+
+    def _apply_pending(self, _widget, _frame_clock) -> bool:
+        """Apply every queued widget change in a single frame."""
+        self._tick_id = None
+        started = time.perf_counter()
+        pending, self._pending = self._pending, {}
+        with tracing.span("ui apply", changes=len(pending)):
+            for (widget, name), value in pending.items():
+                if widget == "status":
+                    self.status_label.set_text(value)
+                    continue
+                group = self._usage_groups[widget]
+                if name == "subtitle":
+                    group.row.set_subtitle(value)
+                elif name == "value":
+                    group.bar.set_value(value)
+                elif name == "status":
+                    _apply_status_class(group.bar, value)
+                elif name == "reset":
+                    group.reset_label.set_label(value)
+                elif name == "description":
+                    group.set_description(value)
+        metrics = get_metrics()
+        metrics.record(UI_APPLY, time.perf_counter() - started)
+        metrics.count("ui.widget_changes", len(pending))
+        return GLib.SOURCE_REMOVE
+
+    def _update_footer(self):
+        """Show the last successful update time in the status label."""
+        updated_at = self._monitor.updated_at or datetime.now(timezone.utc)
+        if self._monitor.stale:
+            self._set_status(f"Stale \u00b7 updated {format_age(updated_at)}")
+            return
+        when = updated_at.astimezone().strftime("%H:%M:%S")
+        self._set_status(f"Connected \u00b7 Updated {when}")
+
+    def _show_error(self, message: str):
+        """Display an error message in the status label, with any backoff state."""
+        text = f"Error: {truncate_error(message)}"
+        retry_in = self._monitor.retry_in()
+        if retry_in > 0:
+            text += f" \u00b7 retrying in {format_duration(retry_in)}"
+        self._set_status(text)
@@ -0,0 +1,141 @@
+"""A scriptable local stand-in for the usage endpoint, built on Soup.Server.
+
+Used by the fetch-layer tests and by benchmarks/fetch_load.py. Point the
+app at it by setting LEEWAY_API_URL to server.url.
+"""
+
+import hashlib
+import json
+from collections import deque
+from dataclasses import dataclass, field
+
+import gi
+
+gi.require_version("Soup", "3.0")
+
+from gi.repository import GLib, Soup  # noqa: E402
+
+DEFAULT_BODY = json.dumps({
+    "five_hour": {"utilization_pct": 12.0, "resets_at": "2026-02-20T20:00:00Z"},
+    "seven_day": {"utilization_pct": 34.0, "resets_at": "2026-02-23T00:00:00Z"},
+}).encode("utf-8")
+
+
+@dataclass
+class MockResponse:
+    """How the server answers one request."""
+
+    status: int = 200
+    body: bytes | None = None      # None: the server's current body
+    delay_ms: int = 0              # latency before the response is sent
+    truncate: bool = False         # promise the whole body, then hang up half way
+    retry_after: str | None = None
+
+
+@dataclass
+class ServerStats:
+    """What the server has seen, for assertions and load reports."""
+
+    requests: int = 0
+    not_modified: int = 0
+    body_bytes: int = 0            # response bodies only, not headers
+    remote_ports: set[int] = field(default_factory=set)
+
+    @property
+    def connections(self) -> int:
+        """Distinct client connections, identified by their source port."""
+        return len(self.remote_ports)
+
+
+class MockUsageServer:
+    """Serve usage responses on 127.0.0.1 from a script.
+
+    Queued responses are used first, in order; after that every request
+    gets `default`. With `etag=True` the server sends an ETag and answers
+    a matching If-None-Match with 304 Not Modified.
+    """
+
+    def __init__(self, body: bytes = DEFAULT_BODY, *, etag: bool = False):
+        self.body = body
+        self.etag = etag
+        self.default = MockResponse()
+        self.stats = ServerStats()
+        self._queue: deque[MockResponse] = deque()
+
+        self._server = Soup.Server()
+        self._server.add_handler(None, self._on_request)
+        self._server.listen_local(0, Soup.ServerListenOptions.IPV4_ONLY)
+        port = self._server.get_uris()[0].get_port()
+        self.url = f"http://127.0.0.1:{port}/api/oauth/usage"
+
+    def enqueue(self, *responses: MockResponse):
+        """Script the next responses."""
+        self._queue.extend(responses)
+
+    def close(self):
+        self._server.disconnect()
+
+    def _on_request(self, _server, msg, _path, _query):
+        self.stats.requests += 1
+        address = msg.get_remote_address()
+        if address is not None:
+            self.stats.remote_ports.add(address.get_port())
+
+        response = self._queue.popleft() if self._queue else self.default
+        if response.delay_ms:
+            msg.pause()
+
+            def send():
+                self._respond(msg, response)
+                if not response.truncate:  # a truncated message no longer has a connection
+                    msg.unpause()
+                return GLib.SOURCE_REMOVE
+
+            GLib.timeout_add(response.delay_ms, send)
+        else:
+            self._respond(msg, response)
+
+    def _respond(self, msg, response: MockResponse):
+        body = self.body if response.body is None else response.body
+        headers = msg.get_response_headers()
+
+        if response.retry_after is not None:
+            headers.append("Retry-After", response.retry_after)
+
+        if self.etag and response.status == 200:
+            tag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            headers.append("ETag", tag)
+            if msg.get_request_headers().get_one("If-None-Match") == tag:
+                self.stats.not_modified += 1
+                msg.set_status(304, None)
+                return
+
+        if response.truncate:
+            self._send_truncated(msg, response.status, body)
+            return
+
+        msg.set_status(response.status, None)
+        msg.set_response("application/json", Soup.MemoryUse.COPY, body)
+        self.stats.body_bytes += len(body)
+
+    def _send_truncated(self, msg, status: int, body: bytes):
+        """Write the headers for all of body by hand, send half of it and close.
+
+        The response is correctly framed, so the client sees a short read
+        rather than a complete response holding invalid JSON.
+        """
+        lines = [
+            f"HTTP/1.1 {status} {Soup.Status.get_phrase(status)}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        msg.get_response_headers().foreach(lambda name, value: lines.append(f"{name}: {value}"))
+        sent = body[: len(body) // 2]
+
+        stream = msg.steal_connection()
+        stream.get_output_stream().write_all(
+            "\r\n".join(lines).encode("ascii") + b"\r\n\r\n" + sent, None
+        )
+        stream.close(None)
+        self.stats.body_bytes += len(sent)
@@ -0,0 +1,77 @@
+"""Tests for accounts module."""
+
+from pathlib import Path
+
+from app.accounts import Account, ConcurrencyLimiter, account_label
+from app.poll_scheduler import PollScheduler
+
+
+class TestAccountLabel:
+    """Tests for account_label()."""
+
+    def test_uses_file_stem(self):
+        assert account_label(Path("/team/alice.json")) == "alice"
+
+    def test_uses_parent_for_dotfiles(self):
+        assert account_label(Path("/team/bob/.credentials.json")) == "bob"
+
+    def test_account_defaults_label_from_path(self):
+        account = Account(path=Path("/team/carol.json"), scheduler=PollScheduler(15, 60))
+        assert account.label == "carol"
+
+
+class TestConcurrencyLimiter:
+    """Tests for ConcurrencyLimiter."""
+
+    def test_runs_at_most_limit_jobs(self):
+        limiter = ConcurrencyLimiter(2)
+        started = []
+        for i in range(5):
+            limiter.submit(lambda done, i=i: started.append((i, done)))
+
+        assert [i for i, _ in started] == [0, 1]
+        assert limiter.active == 2
+        assert limiter.pending == 3
+
+    def test_completion_starts_next_job_in_order(self):
+        limiter = ConcurrencyLimiter(2)
+        started = []
+        for i in range(4):
+            limiter.submit(lambda done, i=i: started.append((i, done)))
+
+        started[1][1]()
+
+        assert [i for i, _ in started] == [0, 1, 2]
+        assert limiter.active == 2
+
+    def test_synchronous_jobs_do_not_recurse(self):
+        limiter = ConcurrencyLimiter(1)
+        ran = []
+        for i in range(5000):
+            limiter.submit(lambda done, i=i: (ran.append(i), done()))
+
+        assert len(ran) == 5000
+        assert limiter.active == 0
+
+    def test_done_is_idempotent(self):
+        limiter = ConcurrencyLimiter(1)
+        dones = []
+        limiter.submit(dones.append)
+        dones[0]()
+        dones[0]()
+
+        assert limiter.active == 0
+
+    def test_clear_drops_pending_jobs(self):
+        limiter = ConcurrencyLimiter(1)
+        started = []
+        for i in range(3):
+            limiter.submit(lambda done, i=i: started.append(done))
+        limiter.clear()
+        started[0]()
+
+        assert len(started) == 1
+        assert limiter.pending == 0
+
+    def test_limit_is_at_least_one(self):
+        assert ConcurrencyLimiter(0).limit == 1
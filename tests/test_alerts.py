@@ -0,0 +1,99 @@
+"""Tests for alerts module."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.alerts import SESSION_THRESHOLDS, UsageAlerts
+from app.burn_rate import Forecast
+from app.usage_model import SESSION, UsageData
+
+NOW = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+RESETS = NOW + timedelta(hours=2, minutes=30)
+
+
+def _session(pct: float | None) -> UsageData:
+    return UsageData(session_pct=pct, session_resets_at=RESETS)
+
+
+class TestThresholdAlerts:
+    """Tests for UsageAlerts.threshold_alerts()."""
+
+    def test_fires_once_per_threshold(self):
+        alerts = UsageAlerts()
+        first = alerts.threshold_alerts(_session(80.0), SESSION_THRESHOLDS, now=NOW)
+        assert [alert.id for alert in first] == ["threshold-75"]
+        assert first[0].title == "Leeway: 80 %"
+        assert first[0].body == "Session usage has reached 75 %. Resets in 2h 30m."
+
+        assert alerts.threshold_alerts(_session(85.0), SESSION_THRESHOLDS, now=NOW) == []
+
+    def test_crossing_several_at_once(self):
+        alerts = UsageAlerts()
+        fired = alerts.threshold_alerts(_session(96.0), SESSION_THRESHOLDS, now=NOW)
+        assert [alert.id for alert in fired] == ["threshold-75", "threshold-90", "threshold-95"]
+
+    def test_only_enabled_thresholds(self):
+        alerts = UsageAlerts()
+        fired = alerts.threshold_alerts(_session(96.0), [90], now=NOW)
+        assert [alert.id for alert in fired] == ["threshold-90"]
+
+    def test_rearms_after_reset(self):
+        alerts = UsageAlerts()
+        alerts.threshold_alerts(_session(80.0), SESSION_THRESHOLDS, now=NOW)
+        alerts.threshold_alerts(_session(60.0), SESSION_THRESHOLDS, now=NOW)
+        assert alerts.threshold_alerts(_session(80.0), SESSION_THRESHOLDS, now=NOW) == []
+
+        alerts.threshold_alerts(_session(2.0), SESSION_THRESHOLDS, now=NOW)
+        assert len(alerts.threshold_alerts(_session(80.0), SESSION_THRESHOLDS, now=NOW)) == 1
+
+    def test_resets_now(self):
+        alerts = UsageAlerts()
+        data = UsageData(session_pct=76.0, session_resets_at=NOW - timedelta(seconds=1))
+        (alert,) = alerts.threshold_alerts(data, SESSION_THRESHOLDS, now=NOW)
+        assert alert.body.endswith("Resets now.")
+
+    def test_no_session_data(self):
+        assert UsageAlerts().threshold_alerts(_session(None), SESSION_THRESHOLDS) == []
+
+
+class TestForecastAlerts:
+    """Tests for UsageAlerts.forecast_alerts()."""
+
+    def _forecast(self, limit_in: timedelta, resets_at=RESETS, key=SESSION) -> Forecast:
+        return Forecast(key=key, rate=0.01, limit_at=NOW + limit_in, resets_at=resets_at)
+
+    def test_warns_once_per_window(self):
+        alerts = UsageAlerts()
+        (alert,) = alerts.forecast_alerts([self._forecast(timedelta(minutes=47))], now=NOW)
+        assert alert.id == "forecast-five_hour"
+        assert alert.title == "Leeway: session limit in 47m"
+        assert alert.body == (
+            "At this rate, session usage will reach its limit in 47m, 1h 43m before it resets."
+        )
+        assert alerts.forecast_alerts([self._forecast(timedelta(minutes=40))], now=NOW) == []
+
+        next_window = self._forecast(timedelta(minutes=40), resets_at=RESETS + timedelta(hours=5))
+        assert len(alerts.forecast_alerts([next_window], now=NOW)) == 1
+
+    def test_ignores_jittered_reset_times(self):
+        alerts = UsageAlerts()
+        assert len(alerts.forecast_alerts([self._forecast(timedelta(minutes=47))], now=NOW)) == 1
+
+        for offset in (1, -2, 3, -1, 30):
+            jittered = self._forecast(timedelta(minutes=40), resets_at=RESETS + timedelta(seconds=offset))
+            assert alerts.forecast_alerts([jittered], now=NOW) == []
+
+    def test_remembers_one_window_per_bucket(self):
+        alerts = UsageAlerts()
+        for window in range(10):
+            resets_at = RESETS + window * timedelta(hours=5)
+            assert len(alerts.forecast_alerts([self._forecast(timedelta(minutes=10), resets_at)], now=NOW)) == 1
+
+        assert len(alerts._forecasts) == 1
+
+    def test_ignores_limits_after_reset(self):
+        forecast = self._forecast(timedelta(hours=3))
+        assert UsageAlerts().forecast_alerts([forecast, None], now=NOW) == []
+
+    def test_ignores_unnamed_buckets(self):
+        forecast = self._forecast(timedelta(minutes=10), key="seven_day_opus")
+        assert UsageAlerts().forecast_alerts([forecast], now=NOW) == []
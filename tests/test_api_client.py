@@ -1,10 +1,21 @@
 """Tests for api_client module."""
 
 import json
+from datetime import datetime, timezone
 
 import pytest
 
-from app.api_client import API_URL, ApiError, build_request_headers, parse_response_body
+from app.api_client import (
+    API_URL,
+    API_URL_ENV,
+    ApiError,
+    ResponseCache,
+    build_request_headers,
+    fingerprint_body,
+    get_api_url,
+    parse_response_body,
+    parse_retry_after,
+)
 from app.config import APP_ID, VERSION
 from app.usage_model import UsageData
 
@@ -32,6 +43,45 @@ class TestBuildRequestHeaders:
         assert API_URL == "https://api.anthropic.com/api/oauth/usage"
 
 
+class TestGetApiUrl:
+    """Tests for get_api_url()."""
+
+    def test_defaults_to_api_url(self, monkeypatch):
+        monkeypatch.delenv(API_URL_ENV, raising=False)
+        assert get_api_url() == API_URL
+
+    def test_env_var_overrides(self, monkeypatch):
+        monkeypatch.setenv(API_URL_ENV, "http://127.0.0.1:8080/usage")
+        assert get_api_url() == "http://127.0.0.1:8080/usage"
+
+    def test_empty_env_var_is_ignored(self, monkeypatch):
+        monkeypatch.setenv(API_URL_ENV, "")
+        assert get_api_url() == API_URL
+
+
+class TestParseRetryAfter:
+    """Tests for parse_retry_after()."""
+
+    NOW = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+
+    def test_none_returns_none(self):
+        assert parse_retry_after(None) is None
+
+    def test_parses_delta_seconds(self):
+        assert parse_retry_after("120") == 120.0
+
+    def test_parses_http_date(self):
+        value = "Fri, 20 Feb 2026 12:02:00 GMT"
+        assert parse_retry_after(value, now=self.NOW) == 120.0
+
+    def test_past_http_date_is_zero(self):
+        value = "Fri, 20 Feb 2026 11:00:00 GMT"
+        assert parse_retry_after(value, now=self.NOW) == 0.0
+
+    def test_garbage_returns_none(self):
+        assert parse_retry_after("soon") is None
+
+
 class TestParseResponseBody:
     """Tests for parse_response_body()."""
 
@@ -83,3 +133,110 @@ class TestParseResponseBody:
         assert data.session_pct == 10.0
         assert data.weekly_pct == 30.0
         assert data.opus_pct == 55.0
+
+
+BODY = json.dumps({
+    "five_hour": {"utilization_pct": 12.0, "resets_at": "2026-02-20T20:00:00Z"},
+    "seven_day": {"utilization_pct": 34.0, "resets_at": "2026-02-23T00:00:00Z"},
+}).encode("utf-8")
+
+
+class TestFingerprintBody:
+    """Tests for fingerprint_body()."""
+
+    def test_identical_bodies_match(self):
+        assert fingerprint_body(BODY) == fingerprint_body(bytes(BODY))
+
+    def test_different_bodies_differ(self):
+        assert fingerprint_body(BODY) != fingerprint_body(BODY + b" ")
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_first_response_is_parsed(self):
+        cache = ResponseCache()
+
+        data, unchanged = cache.resolve(BODY)
+
+        assert unchanged is False
+        assert data.session_pct == 12.0
+        assert cache.stats.parsed == 1
+
+    def test_identical_response_returns_cached_data(self):
+        cache = ResponseCache()
+        first, _ = cache.resolve(BODY)
+
+        second, unchanged = cache.resolve(BODY)
+
+        assert unchanged is True
+        assert second is first
+        assert cache.stats.parsed == 1
+        assert cache.stats.unchanged == 1
+
+    def test_changed_response_is_parsed_again(self):
+        cache = ResponseCache()
+        cache.resolve(BODY)
+
+        data, unchanged = cache.resolve(BODY.replace(b"12.0", b"13.0"))
+
+        assert unchanged is False
+        assert data.session_pct == 13.0
+        assert cache.stats.parsed == 2
+
+    def test_invalid_body_raises_and_keeps_previous_data(self):
+        cache = ResponseCache()
+        first, _ = cache.resolve(BODY, etag='"v1"')
+
+        with pytest.raises(ApiError, match="parse"):
+            cache.resolve(b"{bad json", etag='"v2"')
+
+        assert cache.data is first
+        assert cache.etag == '"v1"'
+
+    def test_undecodable_body_raises(self):
+        with pytest.raises(ApiError, match="read response"):
+            ResponseCache().resolve(b"\xff\xfe")
+
+    def test_no_conditional_headers_before_first_response(self):
+        assert ResponseCache().conditional_headers() == {}
+
+    def test_conditional_headers_echo_validators(self):
+        cache = ResponseCache()
+        cache.resolve(BODY, etag='"abc"', last_modified="Fri, 20 Feb 2026 12:00:00 GMT")
+
+        assert cache.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Fri, 20 Feb 2026 12:00:00 GMT",
+        }
+
+    def test_not_modified_returns_cached_data(self):
+        cache = ResponseCache()
+        first, _ = cache.resolve(BODY, etag='"abc"')
+
+        assert cache.resolve_not_modified() is first
+        assert cache.stats.not_modified == 1
+
+    def test_not_modified_without_cache_returns_none(self):
+        assert ResponseCache().resolve_not_modified() is None
+
+    def test_token_change_clears_cache(self):
+        cache = ResponseCache()
+        cache.bind_token("token-a")
+        cache.resolve(BODY, etag='"abc"')
+
+        cache.bind_token("token-b")
+
+        assert cache.data is None
+        assert cache.conditional_headers() == {}
+        _, unchanged = cache.resolve(BODY)
+        assert unchanged is False
+
+    def test_same_token_keeps_cache(self):
+        cache = ResponseCache()
+        cache.bind_token("token-a")
+        cache.resolve(BODY)
+
+        cache.bind_token("token-a")
+
+        assert cache.data is not None
@@ -0,0 +1,142 @@
+"""Tests for api_fetcher against a local mock endpoint over a real socket."""
+
+import pytest
+
+pytest.importorskip("gi")
+
+from gi.repository import Gio, GLib  # noqa: E402
+
+from app import api_fetcher  # noqa: E402
+from app.api_client import API_URL_ENV, ResponseCache  # noqa: E402
+from app.request_governor import CircuitState, RequestGovernor  # noqa: E402
+from mock_usage_server import MockResponse, MockUsageServer  # noqa: E402
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = MockUsageServer()
+    monkeypatch.setenv(API_URL_ENV, server.url)
+    yield server
+    server.close()
+
+
+def _fetch(cache=None, governor=None):
+    """Run one fetch to completion and return its callback arguments."""
+    results = []
+    loop = GLib.MainLoop()
+
+    def on_result(*args):
+        results.append(args)
+        loop.quit()
+
+    api_fetcher.fetch_usage(
+        "token",
+        on_result,
+        cache=cache or ResponseCache(),
+        governor=governor or RequestGovernor(),
+    )
+    if not results:
+        loop.run()
+    return results[0]
+
+
+class TestFetchUsage:
+    """Tests for fetch_usage()."""
+
+    def test_fetches_and_parses(self, server):
+        data, error, unchanged = _fetch()
+
+        assert error is None
+        assert unchanged is False
+        assert data.session_pct == 12.0
+        assert server.stats.requests == 1
+
+    def test_repeated_body_is_unchanged(self, server):
+        cache = ResponseCache()
+        _fetch(cache)
+
+        data, error, unchanged = _fetch(cache)
+
+        assert error is None
+        assert unchanged is True
+        assert cache.stats.unchanged == 1
+
+    def test_sends_if_none_match_and_handles_304(self, server):
+        server.etag = True
+        cache = ResponseCache()
+        first, _, _ = _fetch(cache)
+
+        data, error, unchanged = _fetch(cache)
+
+        assert error is None
+        assert unchanged is True
+        assert data is first
+        assert server.stats.not_modified == 1
+
+    def test_reuses_connection(self, server):
+        cache = ResponseCache()
+        for _ in range(5):
+            _fetch(cache)
+
+        assert server.stats.connections == 1
+
+    def test_rate_limit_honours_retry_after(self, server):
+        server.enqueue(MockResponse(status=429, retry_after="120"))
+        governor = RequestGovernor()
+
+        data, error, _ = _fetch(governor=governor)
+
+        assert data is None
+        assert "429" in error
+        assert governor.retry_in() > 100
+
+    def test_backing_off_skips_the_network(self, server):
+        governor = RequestGovernor()
+        governor.record_failure("earlier failure", retry_after=60)
+
+        _, error, _ = _fetch(governor=governor)
+
+        assert error == "earlier failure"
+        assert server.stats.requests == 0
+
+    def test_cancelled_probe_lets_the_next_request_through(self, server):
+        governor = RequestGovernor(base_delay=0, failure_threshold=1, open_duration=0)
+        governor.record_failure("earlier failure")
+        server.enqueue(MockResponse(delay_ms=2000))
+        cancellable = Gio.Cancellable()
+        api_fetcher.fetch_usage(
+            "token", lambda *args: None, cancellable, cache=ResponseCache(), governor=governor
+        )
+        assert governor.state is CircuitState.HALF_OPEN
+
+        cancellable.cancel()
+        data, error, _ = _fetch(governor=governor)
+
+        assert error is None
+        assert data.session_pct == 12.0
+        assert governor.state is CircuitState.CLOSED
+
+    def test_truncated_body_is_an_error(self, server):
+        server.enqueue(MockResponse(truncate=True))
+
+        data, error, _ = _fetch()
+
+        assert data is None
+        assert error.startswith("HTTP request failed")
+
+    def test_malformed_body_is_an_error(self, server):
+        server.enqueue(MockResponse(body=server.body[: len(server.body) // 2]))
+
+        data, error, _ = _fetch()
+
+        assert data is None
+        assert "parse" in error
+
+    def test_deadline_aborts_slow_response(self, server, monkeypatch):
+        monkeypatch.setattr(api_fetcher, "REQUEST_DEADLINE_SECONDS", 1)
+        server.enqueue(MockResponse(delay_ms=3000))
+
+        data, error, _ = _fetch()
+
+        assert data is None
+        assert "timed out" in error
@@ -0,0 +1,158 @@
+"""Tests for burn_rate module — driven by synthetic series."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.burn_rate import (
+    DEFAULT_TIME_CONSTANT,
+    SESSION_TIME_CONSTANT,
+    BurnRateEstimator,
+    BurnRateForecaster,
+)
+from app.usage_model import UsageData
+
+START = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _feed(forecaster, series, *, interval=60, resets_at=None, weekly=None):
+    """Feed (pct per sample) at a fixed interval; return the last sample time."""
+    at = START
+    for i, pct in enumerate(series):
+        at = START + timedelta(seconds=i * interval)
+        forecaster.record(
+            UsageData(session_pct=pct, session_resets_at=resets_at, weekly_pct=weekly),
+            now=at,
+        )
+    return at
+
+
+class TestBurnRateEstimator:
+    """Tests for BurnRateEstimator."""
+
+    def test_converges_on_constant_rate(self):
+        estimator = BurnRateEstimator(SESSION_TIME_CONSTANT)
+        for i in range(60):
+            estimator.add(10.0 + 0.5 * i, START + timedelta(minutes=i))
+
+        assert estimator.rate == pytest.approx(0.5 / 60)
+
+    def test_irregular_intervals_do_not_skew_rate(self):
+        estimator = BurnRateEstimator(SESSION_TIME_CONSTANT)
+        elapsed = 0
+        for step in [15, 300, 15, 15, 120, 60, 15, 600, 30] * 4:
+            elapsed += step
+            estimator.add(elapsed / 100, START + timedelta(seconds=elapsed))
+
+        assert estimator.rate == pytest.approx(0.01)
+
+    def test_small_dip_is_noise(self):
+        estimator = BurnRateEstimator(SESSION_TIME_CONSTANT)
+        for i in range(30):
+            estimator.add(2.0 * i, START + timedelta(minutes=i))
+        estimator.add(57.0, START + timedelta(minutes=30))
+
+        assert estimator.ready
+        assert estimator.rate > 0
+
+    def test_drop_starts_over(self):
+        estimator = BurnRateEstimator(SESSION_TIME_CONSTANT)
+        for i in range(30):
+            estimator.add(2.0 * i, START + timedelta(minutes=i))
+        estimator.add(1.0, START + timedelta(minutes=31))
+
+        assert estimator.rate == 0.0
+        assert not estimator.ready
+
+    def test_not_ready_until_enough_history(self):
+        estimator = BurnRateEstimator(SESSION_TIME_CONSTANT)
+        estimator.add(10.0, START)
+        estimator.add(20.0, START + timedelta(seconds=60))
+
+        assert estimator.limit_at() is None
+
+    def test_duplicate_timestamps_are_ignored(self):
+        estimator = BurnRateEstimator(SESSION_TIME_CONSTANT)
+        estimator.add(10.0, START)
+        estimator.add(50.0, START)
+
+        assert estimator.last_pct == 10.0
+
+
+class TestBurnRateForecaster:
+    """Tests for BurnRateForecaster."""
+
+    def test_projects_limit_of_steady_climb(self):
+        forecaster = BurnRateForecaster()
+        # One point a minute from 40 %: 100 % is 60 minutes after 40 %.
+        last = _feed(forecaster, [40.0 + i for i in range(20)])
+
+        forecast = forecaster.forecast("five_hour")
+
+        assert forecast.limit_at == pytest.approx(last + timedelta(minutes=41), abs=timedelta(seconds=1))
+
+    def test_limit_before_reset(self):
+        forecaster = BurnRateForecaster()
+        resets_at = START + timedelta(hours=3)
+        _feed(forecaster, [40.0 + i for i in range(20)], resets_at=resets_at)
+
+        assert forecaster.forecast("five_hour").before_reset is True
+
+    def test_limit_after_reset(self):
+        forecaster = BurnRateForecaster()
+        resets_at = START + timedelta(minutes=30)
+        _feed(forecaster, [40.0 + i for i in range(20)], resets_at=resets_at)
+
+        assert forecaster.forecast("five_hour").before_reset is False
+
+    def test_flat_usage_has_no_forecast(self):
+        forecaster = BurnRateForecaster()
+        _feed(forecaster, [25.0] * 30)
+
+        assert forecaster.forecast("five_hour") is None
+
+    def test_at_limit_has_no_forecast(self):
+        forecaster = BurnRateForecaster()
+        _feed(forecaster, [90.0 + i for i in range(11)])
+
+        assert forecaster.forecast("five_hour") is None
+
+    def test_rounded_climb_is_close(self):
+        forecaster = BurnRateForecaster()
+        # 0.25 points a minute, reported to whole percent like "utilization".
+        series = [float(round(10 + 0.25 * i)) for i in range(120)]
+        last = _feed(forecaster, series)
+
+        forecast = forecaster.forecast("five_hour")
+
+        assert forecast.rate * 60 == pytest.approx(0.25, rel=0.1)
+        expected = last + timedelta(minutes=(100 - series[-1]) / 0.25)
+        assert abs((forecast.limit_at - expected).total_seconds()) < 30 * 60
+
+    def test_noisy_climb_is_roughly_right(self):
+        rng = random.Random(42)
+        forecaster = BurnRateForecaster()
+        series = [10 + 0.25 * i + rng.uniform(-1.0, 1.0) for i in range(120)]
+        _feed(forecaster, series)
+
+        assert forecaster.forecast("five_hour").rate * 60 == pytest.approx(0.25, rel=0.35)
+
+    def test_weekly_uses_slower_average(self):
+        forecaster = BurnRateForecaster()
+        # Flat for one time constant, then a point an hour for another.
+        samples = int(DEFAULT_TIME_CONSTANT / 300)
+        series = [10.0] * samples + [10.0 + i / 12 for i in range(1, samples + 1)]
+        for i, pct in enumerate(series):
+            forecaster.record(
+                UsageData(session_pct=pct, weekly_pct=pct), now=START + timedelta(seconds=300 * i)
+            )
+
+        weekly = forecaster.forecast("seven_day").rate * 3600
+        session = forecaster.forecast("five_hour").rate * 3600
+
+        assert session == pytest.approx(1.0)
+        assert 0.6 < weekly < 0.85
+
+    def test_unknown_bucket(self):
+        assert BurnRateForecaster().forecast("five_hour") is None
@@ -6,7 +6,16 @@ from pathlib import Path
 
 import pytest
 
-from app.credential_reader import Credentials, read_credentials, CredentialError, DEFAULT_CREDENTIALS_PATH
+from app.credential_reader import (
+    DEFAULT_CREDENTIALS_PATH,
+    CredentialCache,
+    CredentialError,
+    Credentials,
+    discover_credential_files,
+    parse_credentials,
+    read_credentials,
+    stat_signature,
+)
 
 
 class TestReadCredentials:
@@ -112,3 +121,162 @@ class TestReadCredentials:
 
         creds = read_credentials(cred_file)
         assert creds.is_expired is False
+
+
+class TestDiscoverCredentialFiles:
+    """Tests for discover_credential_files()."""
+
+    def test_expands_directory_in_name_order(self, tmp_path):
+        for name in ("b.json", "a.json", "notes.txt"):
+            (tmp_path / name).write_text("{}")
+
+        found = discover_credential_files([tmp_path])
+
+        assert [p.name for p in found] == ["a.json", "b.json"]
+
+    def test_accepts_individual_files(self, tmp_path):
+        cred_file = tmp_path / "alice.json"
+        cred_file.write_text("{}")
+
+        assert discover_credential_files([cred_file]) == [cred_file]
+
+    def test_skips_missing_paths(self, tmp_path):
+        assert discover_credential_files([tmp_path / "missing"]) == []
+
+    def test_drops_duplicates(self, tmp_path):
+        cred_file = tmp_path / "alice.json"
+        cred_file.write_text("{}")
+
+        found = discover_credential_files([cred_file, tmp_path, str(cred_file)])
+
+        assert found == [cred_file]
+
+
+def _write_credentials(path, token="sk-ant-oat01-test"):
+    path.write_text(json.dumps({
+        "claudeAiOauth": {
+            "accessToken": token,
+            "expiresAt": int(time.time() * 1000) + 3_600_000,
+        }
+    }))
+
+
+class FakeClock:
+    """A controllable monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseCredentials:
+    """Tests for parse_credentials()."""
+
+    def test_parses_text(self):
+        creds = parse_credentials('{"claudeAiOauth": {"accessToken": "tok"}}')
+        assert creds.access_token == "tok"
+
+    def test_rejects_non_object(self):
+        with pytest.raises(CredentialError, match="claudeAiOauth"):
+            parse_credentials("[]")
+
+
+class TestCredentialCache:
+    """Tests for CredentialCache."""
+
+    def test_parses_once_while_file_is_unchanged(self, tmp_path):
+        cred_file = tmp_path / ".credentials.json"
+        _write_credentials(cred_file)
+        cache = CredentialCache(cred_file)
+
+        for _ in range(5):
+            assert cache.get().access_token == "sk-ant-oat01-test"
+
+        assert cache.parse_count == 1
+        assert cache.stat_count == 5
+
+    def test_reparses_when_file_changes(self, tmp_path):
+        cred_file = tmp_path / ".credentials.json"
+        _write_credentials(cred_file, "first")
+        cache = CredentialCache(cred_file)
+        cache.get()
+
+        _write_credentials(cred_file, "second-token")
+
+        assert cache.get().access_token == "second-token"
+        assert cache.parse_count == 2
+
+    def test_watched_cache_skips_stat_until_invalidated(self, tmp_path):
+        cred_file = tmp_path / ".credentials.json"
+        _write_credentials(cred_file)
+        cache = CredentialCache(cred_file)
+        cache.watched = True
+        cache.get()
+
+        for _ in range(5):
+            cache.get()
+        assert cache.stat_count == 1
+
+        cache.invalidate()
+        cache.get()
+        assert cache.stat_count == 2
+        assert cache.parse_count == 1
+
+    def test_watched_cache_reverifies_periodically(self, tmp_path):
+        cred_file = tmp_path / ".credentials.json"
+        _write_credentials(cred_file)
+        clock = FakeClock()
+        cache = CredentialCache(cred_file, verify_interval=300, clock=clock)
+        cache.watched = True
+        cache.get()
+
+        clock.now = 299
+        assert cache.peek() is not None
+        clock.now = 300
+        assert cache.peek() is None
+
+    def test_unwatched_cache_never_peeks(self, tmp_path):
+        cred_file = tmp_path / ".credentials.json"
+        _write_credentials(cred_file)
+        cache = CredentialCache(cred_file)
+        cache.get()
+
+        assert cache.peek() is None
+
+    def test_missing_file(self, tmp_path):
+        cache = CredentialCache(tmp_path / "missing.json")
+
+        with pytest.raises(CredentialError, match="not found"):
+            cache.get()
+
+    def test_parse_error_is_not_cached_as_success(self, tmp_path):
+        cred_file = tmp_path / ".credentials.json"
+        _write_credentials(cred_file)
+        cache = CredentialCache(cred_file)
+        cache.get()
+
+        cred_file.write_text("{broken")
+        with pytest.raises(CredentialError, match="parse"):
+            cache.get()
+        with pytest.raises(CredentialError, match="parse"):
+            cache.get()
+        assert cache.parse_count == 3
+
+    def test_lookup_and_store(self):
+        cache = CredentialCache()
+        signature = stat_signature(1_700_000_000_123_456_789, 42, 100)
+
+        assert cache.lookup(signature) is None
+        cache.store('{"claudeAiOauth": {"accessToken": "tok"}}', signature)
+
+        assert cache.lookup(signature).access_token == "tok"
+        assert cache.lookup(stat_signature(1_700_000_001_000_000_000, 42, 100)) is None
+
+
+class TestStatSignature:
+    """Tests for stat_signature()."""
+
+    def test_truncates_to_microseconds(self):
+        assert stat_signature(1_000_123_456_789, 7, 10) == (1_000_123_456, 7, 10)
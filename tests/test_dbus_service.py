@@ -0,0 +1,180 @@
+"""Tests for dbus_service module, run against a private session bus."""
+
+from datetime import datetime, timezone
+import math
+
+import pytest
+
+gi = pytest.importorskip("gi")
+
+from gi.repository import Gio, GLib, GObject  # noqa: E402
+
+from app.dbus_service import (  # noqa: E402
+    INTERFACE_NAME,
+    OBJECT_PATH,
+    LeewayUsageService,
+    usage_properties,
+)
+from app.usage_model import UsageBucket, UsageData  # noqa: E402
+
+RESETS_AT = datetime(2026, 2, 20, 20, 0, 0, tzinfo=timezone.utc)
+
+
+class FakeMonitor(GObject.Object):
+    """Stands in for LeewayUsageMonitor; requests complete when told to."""
+
+    __gsignals__ = {
+        'updated': (GObject.SignalFlags.RUN_FIRST, None, (object, bool)),
+        'failed': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.data = None
+        self.error = None
+        self.updated_at = None
+        self.in_flight = False
+        self.requests_started = 0
+        self._waiters = []
+
+    def refresh(self, callback=None, *, force=False):
+        if callback is not None:
+            self._waiters.append(callback)
+        if self.in_flight:
+            return
+        self.in_flight = True
+        self.requests_started += 1
+
+    def complete(self, data):
+        self.in_flight = False
+        self.data = data
+        self.updated_at = datetime.now(timezone.utc)
+        self.emit('updated', data, False)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            waiter(data, None)
+
+
+def _run_until(condition, timeout_ms=2000):
+    context = GLib.MainContext.default()
+    deadline = GLib.get_monotonic_time() + timeout_ms * 1000
+    while not condition():
+        if GLib.get_monotonic_time() > deadline:
+            raise AssertionError("timed out waiting for D-Bus")
+        context.iteration(False)
+
+
+@pytest.fixture
+def bus_address():
+    test_bus = Gio.TestDBus.new(Gio.TestDBusFlags.NONE)
+    test_bus.up()
+    yield test_bus.get_bus_address()
+    test_bus.down()
+
+
+def _connect(address) -> Gio.DBusConnection:
+    return Gio.DBusConnection.new_for_address_sync(
+        address,
+        Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+        | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+        None,
+        None,
+    )
+
+
+@pytest.fixture
+def service(bus_address):
+    server = _connect(bus_address)
+    client = _connect(bus_address)
+    monitor = FakeMonitor()
+    used = []
+    service = LeewayUsageService(monitor, on_used=lambda: used.append(True))
+    service.register(server)
+    yield monitor, server, client, used
+    service.unregister()
+    client.close_sync(None)
+    server.close_sync(None)
+
+
+def _call(client, server, method, params=None, interface=INTERFACE_NAME):
+    results = []
+    client.call(
+        server.get_unique_name(), OBJECT_PATH, interface, method, params,
+        None, Gio.DBusCallFlags.NONE, -1, None,
+        lambda conn, res: results.append(conn.call_finish(res)),
+    )
+    return results
+
+
+class TestUsageProperties:
+    """Tests for usage_properties()."""
+
+    def test_unknown_values_are_nan_and_zero(self):
+        props = usage_properties(None, None, None)
+
+        assert math.isnan(props['SessionPercent'].unpack())
+        assert props['SessionResetsAt'].unpack() == 0
+        assert props['LastError'].unpack() == ''
+
+    def test_converts_usage_data(self):
+        data = UsageData(session_pct=42.5, session_resets_at=RESETS_AT)
+
+        props = usage_properties(data, RESETS_AT, "boom")
+
+        assert props['SessionPercent'].unpack() == 42.5
+        assert props['SessionResetsAt'].unpack() == int(RESETS_AT.timestamp())
+        assert props['LastError'].unpack() == "boom"
+
+    def test_lists_every_bucket(self):
+        data = UsageData([UsageBucket("five_hour", 42.5), UsageBucket("seven_day_sonnet", 3.0)])
+
+        props = usage_properties(data, None, None)
+
+        assert props['Buckets'].unpack() == [("five_hour", 42.5, 0), ("seven_day_sonnet", 3.0, 0)]
+
+
+class TestLeewayUsageService:
+    """Tests for LeewayUsageService over a private bus."""
+
+    def test_reads_properties(self, service):
+        monitor, server, client, used = service
+        monitor.data = UsageData(session_pct=42.5, weekly_pct=10.0)
+
+        results = _call(
+            client, server, 'Get',
+            GLib.Variant('(ss)', (INTERFACE_NAME, 'SessionPercent')),
+            interface='org.freedesktop.DBus.Properties',
+        )
+        _run_until(lambda: results)
+
+        assert results[0].unpack() == (42.5,)
+        assert used
+
+    def test_refresh_calls_join_one_request(self, service):
+        monitor, server, client, _used = service
+
+        first = _call(client, server, 'Refresh')
+        second = _call(client, server, 'Refresh')
+        _run_until(lambda: len(monitor._waiters) == 2)
+        monitor.complete(UsageData(session_pct=1.0))
+        _run_until(lambda: first and second)
+
+        assert monitor.requests_started == 1
+
+    def test_emits_changed_signal(self, service):
+        monitor, server, client, _used = service
+        received = []
+
+        def on_signal(_conn, _sender, _path, _interface, _signal, params, *_user_data):
+            received.append(params)
+
+        client.signal_subscribe(
+            None, INTERFACE_NAME, 'Changed', OBJECT_PATH, None,
+            Gio.DBusSignalFlags.NONE, on_signal,
+        )
+
+        monitor.complete(UsageData(session_pct=77.0))
+        _run_until(lambda: received)
+
+        (properties,) = received[0].unpack()
+        assert properties['SessionPercent'] == 77.0
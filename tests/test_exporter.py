@@ -0,0 +1,136 @@
+"""Tests for exporter and cli modules."""
+
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import cli, exporter
+from app.exporter import ExportCancelled, export, iter_samples, parse_time
+from app.history_store import HistoryStore
+from app.usage_model import UsageData
+
+START = datetime(2026, 2, 20, 0, 0, 0, tzinfo=timezone.utc)
+T0 = int(START.timestamp())
+RESETS = START + timedelta(hours=5)
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    store = HistoryStore(path, clock=lambda: T0)
+    for minute in range(3):
+        store.append(
+            UsageData(session_pct=10.0 + minute, session_resets_at=RESETS, weekly_pct=None),
+            START + timedelta(minutes=minute),
+        )
+    store.close()
+    return path
+
+
+class TestIterSamples:
+    """Tests for iter_samples()."""
+
+    def test_rows_in_time_order(self, db):
+        rows = list(iter_samples(db))
+        assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+        assert len(rows) == 3
+
+    def test_filters_by_range_and_bucket(self, db):
+        rows = list(iter_samples(
+            db, start=START + timedelta(minutes=1), end=START + timedelta(minutes=2),
+            buckets=["five_hour"],
+        ))
+        assert rows == [(T0 + 60, "five_hour", 11.0, int(RESETS.timestamp()))]
+        assert list(iter_samples(db, buckets=["seven_day"])) == []
+
+    def test_is_lazy(self, db, monkeypatch):
+        monkeypatch.setattr(exporter, "BATCH_SIZE", 1)
+        rows = iter_samples(db)
+        assert next(rows)[0] == T0
+        rows.close()
+
+    def test_missing_database_raises(self, tmp_path):
+        with pytest.raises(sqlite3.Error):
+            list(iter_samples(tmp_path / "missing.sqlite3"))
+
+
+class TestExport:
+    """Tests for export()."""
+
+    def test_csv(self, db):
+        output = io.StringIO()
+        assert export(output, "csv", path=db) == 3
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert rows[0] == ["timestamp", "bucket", "utilization_pct", "resets_at"]
+        assert rows[1] == ["2026-02-20T00:00:00+00:00", "five_hour", "10.0", "2026-02-20T05:00:00+00:00"]
+        assert len(rows) == 4
+
+    def test_jsonl(self, db):
+        output = io.StringIO()
+        export(output, "jsonl", path=db)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert records[-1] == {
+            "timestamp": "2026-02-20T00:02:00+00:00",
+            "bucket": "five_hour",
+            "utilization_pct": 12.0,
+            "resets_at": "2026-02-20T05:00:00+00:00",
+        }
+
+    def test_cancel(self, db, monkeypatch):
+        monkeypatch.setattr(exporter, "BATCH_SIZE", 1)
+        with pytest.raises(ExportCancelled):
+            export(io.StringIO(), "csv", path=db, cancelled=lambda: True)
+
+    def test_unknown_format(self, db):
+        with pytest.raises(ValueError):
+            export(io.StringIO(), "xml", path=db)
+
+
+class TestParseTime:
+    """Tests for parse_time()."""
+
+    def test_relative(self):
+        assert parse_time("7d", now=START) == START - timedelta(days=7)
+        assert parse_time("90m", now=START) == START - timedelta(minutes=90)
+
+    def test_iso(self):
+        assert parse_time("2026-02-20T00:00:00Z") == START
+
+    def test_naive_is_local(self):
+        assert parse_time("2026-02-20").tzinfo is not None
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_time("last week")
+
+
+class TestCli:
+    """Tests for the export command."""
+
+    def test_exports_to_file(self, db, tmp_path):
+        out = tmp_path / "out.jsonl"
+        assert cli.main(["export", "--database", str(db), "--format", "jsonl", "-o", str(out)]) == 0
+        assert len(out.read_text().splitlines()) == 3
+
+    def test_writes_stdout(self, db, capsys):
+        assert cli.main(["export", "--database", str(db), "--bucket", "seven_day"]) == 0
+        assert capsys.readouterr().out == "timestamp,bucket,utilization_pct,resets_at\n"
+
+    def test_unwritable_output(self, db, tmp_path, capsys):
+        out = tmp_path / "missing" / "out.csv"
+        assert cli.main(["export", "--database", str(db), "-o", str(out)]) == 1
+        assert f"cannot write {out}" in capsys.readouterr().err
+
+    def test_missing_history(self, tmp_path, capsys):
+        assert cli.main(["export", "--database", str(tmp_path / "none.sqlite3")]) == 1
+        assert "cannot read usage history" in capsys.readouterr().err
+
+    def test_rejects_bad_time(self, capsys):
+        with pytest.raises(SystemExit):
+            cli.main(["export", "--since", "yesterday"])
@@ -2,7 +2,15 @@
 
 from datetime import datetime, timedelta, timezone
 
-from app.formatting import format_reset_time, truncate_error
+from app.formatting import (
+    format_age,
+    format_duration,
+    format_forecast,
+    format_latency,
+    format_reset_time,
+    next_countdown_change,
+    truncate_error,
+)
 
 # Fixed reference point for deterministic tests.
 NOW = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
@@ -58,6 +66,90 @@ class TestFormatResetTime:
         assert "h" in result or "m" in result
 
 
+class TestFormatDuration:
+    """Tests for format_duration()."""
+
+    def test_zero_returns_now(self):
+        assert format_duration(0) == "now"
+
+    def test_under_a_minute(self):
+        assert format_duration(59.9) == "< 1m"
+
+    def test_minutes(self):
+        assert format_duration(120) == "2m"
+
+    def test_hours_and_minutes(self):
+        assert format_duration(3 * 3600 + 60) == "3h 1m"
+
+
+class TestFormatAge:
+    """Tests for format_age()."""
+
+    def test_under_a_minute_is_just_now(self):
+        assert format_age(NOW - timedelta(seconds=30), now=NOW) == "just now"
+
+    def test_minutes_ago(self):
+        assert format_age(NOW - timedelta(minutes=3), now=NOW) == "3m ago"
+
+    def test_hours_ago(self):
+        assert format_age(NOW - timedelta(hours=2, minutes=5), now=NOW) == "2h 5m ago"
+
+
+class TestNextCountdownChange:
+    """Tests for next_countdown_change()."""
+
+    def test_wakes_at_next_minute_boundary(self):
+        assert next_countdown_change(NOW + timedelta(seconds=125.5), now=NOW) == 5.5
+
+    def test_label_changes_just_after_the_delay(self):
+        for seconds in (3 * 3600 + 17.25, 125.5, 120, 61, 59.5, 1.5):
+            reset = NOW + timedelta(seconds=seconds)
+            delay = next_countdown_change(reset, now=NOW)
+            before = NOW + timedelta(seconds=delay - 0.01)
+            after = NOW + timedelta(seconds=delay + 0.01)
+            if delay >= 0.01:
+                assert format_reset_time(reset, now=before) == format_reset_time(reset, now=NOW)
+            assert format_reset_time(reset, now=after) != format_reset_time(reset, now=NOW)
+
+    def test_final_minute_wakes_once_for_now(self):
+        assert next_countdown_change(_future(30), now=NOW) == 29
+        assert format_reset_time(_future(30), now=NOW + timedelta(seconds=29.01)) == "now"
+
+    def test_none_once_reset(self):
+        assert next_countdown_change(NOW - timedelta(seconds=5), now=NOW) is None
+        assert next_countdown_change(None, now=NOW) is None
+
+
+class TestFormatLatency:
+    """Tests for format_latency()."""
+
+    def test_sub_millisecond(self):
+        assert format_latency(0.00042) == "0.42 ms"
+
+    def test_milliseconds(self):
+        assert format_latency(0.0374) == "37 ms"
+
+    def test_seconds(self):
+        assert format_latency(1.25) == "1.2 s"
+
+
+class TestFormatForecast:
+    """Tests for format_forecast()."""
+
+    def test_before_reset(self):
+        assert format_forecast(_future(47 * 60), True, now=NOW) == (
+            "At this rate: limit in 47m (before reset)"
+        )
+
+    def test_after_reset(self):
+        assert format_forecast(_future(3 * 3600), False, now=NOW) == (
+            "At this rate: limit in 3h 0m (after reset)"
+        )
+
+    def test_imminent(self):
+        assert format_forecast(NOW, True, now=NOW) == "At this rate: limit imminent"
+
+
 class TestTruncateError:
     """Tests for truncate_error()."""
 
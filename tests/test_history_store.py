@@ -0,0 +1,186 @@
+"""Tests for history_store module."""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.history_store import (
+    DAY,
+    HOUR,
+    HistoryStore,
+    connect_readonly,
+    default_history_path,
+)
+from app.usage_model import UsageBucket, UsageData
+
+START = datetime(2026, 2, 20, 0, 0, 0, tzinfo=timezone.utc)
+T0 = int(START.timestamp())
+
+
+def _data(session: float | None, weekly: float | None = 10.0) -> UsageData:
+    return UsageData(session_pct=session, weekly_pct=weekly)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3", clock=lambda: T0)
+    yield store
+    store.close()
+
+
+class TestHistoryStore:
+    """Tests for HistoryStore."""
+
+    def test_records_samples(self, store):
+        store.append(_data(10.0), START)
+        store.append(_data(12.5), START + timedelta(seconds=15))
+        store.flush()
+
+        assert store.samples("five_hour", T0, T0 + 60) == [(T0, 10.0), (T0 + 15, 12.5)]
+        assert store.samples("seven_day", T0, T0 + 60) == [(T0, 10.0), (T0 + 15, 10.0)]
+
+    def test_query_gives_up_on_a_stuck_writer(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.history_store.READY_TIMEOUT_SECONDS", 0.05)
+        release = threading.Event()
+        store = HistoryStore(tmp_path / "history.sqlite3")
+        opened = store._open
+        monkeypatch.setattr(store, "_open", lambda: release.wait() and opened())
+
+        with pytest.raises(sqlite3.OperationalError, match="not ready"):
+            store.samples("five_hour", T0, T0 + 60)
+        release.set()
+        store.close()
+
+    def test_starts_one_writer_from_racing_threads(self, store, monkeypatch):
+        started = []
+
+        class SlowThread(threading.Thread):
+            def __init__(self, *args, **kwargs):
+                time.sleep(0.01)  # widen the gap between the check and the start
+                super().__init__(*args, **kwargs)
+                started.append(self)
+
+        callers = [
+            threading.Thread(target=store.append, args=(_data(1.0), START)),
+            threading.Thread(target=store.samples, args=("five_hour", T0, T0 + 60)),
+        ]
+        monkeypatch.setattr(threading, "Thread", SlowThread)
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+
+        assert [thread.name for thread in started] == ["leeway-history"]
+
+    def test_range_is_half_open(self, store):
+        store.append(_data(1.0), START)
+        store.append(_data(2.0), START + timedelta(seconds=60))
+        store.flush()
+
+        assert store.samples("five_hour", T0, T0 + 60) == [(T0, 1.0)]
+
+    def test_maintains_hourly_and_daily_rollups(self, store):
+        for minute, pct in ((0, 10.0), (30, 30.0), (59, 20.0), (60, 50.0)):
+            store.append(_data(pct), START + timedelta(minutes=minute))
+        store.flush()
+
+        hourly = store.rollups("five_hour", T0, T0 + DAY, HOUR)
+        daily = store.rollups("five_hour", T0, T0 + DAY, DAY)
+
+        assert [(r.start, r.count, r.pct_min, r.pct_max, r.pct_last) for r in hourly] == [
+            (T0, 3, 10.0, 30.0, 20.0),
+            (T0 + HOUR, 1, 50.0, 50.0, 50.0),
+        ]
+        assert hourly[0].pct_mean == pytest.approx(20.0)
+        assert len(daily) == 1
+        assert daily[0].count == 4
+        assert daily[0].pct_max == 50.0
+
+    def test_duplicates_are_ignored(self, store):
+        store.append(_data(10.0), START)
+        store.append(_data(99.0), START)
+        store.flush()
+
+        assert store.samples("five_hour", T0, T0 + 1) == [(T0, 10.0)]
+        assert store.rollups("five_hour", T0, T0 + HOUR)[0].count == 1
+
+    def test_unknown_pct_is_stored_but_not_rolled_up(self, store):
+        store.append(UsageData([UsageBucket("five_hour")]), START)
+        store.flush()
+
+        assert store.samples("five_hour", T0, T0 + 1) == [(T0, None)]
+        assert store.rollups("five_hour", T0, T0 + HOUR) == []
+
+    def test_keeps_any_bucket(self, store):
+        store.append(UsageData([UsageBucket("seven_day_sonnet", 4.0)]), START)
+        store.flush()
+
+        assert store.buckets() == ["seven_day_sonnet"]
+
+    def test_batches_queued_snapshots(self, store):
+        # Snapshots queued while the writer opens the database share a commit.
+        for i in range(50):
+            store.append(_data(float(i)), START + timedelta(seconds=15 * i))
+        store.flush()
+
+        assert store.samples_written == 100
+        assert store.batches_written < 50
+
+    def test_prunes_old_samples_but_keeps_rollups(self, tmp_path):
+        now = T0 + 40 * DAY
+        store = HistoryStore(tmp_path / "history.sqlite3", retention_days=30, clock=lambda: now)
+        store.append(_data(5.0), START)
+        store.append(_data(6.0), START + timedelta(days=39))
+        store.flush()
+        store.close()
+
+        store = HistoryStore(tmp_path / "history.sqlite3")
+        try:
+            assert [ts for ts, _ in store.samples("five_hour", 0, now)] == [T0 + 39 * DAY]
+            assert len(store.rollups("five_hour", 0, now, DAY)) == 2
+        finally:
+            store.close()
+
+    def test_rejects_unknown_rollup_period(self, store):
+        with pytest.raises(ValueError):
+            store.rollups("five_hour", T0, T0 + DAY, 60)
+
+    def test_readable_by_another_connection_while_open(self, store):
+        store.append(_data(10.0), START)
+        store.flush()
+
+        with connect_readonly(store.path) as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            count = conn.execute("SELECT count(*) FROM samples").fetchone()[0]
+
+        assert mode == "wal"
+        assert count == 2
+
+    def test_readonly_connection_cannot_write(self, store):
+        store.append(_data(10.0), START)
+        store.flush()
+
+        conn = connect_readonly(store.path)
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM samples")
+        finally:
+            conn.close()
+
+    def test_default_path_honours_xdg_data_home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+
+        assert default_history_path() == tmp_path / "leeway" / "history.sqlite3"
+
+    def test_does_not_import_gi(self):
+        src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+        code = "import sys, app.history_store; sys.exit('gi' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=src)
+
+        assert result.returncode == 0
@@ -0,0 +1,170 @@
+"""Tests for live_snapshot module."""
+
+import os
+import struct
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from app.live_snapshot import (
+    CAPACITY,
+    SIZE,
+    LiveSnapshotReader,
+    LiveSnapshotWriter,
+    default_live_snapshot_path,
+    read_live_snapshot,
+)
+from app.usage_model import UsageBucket, UsageData
+
+RESETS = datetime(2026, 2, 20, 17, 0, 0, tzinfo=timezone.utc)
+DATA = UsageData([
+    UsageBucket("five_hour", 44.2, RESETS),
+    UsageBucket("seven_day", None, None),
+    UsageBucket("seven_day_sonnet", 9.0, RESETS),
+])
+SRC = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+STRESS_SECONDS = 1.5
+
+# Publishes updates whose every field encodes the update number, with a
+# varying bucket count, so any mix of two updates is detectable.
+STRESS_WRITER = """
+import sys, time
+from datetime import datetime, timezone
+from app.live_snapshot import LiveSnapshotWriter
+from app.usage_model import UsageBucket, UsageData
+
+writer = LiveSnapshotWriter(sys.argv[1])
+deadline = time.monotonic() + float(sys.argv[2])
+n = 0
+while time.monotonic() < deadline:
+    n += 1
+    at = datetime.fromtimestamp(n, timezone.utc)
+    writer.publish(UsageData([UsageBucket(f"b{i}", float(n), at) for i in range(1 + n % 5)]), float(n))
+print(n)
+"""
+
+
+class TestLiveSnapshot:
+    """Tests for LiveSnapshotWriter / LiveSnapshotReader."""
+
+    def test_round_trips(self, tmp_path):
+        path = tmp_path / "usage.bin"
+        writer = LiveSnapshotWriter(path)
+        writer.publish(DATA, 1771588800.5)
+
+        updated_at, buckets = read_live_snapshot(path)
+
+        assert updated_at == 1771588800.5
+        assert buckets == {
+            "five_hour": (44.2, int(RESETS.timestamp())),
+            "seven_day": (None, None),
+            "seven_day_sonnet": (9.0, int(RESETS.timestamp())),
+        }
+        writer.close()
+
+    def test_file_is_fixed_size_and_private(self, tmp_path):
+        path = tmp_path / "runtime" / "usage.bin"
+        LiveSnapshotWriter(path).publish(DATA, 0.0)
+
+        assert path.stat().st_size == SIZE
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_reader_sees_later_updates(self, tmp_path):
+        path = tmp_path / "usage.bin"
+        writer = LiveSnapshotWriter(path)
+        writer.publish(DATA, 1.0)
+
+        with LiveSnapshotReader(path) as reader:
+            writer.publish(UsageData([UsageBucket("five_hour", 50.0)]), 2.0)
+            assert reader.read() == (2.0, {"five_hour": (50.0, None)})
+
+    def test_drops_buckets_beyond_capacity_and_long_keys(self, tmp_path):
+        path = tmp_path / "usage.bin"
+        buckets = [UsageBucket("k" * 40, 1.0)] + [UsageBucket(f"b{i}", 1.0) for i in range(CAPACITY + 4)]
+        LiveSnapshotWriter(path).publish(UsageData(buckets), 0.0)
+
+        _updated_at, read = read_live_snapshot(path)
+
+        assert list(read) == [f"b{i}" for i in range(CAPACITY)]
+
+    def test_new_writer_continues_sequence(self, tmp_path):
+        path = tmp_path / "usage.bin"
+        LiveSnapshotWriter(path).publish(DATA, 1.0)
+
+        writer = LiveSnapshotWriter(path)
+        assert read_live_snapshot(path)[0] == 1.0
+        writer.publish(DATA, 2.0)
+        assert read_live_snapshot(path)[0] == 2.0
+
+    def test_interrupted_write_is_not_returned(self, tmp_path):
+        path = tmp_path / "usage.bin"
+        writer = LiveSnapshotWriter(path)
+        writer.publish(DATA, 1.0)
+        with open(path, "r+b") as handle:
+            handle.seek(8)
+            handle.write((3).to_bytes(8, "little"))  # odd: mid-update
+
+        assert read_live_snapshot(path) is None
+        LiveSnapshotWriter(path).publish(DATA, 2.0)
+        assert read_live_snapshot(path)[0] == 2.0
+
+    def test_mixed_copy_is_not_returned(self, tmp_path):
+        # A copy whose stores arrived out of order looks like this: an
+        # even, unchanged sequence around bytes from two updates.
+        path = tmp_path / "usage.bin"
+        LiveSnapshotWriter(path).publish(DATA, 1.0)
+        with open(path, "r+b") as handle:
+            handle.seek(32 + 32)  # first bucket's percent
+            handle.write(struct.pack("<d", 50.0))
+
+        assert read_live_snapshot(path) is None
+        LiveSnapshotWriter(path).publish(DATA, 2.0)
+        assert read_live_snapshot(path)[0] == 2.0
+
+    def test_missing_empty_or_foreign_file(self, tmp_path):
+        assert read_live_snapshot(tmp_path / "missing.bin") is None
+        (tmp_path / "empty.bin").touch()
+        assert read_live_snapshot(tmp_path / "empty.bin") is None
+        (tmp_path / "foreign.bin").write_bytes(b"x" * SIZE)
+        assert read_live_snapshot(tmp_path / "foreign.bin") is None
+
+    def test_default_path(self, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert default_live_snapshot_path() == "/run/user/1000/app/me.stephenlewis.Leeway/usage.bin"
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        assert default_live_snapshot_path() is None
+        assert read_live_snapshot() is None
+
+
+class TestLiveSnapshotStress:
+    """A reader never sees a torn update while another process writes."""
+
+    def test_concurrent_writer(self, tmp_path):
+        path = tmp_path / "usage.bin"
+        LiveSnapshotWriter(path).publish(UsageData(), 0.0)
+        writer = subprocess.Popen(
+            [sys.executable, "-c", STRESS_WRITER, str(path), str(STRESS_SECONDS)],
+            env={**os.environ, "PYTHONPATH": SRC}, stdout=subprocess.PIPE, text=True,
+        )
+
+        reads = missed = 0
+        last = 0.0
+        with LiveSnapshotReader(path) as reader:
+            while writer.poll() is None:
+                result = reader.read()
+                if result is None:
+                    missed += 1
+                    continue
+                updated_at, buckets = result
+                reads += 1
+                assert updated_at >= last
+                last = updated_at
+                if updated_at:
+                    n = int(updated_at)
+                    assert buckets == {f"b{i}": (float(n), n) for i in range(1 + n % 5)}
+        published = int(writer.communicate()[0])
+
+        assert writer.returncode == 0
+        assert reads > 1000
+        assert 0 < last <= published
+        assert missed < reads
@@ -0,0 +1,59 @@
+"""Tests for lttb module."""
+
+import math
+
+from app.lttb import lttb
+
+
+def _series(n: int) -> list[tuple[float, float]]:
+    return [(float(i), math.sin(i / 50) * 40 + 50) for i in range(n)]
+
+
+class TestLttb:
+    """Tests for lttb()."""
+
+    def test_short_series_is_returned_whole(self):
+        points = _series(10)
+
+        assert lttb(points, 20) == points
+        assert lttb(points, 10) == points
+
+    def test_tiny_threshold_returns_everything(self):
+        points = _series(10)
+
+        assert lttb(points, 2) == points
+
+    def test_reduces_to_threshold(self):
+        assert len(lttb(_series(10_000), 300)) == 300
+
+    def test_keeps_endpoints(self):
+        points = _series(1000)
+
+        sampled = lttb(points, 50)
+
+        assert sampled[0] == points[0]
+        assert sampled[-1] == points[-1]
+
+    def test_output_is_ordered_subset(self):
+        points = _series(5000)
+
+        sampled = lttb(points, 100)
+
+        assert all(p in points for p in sampled)
+        assert [x for x, _ in sampled] == sorted(x for x, _ in sampled)
+
+    def test_keeps_spikes(self):
+        points = [(float(i), 10.0) for i in range(1000)]
+        points[500] = (500.0, 95.0)
+
+        sampled = lttb(points, 20)
+
+        assert (500.0, 95.0) in sampled
+
+    def test_handles_irregular_x(self):
+        points = [(float(i * i), float(i % 7)) for i in range(500)]
+
+        sampled = lttb(points, 40)
+
+        assert len(sampled) == 40
+        assert sampled[-1] == points[-1]
@@ -0,0 +1,63 @@
+"""Tests for the application's --background start, run against a private session bus."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+gi = pytest.importorskip("gi")
+
+try:
+    gi.require_version("Adw", "1")
+    gi.require_version("Gtk", "4.0")
+except ValueError:
+    pytest.skip("libadwaita is not available", allow_module_level=True)
+
+if not (os.environ.get("WAYLAND_DISPLAY") or os.environ.get("DISPLAY")):
+    pytest.skip("needs a display to start GTK", allow_module_level=True)
+
+from gi.repository import Gio, GLib  # noqa: E402
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """Compiled settings schema, throwaway settings and a private session bus."""
+    compiler = shutil.which("glib-compile-schemas")
+    if compiler is None:
+        pytest.skip("glib-compile-schemas is not available")
+    subprocess.run([compiler, "--targetdir", str(tmp_path), SCHEMA_DIR], check=True)
+    monkeypatch.setenv("GSETTINGS_SCHEMA_DIR", str(tmp_path))
+    monkeypatch.setenv("GSETTINGS_BACKEND", "memory")
+    for name in ("XDG_CACHE_HOME", "XDG_DATA_HOME", "XDG_STATE_HOME", "XDG_RUNTIME_DIR"):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+
+    test_bus = Gio.TestDBus.new(Gio.TestDBusFlags.NONE)
+    test_bus.up()
+    yield
+    test_bus.down()
+
+
+def test_background_option_keeps_running_hidden(session):
+    from app.main import LeewayApplication
+
+    app = LeewayApplication()
+    # Keep the monitor off the network; only the hold is under test.
+    app.monitor.start = lambda: None
+    app.monitor.stop = lambda: None
+    seen = {}
+
+    def check():
+        seen["held"] = app._background_held
+        seen["visible"] = app.monitor.policy.conditions.visible
+        seen["windows"] = len(app.get_windows())
+        app.quit()
+        return GLib.SOURCE_REMOVE
+
+    GLib.timeout_add(100, check)
+    app.run(["leeway", "--background"])
+
+    # Without the hold, run() returns before the check ever fires.
+    assert seen == {"held": True, "visible": False, "windows": 0}
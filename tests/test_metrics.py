@@ -0,0 +1,114 @@
+"""Tests for metrics module."""
+
+import json
+
+import pytest
+
+from app.api_client import parse_response_body
+from app.metrics import (
+    BUCKET_COUNT,
+    FETCH_BODY,
+    FETCH_CONNECT,
+    FETCH_DNS,
+    FETCH_TLS,
+    FETCH_TTFB,
+    PARSE,
+    Histogram,
+    Metrics,
+    describe,
+    get_metrics,
+    request_phases,
+)
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_summary_statistics(self):
+        histogram = Histogram()
+        for seconds in (0.001, 0.002, 0.003, 0.010):
+            histogram.record(seconds)
+        assert histogram.count == 4
+        assert histogram.mean == pytest.approx(0.004)
+        assert histogram.max == 0.010
+
+    def test_percentiles_within_a_factor_of_two(self):
+        histogram = Histogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+        assert 0.050 <= histogram.percentile(0.5) <= 0.100
+        assert 0.095 <= histogram.percentile(0.95) <= 0.100
+        assert histogram.percentile(1.0) == 0.100
+
+    def test_fixed_size(self):
+        histogram = Histogram()
+        for seconds in (0, -1, 1e-9, 10_000, 1e12):
+            histogram.record(seconds)
+        assert len(histogram.counts) == BUCKET_COUNT
+        assert sum(histogram.counts) == 5
+
+    def test_empty(self):
+        assert Histogram().percentile(0.5) == 0.0
+        assert Histogram().mean == 0.0
+        assert describe(Histogram()) == "No samples yet"
+
+    def test_describe(self):
+        histogram = Histogram()
+        histogram.record(0.012)
+        assert describe(histogram) == "p50 12 ms · p95 12 ms · max 12 ms · 1 sample"
+
+
+class TestMetrics:
+    """Tests for Metrics."""
+
+    def test_records_and_counts(self):
+        metrics = Metrics()
+        metrics.record("fetch", 0.2)
+        metrics.record("fetch", 0.4)
+        metrics.count("refresh.failed")
+        metrics.count("refresh.failed", 2)
+        assert metrics.histograms["fetch"].count == 2
+        assert metrics.counters == {"refresh.failed": 3}
+
+        metrics.reset()
+        assert metrics.histograms == {}
+        assert metrics.counters == {}
+
+    def test_parse_is_timed(self):
+        before = get_metrics().histograms.get(PARSE)
+        count = before.count if before is not None else 0
+        parse_response_body(json.dumps({"five_hour": {"utilization": 1.0}}))
+        assert get_metrics().histograms[PARSE].count == count + 1
+
+
+class TestRequestPhases:
+    """Tests for request_phases()."""
+
+    def test_new_tls_connection(self):
+        phases = request_phases(
+            dns_start=1_000, dns_end=3_000,
+            connect_start=3_000, tls_start=8_000, connect_end=20_000,
+            request_start=20_000, response_start=70_000, response_end=71_000,
+        )
+        assert phases == {
+            FETCH_DNS: 0.002,
+            FETCH_CONNECT: 0.005,
+            FETCH_TLS: 0.012,
+            FETCH_TTFB: 0.050,
+            FETCH_BODY: 0.001,
+        }
+
+    def test_reused_connection_has_no_connect_stages(self):
+        phases = request_phases(
+            dns_start=0, dns_end=0, connect_start=0, tls_start=0, connect_end=0,
+            request_start=1_000, response_start=41_000, response_end=42_000,
+        )
+        assert set(phases) == {FETCH_TTFB, FETCH_BODY}
+
+    def test_plain_http_connection(self):
+        phases = request_phases(
+            dns_start=0, dns_end=0, connect_start=1_000, tls_start=0, connect_end=2_000,
+            request_start=2_000, response_start=3_000, response_end=3_000,
+        )
+        assert phases[FETCH_CONNECT] == 0.001
+        assert FETCH_TLS not in phases
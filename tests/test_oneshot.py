@@ -0,0 +1,298 @@
+"""Tests for the oneshot module and `leeway --once`."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import cli
+from app.api_client import ApiError
+from app.credential_reader import CredentialError
+from app.oneshot import fetch, format_json, format_line, query
+from app.snapshot_cache import Snapshot, default_snapshot_path, load_snapshot, save_snapshot
+from app.usage_model import UsageBucket, UsageData
+
+NOW = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+RESPONSE = {
+    "five_hour": {"utilization": 44.2, "resets_at": "2026-02-20T17:00:00+00:00"},
+    "seven_day": {"utilization": 15.4, "resets_at": "2026-02-25T23:00:00+00:00"},
+    "seven_day_opus": None,
+}
+SRC = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+
+
+class UsageServer:
+    """A local usage endpoint answering every GET with the configured status, headers and body."""
+
+    def __init__(self):
+        self.status = 200
+        self.body = json.dumps(RESPONSE).encode()
+        self.headers = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.headers)
+                self.send_response(server.status)
+                for name, value in server.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/api/oauth/usage"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = UsageServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def credentials(tmp_path):
+    path = tmp_path / ".credentials.json"
+    path.write_text(json.dumps({
+        "claudeAiOauth": {
+            "accessToken": "sk-ant-oat01-test-token",
+            "refreshToken": "sk-ant-ort01-test-refresh",
+            "expiresAt": int(time.time() * 1000) + 3_600_000,
+            "subscriptionType": "max",
+        }
+    }))
+    return path
+
+
+class TestFetch:
+    """Tests for fetch()."""
+
+    def test_parses_response(self, server):
+        data = fetch("token", url=server.url)
+
+        assert data.session_pct == 44.2
+        assert data.weekly_pct == 15.4
+
+    def test_sends_bearer_token(self, server):
+        fetch("sk-ant-oat01-abc", url=server.url)
+
+        assert server.requests[0]["Authorization"] == "Bearer sk-ant-oat01-abc"
+        assert server.requests[0]["anthropic-beta"] == "oauth-2025-04-20"
+
+    def test_http_error_includes_retry_after(self, server):
+        server.status = 429
+        server.headers = {"Retry-After": "120"}
+
+        with pytest.raises(ApiError, match=r"API returned 429: Too Many Requests; retry in 2m"):
+            fetch("token", url=server.url)
+
+    def test_invalid_body(self, server):
+        server.body = b"not json"
+
+        with pytest.raises(ApiError, match="Failed to parse"):
+            fetch("token", url=server.url)
+
+    def test_undecodable_body(self, server):
+        server.body = b"\xff\xfe{}"
+
+        with pytest.raises(ApiError, match="Failed to read response"):
+            fetch("token", url=server.url)
+
+    def test_connection_refused(self, server):
+        url = server.url
+        server.close()
+
+        with pytest.raises(ApiError, match="HTTP request failed"):
+            fetch("token", url=url)
+
+
+class TestQuery:
+    """Tests for query()."""
+
+    def test_fetches_and_saves_snapshot(self, server, credentials, tmp_path):
+        snapshot_path = tmp_path / "snapshot.json"
+
+        snapshot, cached = query(
+            credentials_path=credentials, snapshot_path=snapshot_path, url=server.url, now=NOW,
+        )
+
+        assert not cached
+        assert snapshot.fetched_at == NOW
+        assert load_snapshot(snapshot_path) == snapshot
+
+    def test_fresh_snapshot_skips_network_and_credentials(self, server, tmp_path):
+        snapshot_path = tmp_path / "snapshot.json"
+        save_snapshot(UsageData(session_pct=9.0), NOW - timedelta(seconds=30), snapshot_path)
+
+        snapshot, cached = query(
+            max_age=60, credentials_path=tmp_path / "missing.json",
+            snapshot_path=snapshot_path, url=server.url, now=NOW,
+        )
+
+        assert cached
+        assert snapshot.data.session_pct == 9.0
+        assert server.requests == []
+
+    def test_stale_snapshot_fetches(self, server, credentials, tmp_path):
+        snapshot_path = tmp_path / "snapshot.json"
+        save_snapshot(UsageData(session_pct=9.0), NOW - timedelta(seconds=90), snapshot_path)
+
+        snapshot, cached = query(
+            max_age=60, credentials_path=credentials,
+            snapshot_path=snapshot_path, url=server.url, now=NOW,
+        )
+
+        assert not cached
+        assert snapshot.data.session_pct == 44.2
+
+    def test_other_credentials_leave_default_snapshot_alone(
+        self, server, credentials, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        default = Snapshot(UsageData(session_pct=9.0), NOW - timedelta(seconds=30))
+        save_snapshot(default.data, default.fetched_at, default_snapshot_path())
+
+        snapshot, cached = query(max_age=60, credentials_path=credentials, url=server.url, now=NOW)
+
+        assert not cached
+        assert snapshot.data.session_pct == 44.2
+        assert load_snapshot(default_snapshot_path()) == default
+
+    def test_expired_credentials(self, server, credentials, tmp_path):
+        record = json.loads(credentials.read_text())
+        record["claudeAiOauth"]["expiresAt"] = int(time.time() * 1000) - 1000
+        credentials.write_text(json.dumps(record))
+
+        with pytest.raises(CredentialError, match="expired"):
+            query(credentials_path=credentials, snapshot_path=tmp_path / "s.json", url=server.url)
+        assert server.requests == []
+
+
+class TestFormatting:
+    """Tests for format_json() and format_line()."""
+
+    def test_json(self):
+        data = UsageData([
+            UsageBucket("five_hour", 85.0, NOW + timedelta(hours=2)),
+            UsageBucket("seven_day", None),
+        ])
+
+        record = json.loads(format_json(Snapshot(data, NOW), cached=True, now=NOW))
+
+        assert record["fetched_at"] == "2026-02-20T12:00:00+00:00"
+        assert record["cached"] is True
+        assert record["buckets"] == [
+            {
+                "key": "five_hour",
+                "title": "Session (5-hour)",
+                "utilization_pct": 85.0,
+                "status": "critical",
+                "resets_at": "2026-02-20T14:00:00+00:00",
+                "resets_in_seconds": 7200,
+            },
+            {
+                "key": "seven_day",
+                "title": "Weekly (7-day)",
+                "utilization_pct": None,
+                "status": None,
+                "resets_at": None,
+                "resets_in_seconds": None,
+            },
+        ]
+
+    def test_line(self):
+        data = UsageData(
+            session_pct=44.2, session_resets_at=NOW + timedelta(hours=4, minutes=59),
+            weekly_pct=15.0, opus_pct=None,
+        )
+
+        assert format_line(data, now=NOW) == (
+            "Session (5-hour) 44.2 % (resets in 4h 59m) · Weekly (7-day) 15.0 %"
+        )
+
+    def test_line_without_data(self):
+        assert format_line(UsageData()) == "No usage data"
+
+
+class TestOnceCommand:
+    """Tests for `leeway --once`."""
+
+    def test_prints_json(self, server, credentials, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("LEEWAY_API_URL", server.url)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert cli.main(["--once", "--json", "--credentials", str(credentials)]) == 0
+
+        record = json.loads(capsys.readouterr().out)
+        assert record["cached"] is False
+        assert record["buckets"][0]["utilization_pct"] == 44.2
+
+    def test_reports_errors(self, server, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("LEEWAY_API_URL", server.url)
+
+        assert cli.main(["--once", "--credentials", str(tmp_path / "missing.json")]) == 1
+        assert "Credentials file not found" in capsys.readouterr().err
+
+    def test_options_need_once(self):
+        with pytest.raises(SystemExit):
+            cli.main(["--json"])
+
+    def test_rejects_negative_age(self):
+        with pytest.raises(SystemExit):
+            cli.main(["--once", "--max-age", "-5"])
+
+    def test_imports_only_what_it_needs(self, tmp_path):
+        save_snapshot(UsageData(session_pct=9.0), datetime.now(timezone.utc), tmp_path / "leeway" / "snapshot.json")
+        script = (
+            "import sys; from app import cli; code = cli.main(sys.argv[1:]);"
+            "assert not set(cli.ONCE_AVOIDS) & sys.modules.keys(), sys.modules.keys(); sys.exit(code)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, "--once", "--max-age", "3600"],
+            env={**os.environ, "PYTHONPATH": SRC, "XDG_CACHE_HOME": str(tmp_path)},
+            capture_output=True, text=True, check=True,
+        )
+        assert result.stdout.startswith("Session (5-hour) 9.0 %")
+
+
+class TestParseOnce:
+    """Tests for the argparse-free `--once` fast path."""
+
+    def test_reads_every_option(self, tmp_path):
+        args = cli._parse_once(
+            ["--once", "--json", "--max-age=30", "--credentials", str(tmp_path / "c.json")]
+        )
+
+        assert (args.once, args.json, args.max_age) == (True, True, 30.0)
+        assert args.credentials == tmp_path / "c.json"
+
+    @pytest.mark.parametrize("argv", [
+        ["--json"],
+        ["--once", "export"],
+        ["--once", "--max-age"],
+        ["--once", "--max-age", "-5"],
+        ["--once", "--verbose"],
+    ])
+    def test_leaves_the_rest_to_argparse(self, argv):
+        assert cli._parse_once(argv) is None
+
+    def test_formats_match_exporter(self):
+        from app.exporter import FORMATS
+
+        assert cli.EXPORT_FORMATS == FORMATS
@@ -0,0 +1,106 @@
+"""Tests for poll_policy module."""
+
+from app.poll_policy import (
+    HIDDEN_FACTOR,
+    POWER_SAVER_FACTOR,
+    PollPolicy,
+    SuspendDetector,
+)
+
+
+class TestPollPolicy:
+    """Tests for PollPolicy."""
+
+    def test_passes_delay_through_by_default(self):
+        assert PollPolicy().adjust(60) == 60
+
+    def test_offline_pauses_polling(self):
+        policy = PollPolicy()
+        policy.update(online=False)
+
+        assert policy.adjust(60) is None
+
+    def test_power_saver_stretches_delay(self):
+        policy = PollPolicy()
+        policy.update(power_saver=True)
+
+        assert policy.adjust(60) == 60 * POWER_SAVER_FACTOR
+
+    def test_hidden_stretches_delay(self):
+        policy = PollPolicy()
+        policy.update(visible=False)
+
+        assert policy.adjust(60) == 60 * HIDDEN_FACTOR
+
+    def test_factors_combine(self):
+        policy = PollPolicy()
+        policy.update(visible=False, power_saver=True)
+
+        assert policy.adjust(10) == 10 * HIDDEN_FACTOR * POWER_SAVER_FACTOR
+
+    def test_remaining_counts_from_the_last_poll(self):
+        policy = PollPolicy()
+        assert policy.remaining(60, since_poll=45) == 15
+        assert policy.remaining(60, since_poll=90) == 0
+
+        policy.update(visible=False)
+        assert policy.remaining(60, since_poll=45) == 60 * HIDDEN_FACTOR - 45
+        policy.update(online=False)
+        assert policy.remaining(60, since_poll=45) is None
+
+    def test_toggling_conditions_does_not_postpone_the_poll(self):
+        policy = PollPolicy()
+        since_poll = 0
+        while policy.remaining(60, since_poll) > 0:
+            policy.update(power_saver=not policy.conditions.power_saver)
+            since_poll += 10
+
+        assert since_poll <= 60 * POWER_SAVER_FACTOR
+
+    def test_coming_online_requests_one_catch_up(self):
+        policy = PollPolicy()
+        policy.update(online=False)
+
+        assert policy.update(online=True) is True
+        # Flapping connectivity signals do not pile up more catch-ups.
+        policy.update(online=False)
+        assert policy.update(online=True) is False
+
+    def test_catch_up_available_again_once_done(self):
+        policy = PollPolicy()
+        policy.update(online=False)
+        policy.update(online=True)
+        policy.catch_up_done()
+        policy.update(online=False)
+
+        assert policy.update(online=True) is True
+
+    def test_other_changes_do_not_request_catch_up(self):
+        policy = PollPolicy()
+
+        assert policy.update(power_saver=True) is False
+        assert policy.update(visible=False) is False
+
+    def test_no_catch_up_while_offline(self):
+        policy = PollPolicy()
+        policy.update(online=False)
+
+        assert policy.request_catch_up() is False
+
+
+class TestSuspendDetector:
+    """Tests for SuspendDetector."""
+
+    def test_reports_time_suspended(self):
+        offsets = iter([0.0, 0.0, 3600.0, 3600.0])
+        detector = SuspendDetector(clock=lambda: next(offsets))
+
+        assert detector.check() == 0.0
+        assert detector.check() == 3600.0
+        assert detector.check() == 0.0
+
+    def test_ignores_clock_jitter(self):
+        offsets = iter([0.0, 0.01])
+        detector = SuspendDetector(clock=lambda: next(offsets))
+
+        assert detector.check() == 0.0
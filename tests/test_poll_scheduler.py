@@ -0,0 +1,150 @@
+"""Tests for poll_scheduler module — driven by a fake clock."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.poll_scheduler import RESET_GRACE_SECONDS, PollScheduler
+from app.usage_model import UsageBucket, UsageData
+
+START = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+FAR_RESET = START + timedelta(days=3)
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self, start: datetime = START):
+        self.now = start
+
+    def advance(self, seconds: float) -> datetime:
+        self.now += timedelta(seconds=seconds)
+        return self.now
+
+
+def _data(session: float | None, weekly: float | None = 10.0, **kwargs) -> UsageData:
+    kwargs.setdefault("session_resets_at", FAR_RESET)
+    kwargs.setdefault("weekly_resets_at", FAR_RESET)
+    return UsageData(session_pct=session, weekly_pct=weekly, **kwargs)
+
+
+class TestPollScheduler:
+    """Tests for PollScheduler."""
+
+    def test_polls_at_floor_before_first_sample(self):
+        assert PollScheduler(15, 300).next_delay(now=START) == 15
+
+    def test_flat_usage_polls_at_ceiling(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(15, 300)
+        for _ in range(5):
+            scheduler.record(_data(3.0), now=clock.now)
+            clock.advance(60)
+
+        assert scheduler.next_delay(now=clock.now) == 300
+
+    def test_climbing_usage_polls_sooner(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(15, 300)
+        # 5 points in 120 s; 20 points below the 75 % threshold → 480 s away.
+        for pct in (50.0, 52.0, 55.0):
+            scheduler.record(_data(pct), now=clock.now)
+            clock.advance(60)
+
+        delay = scheduler.next_delay(now=clock.now)
+
+        # Two polls before the projected crossing.
+        assert delay == 240
+
+    def test_faster_climb_polls_more_often(self):
+        slow, fast = PollScheduler(15, 300), PollScheduler(15, 300)
+        clock = FakeClock()
+        slow.record(_data(40.0), now=clock.now)
+        fast.record(_data(40.0), now=clock.now)
+        clock.advance(60)
+        slow.record(_data(41.0), now=clock.now)
+        fast.record(_data(45.0), now=clock.now)
+
+        assert fast.next_delay(now=clock.now) < slow.next_delay(now=clock.now)
+
+    def test_near_threshold_polls_at_floor(self):
+        scheduler = PollScheduler(15, 300)
+        scheduler.record(_data(89.0), now=START)
+
+        assert scheduler.next_delay(now=START) == 15
+
+    def test_weekly_climb_also_counts(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(15, 300)
+        scheduler.record(_data(5.0, weekly=70.0), now=clock.now)
+        clock.advance(60)
+        scheduler.record(_data(5.0, weekly=72.0), now=clock.now)
+
+        assert scheduler.next_delay(now=clock.now) < 300
+
+    def test_any_bucket_climb_counts(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(15, 300)
+        for pct in (70.0, 72.0):
+            scheduler.record(UsageData([UsageBucket("seven_day_sonnet", pct)]), now=clock.now)
+            clock.advance(60)
+
+        assert scheduler.next_delay(now=clock.now) < 300
+
+    def test_above_all_thresholds_polls_at_ceiling(self):
+        scheduler = PollScheduler(15, 300)
+        scheduler.record(_data(100.0, weekly=None), now=START)
+
+        assert scheduler.next_delay(now=START) == 300
+
+    def test_polls_just_after_upcoming_reset(self):
+        scheduler = PollScheduler(15, 300)
+        resets_at = START + timedelta(seconds=100)
+        scheduler.record(_data(3.0, session_resets_at=resets_at), now=START)
+
+        assert scheduler.next_delay(now=START) == 100 + RESET_GRACE_SECONDS
+
+    def test_imminent_reset_respects_floor(self):
+        scheduler = PollScheduler(15, 300)
+        resets_at = START + timedelta(seconds=2)
+        scheduler.record(_data(3.0, session_resets_at=resets_at), now=START)
+
+        assert scheduler.next_delay(now=START) == 15
+
+    def test_past_reset_is_ignored(self):
+        scheduler = PollScheduler(15, 300)
+        resets_at = START - timedelta(minutes=5)
+        scheduler.record(_data(3.0, session_resets_at=resets_at), now=START)
+
+        assert scheduler.next_delay(now=START) == 300
+
+    def test_usage_drop_discards_history(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(15, 300)
+        scheduler.record(_data(60.0), now=clock.now)
+        clock.advance(60)
+        scheduler.record(_data(70.0), now=clock.now)
+        clock.advance(60)
+        scheduler.record(_data(1.0), now=clock.now)
+
+        assert scheduler.velocity() == {}
+        assert scheduler.next_delay(now=clock.now) == 300
+
+    def test_missing_pct_is_treated_as_idle(self):
+        scheduler = PollScheduler(15, 300)
+        scheduler.record(_data(None, weekly=None), now=START)
+
+        assert scheduler.next_delay(now=START) == 300
+
+    def test_bounds_are_normalised(self):
+        scheduler = PollScheduler(120, 30)
+
+        assert scheduler.min_interval == 30
+        assert scheduler.max_interval == 120
+
+    def test_delay_stays_within_bounds(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(30, 120)
+        scheduler.record(_data(10.0), now=clock.now)
+        clock.advance(1)
+        scheduler.record(_data(60.0), now=clock.now)
+
+        assert scheduler.next_delay(now=clock.now) == 30
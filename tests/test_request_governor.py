@@ -0,0 +1,123 @@
+"""Tests for request_governor module — driven by a fake monotonic clock."""
+
+from app.request_governor import CircuitState, RequestGovernor
+
+
+def _governor(**kwargs) -> RequestGovernor:
+    kwargs.setdefault("base_delay", 10.0)
+    kwargs.setdefault("max_delay", 1000.0)
+    kwargs.setdefault("failure_threshold", 3)
+    kwargs.setdefault("open_duration", 300.0)
+    # Deterministic jitter: always the top of the range.
+    kwargs.setdefault("rng", lambda: 1.0)
+    return RequestGovernor(**kwargs)
+
+
+class TestRequestGovernor:
+    """Tests for RequestGovernor."""
+
+    def test_allows_requests_initially(self):
+        assert _governor().allow_request(now=0.0) is True
+
+    def test_failure_delays_next_request(self):
+        governor = _governor()
+        governor.record_failure("boom", now=0.0)
+
+        assert governor.allow_request(now=5.0) is False
+        assert governor.retry_in(now=5.0) == 5.0
+        assert governor.allow_request(now=10.0) is True
+
+    def test_backoff_grows_exponentially(self):
+        governor = _governor(failure_threshold=10)
+        delays = []
+        now = 0.0
+        for _ in range(4):
+            governor.record_failure("boom", now=now)
+            delays.append(governor.retry_in(now=now))
+            now += delays[-1]
+
+        assert delays == [10.0, 20.0, 40.0, 80.0]
+
+    def test_backoff_is_capped(self):
+        governor = _governor(failure_threshold=100, max_delay=60.0)
+        for _ in range(20):
+            governor.record_failure("boom", now=0.0)
+
+        assert governor.retry_in(now=0.0) == 60.0
+
+    def test_jitter_keeps_at_least_half_the_step(self):
+        governor = _governor(rng=lambda: 0.0)
+        governor.record_failure("boom", now=0.0)
+
+        assert governor.retry_in(now=0.0) == 5.0
+
+    def test_retry_after_wins_when_longer(self):
+        governor = _governor()
+        governor.record_failure("429", retry_after=120.0, now=0.0)
+
+        assert governor.retry_in(now=0.0) == 120.0
+
+    def test_retry_after_ignored_when_shorter(self):
+        governor = _governor()
+        governor.record_failure("429", retry_after=1.0, now=0.0)
+
+        assert governor.retry_in(now=0.0) == 10.0
+
+    def test_success_resets_backoff(self):
+        governor = _governor()
+        governor.record_failure("boom", now=0.0)
+        governor.record_success()
+
+        assert governor.allow_request(now=0.0) is True
+        assert governor.failures == 0
+        assert governor.last_error is None
+
+    def test_circuit_opens_after_threshold(self):
+        governor = _governor()
+        for _ in range(3):
+            governor.record_failure("boom", now=0.0)
+
+        assert governor.state is CircuitState.OPEN
+        assert governor.retry_in(now=0.0) == 300.0
+
+    def test_half_open_allows_single_probe(self):
+        governor = _governor()
+        for _ in range(3):
+            governor.record_failure("boom", now=0.0)
+
+        assert governor.allow_request(now=300.0) is True
+        assert governor.state is CircuitState.HALF_OPEN
+        assert governor.allow_request(now=301.0) is False
+
+    def test_successful_probe_closes_circuit(self):
+        governor = _governor()
+        for _ in range(3):
+            governor.record_failure("boom", now=0.0)
+        governor.allow_request(now=300.0)
+
+        governor.record_success()
+
+        assert governor.state is CircuitState.CLOSED
+        assert governor.allow_request(now=300.0) is True
+
+    def test_failed_probe_reopens_circuit(self):
+        governor = _governor()
+        for _ in range(3):
+            governor.record_failure("boom", now=0.0)
+        governor.allow_request(now=300.0)
+
+        governor.record_failure("still down", now=300.0)
+
+        assert governor.state is CircuitState.OPEN
+        assert governor.allow_request(now=301.0) is False
+        assert governor.last_error == "still down"
+
+    def test_cancelled_probe_can_be_retried(self):
+        governor = _governor()
+        for _ in range(3):
+            governor.record_failure("boom", now=0.0)
+        governor.allow_request(now=300.0)
+
+        governor.record_cancelled()
+
+        assert governor.allow_request(now=300.0) is True
@@ -0,0 +1,53 @@
+"""Tests for single_flight module."""
+
+from app.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_first_trigger_starts_request(self):
+        flight = SingleFlight()
+
+        assert flight.begin(now=0.0) is True
+        assert flight.in_flight is True
+        assert flight.stats.started == 1
+
+    def test_concurrent_triggers_are_coalesced(self):
+        flight = SingleFlight()
+        flight.begin(now=0.0)
+
+        assert flight.begin(now=1.0) is False
+        assert flight.begin(now=2.0) is False
+        assert flight.stats.coalesced == 2
+        assert flight.stats.started == 1
+
+    def test_force_joins_young_request(self):
+        flight = SingleFlight(min_restart_age=5.0)
+        flight.begin(now=0.0)
+
+        assert flight.begin(force=True, now=4.0) is False
+        assert flight.stats.coalesced == 1
+
+    def test_force_restarts_old_request(self):
+        flight = SingleFlight(min_restart_age=5.0)
+        flight.begin(now=0.0)
+
+        assert flight.begin(force=True, now=5.0) is True
+        assert flight.stats.restarted == 1
+
+    def test_restart_resets_age(self):
+        flight = SingleFlight(min_restart_age=5.0)
+        flight.begin(now=0.0)
+        flight.begin(force=True, now=6.0)
+
+        assert flight.begin(force=True, now=8.0) is False
+
+    def test_end_allows_new_request(self):
+        flight = SingleFlight()
+        flight.begin(now=0.0)
+        flight.end()
+
+        assert flight.in_flight is False
+        assert flight.begin(now=1.0) is True
+        assert flight.stats.started == 2
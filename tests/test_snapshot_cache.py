@@ -0,0 +1,101 @@
+"""Tests for snapshot_cache module."""
+
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from app.snapshot_cache import (
+    SCHEMA_VERSION,
+    default_snapshot_path,
+    load_snapshot,
+    save_snapshot,
+)
+from app.usage_model import UsageBucket, UsageData
+
+FETCHED_AT = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+DATA = UsageData(
+    session_pct=45.5,
+    session_resets_at=datetime(2026, 2, 20, 17, 0, 0, tzinfo=timezone.utc),
+    weekly_pct=12.0,
+    weekly_resets_at=datetime(2026, 2, 23, 0, 0, 0, tzinfo=timezone.utc),
+)
+
+
+class TestSnapshotCache:
+    """Tests for save_snapshot() / load_snapshot()."""
+
+    def test_round_trips(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        save_snapshot(DATA, FETCHED_AT, path)
+
+        snapshot = load_snapshot(path)
+
+        assert snapshot.data == DATA
+        assert snapshot.fetched_at == FETCHED_AT
+
+    def test_round_trips_unknown_buckets(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        data = UsageData([UsageBucket("seven_day_sonnet", 8.0)])
+        save_snapshot(data, FETCHED_AT, path)
+
+        assert load_snapshot(path).data == data
+
+    def test_creates_parent_directory(self, tmp_path):
+        path = tmp_path / "leeway" / "snapshot.json"
+        save_snapshot(DATA, FETCHED_AT, path)
+
+        assert path.exists()
+
+    def test_leaves_no_temporary_files(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        save_snapshot(DATA, FETCHED_AT, path)
+        save_snapshot(DATA, FETCHED_AT, path)
+
+        assert os.listdir(tmp_path) == ["snapshot.json"]
+
+    def test_file_is_tiny(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        save_snapshot(DATA, FETCHED_AT, path)
+
+        assert path.stat().st_size < 512
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert load_snapshot(tmp_path / "missing.json") is None
+
+    def test_corrupt_file_returns_none(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        path.write_text("{truncated")
+
+        assert load_snapshot(path) is None
+
+    def test_other_schema_version_is_ignored(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        save_snapshot(DATA, FETCHED_AT, path)
+        record = json.loads(path.read_text())
+        record["version"] = SCHEMA_VERSION + 1
+        path.write_text(json.dumps(record))
+
+        assert load_snapshot(path) is None
+
+    def test_wrong_field_types_are_ignored(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        save_snapshot(DATA, FETCHED_AT, path)
+        record = json.loads(path.read_text())
+        record["buckets"][0]["pct"] = "lots"
+        path.write_text(json.dumps(record))
+
+        assert load_snapshot(path) is None
+
+    def test_default_path_honours_xdg_cache_home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert default_snapshot_path() == tmp_path / "leeway" / "snapshot.json"
+
+    def test_does_not_import_gi(self):
+        src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+        code = "import sys, app.snapshot_cache; sys.exit('gi' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=src)
+
+        assert result.returncode == 0
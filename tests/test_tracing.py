@@ -0,0 +1,128 @@
+"""Tests for tracing module."""
+
+import itertools
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from app import tracing
+from app.tracing import Tracer, trace_path_from_env
+
+
+def _fake_clock(step_ns: int = 1_000):
+    ticks = itertools.count(0, step_ns)
+    return lambda: next(ticks)
+
+
+def _events(path: Path) -> list[dict]:
+    return [event for event in json.loads(path.read_text()) if event["ph"] != "M"]
+
+
+class TestTracer:
+    """Tests for Tracer."""
+
+    def test_writes_valid_trace_events(self, tmp_path):
+        path = tmp_path / "trace.json"
+        tracer = Tracer(path, clock=_fake_clock())
+        tracer.instant("timer")
+        token = tracer.start("refresh", forced=True)
+        with tracer.span("parse", bytes=10):
+            pass
+        tracer.finish(token, error=None)
+        tracer.close()
+
+        timer, begin, parse, end = _events(path)
+        assert (timer["name"], timer["ph"], timer["ts"]) == ("timer", "i", 0.0)
+        assert begin["ph"] == "b" and end["ph"] == "e"
+        assert begin["id"] == end["id"]
+        assert begin["args"] == {"forced": True}
+        assert parse["ph"] == "X"
+        assert parse["dur"] == 1.0  # µs
+        assert parse["args"] == {"bytes": 10}
+        assert tracer.events_written == 4
+
+    def test_buffers_until_flush(self, tmp_path):
+        path = tmp_path / "trace.json"
+        tracer = Tracer(path, clock=_fake_clock())
+        tracer.instant("timer")
+        assert tracer.events_written == 0
+        tracer.close()
+        assert tracer.events_written == 1
+
+    def test_writes_buffered_events_without_waiting_for_more(self, tmp_path):
+        tracer = Tracer(tmp_path / "trace.json", flush_seconds=0.01, clock=_fake_clock())
+        tracer.instant("timer")
+        deadline = time.monotonic() + 5
+        while tracer.events_written == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        tracer.close()
+
+        assert tracer.events_written == 1
+
+    def test_keeps_previous_trace(self, tmp_path):
+        path = tmp_path / "trace.json"
+        for name in ("first", "second"):
+            tracer = Tracer(path, clock=_fake_clock())
+            tracer.instant(name)
+            tracer.close()
+
+        assert [event["name"] for event in _events(path)] == ["second"]
+        assert [event["name"] for event in _events(path.with_name("trace.json.1"))] == ["first"]
+
+    def test_rotates(self, tmp_path):
+        path = tmp_path / "trace.json"
+        tracer = Tracer(path, max_bytes=2_000, backups=2, clock=_fake_clock())
+        for _ in range(60):
+            for _ in range(10):
+                tracer.instant("timer")
+            tracer.flush()
+        tracer.close()
+
+        assert path.with_name("trace.json.1").exists()
+        assert path.with_name("trace.json.2").exists()
+        assert not path.with_name("trace.json.3").exists()
+        for name in ("trace.json", "trace.json.1", "trace.json.2"):
+            json.loads((tmp_path / name).read_text())
+
+
+class TestModuleFunctions:
+    """Tests for the module-level entry points."""
+
+    def test_disabled_is_a_no_op(self):
+        assert not tracing.is_enabled()
+        with tracing.span("parse"):
+            pass
+        token = tracing.start("refresh")
+        assert token is None
+        tracing.finish(token)
+        tracing.instant("timer")
+
+    def test_enable_and_disable(self, tmp_path):
+        path = tmp_path / "trace.json"
+        tracing.enable(path)
+        try:
+            with tracing.span("parse"):
+                pass
+        finally:
+            tracing.disable()
+        assert [event["name"] for event in _events(path)] == ["parse"]
+        assert not tracing.is_enabled()
+
+
+class TestTracePathFromEnv:
+    """Tests for trace_path_from_env()."""
+
+    @pytest.mark.parametrize("value", ["", "0"])
+    def test_off(self, value):
+        assert trace_path_from_env({"LEEWAY_TRACE": value}) is None
+        assert trace_path_from_env({}) is None
+
+    def test_default_path(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert trace_path_from_env({"LEEWAY_TRACE": "1"}) == tmp_path / "leeway" / "trace.json"
+
+    def test_explicit_path(self, tmp_path):
+        path = tmp_path / "mine.json"
+        assert trace_path_from_env({"LEEWAY_TRACE": str(path)}) == path
@@ -19,9 +19,13 @@
 
 """Tests for usage_calculator colour mappings."""
 
+import re
 from math import isclose
+from pathlib import Path
 
-from app.usage_calculator import STATUS_COLORS, StatusLevel
+from app.usage_calculator import STATUS_COLORS, STATUS_CSS_CLASSES, StatusLevel
+
+STYLESHEET = Path(__file__).parent.parent / "src" / "ui" / "style.css"
 
 
 def _hex_to_floats(hex_color: str) -> tuple[float, float, float]:
@@ -55,3 +59,21 @@ class TestStatusColors:
     def test_critical_is_gnome_red(self):
         _assert_color_matches(STATUS_COLORS[StatusLevel.CRITICAL], GNOME_RED)
 
+
+class TestStylesheet:
+    """The bundled style.css must match the status palette."""
+
+    def test_every_level_has_a_rule_in_its_colour(self):
+        css = STYLESHEET.read_text()
+        for level, css_class in STATUS_CSS_CLASSES.items():
+            match = re.search(
+                rf"levelbar\.{css_class} block\.filled \{{\s*background-color: (#[0-9a-fA-F]{{6}});",
+                css,
+            )
+            assert match, f"no rule for {css_class}"
+            _assert_color_matches(STATUS_COLORS[level], match.group(1))
+
+    def test_classes_are_distinct(self):
+        assert set(STATUS_CSS_CLASSES) == set(StatusLevel)
+        assert len(set(STATUS_CSS_CLASSES.values())) == len(StatusLevel)
+
@@ -1,10 +1,21 @@
 """Tests for usage_model module."""
 
-from datetime import datetime, timezone
+import builtins
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from app.usage_model import UsageData, parse_usage_response, _parse_iso_datetime
+from app.usage_model import (
+    OPUS,
+    SESSION,
+    WEEKLY,
+    UsageBucket,
+    UsageData,
+    bucket_title,
+    bucket_window,
+    parse_usage_response,
+    _parse_iso_datetime,
+)
 
 
 class TestParseIsoDatetime:
@@ -162,3 +173,88 @@ class TestParseUsageResponse:
         assert data.session_resets_at is None
         assert data.weekly_pct == 30.0
         assert data.weekly_resets_at == datetime(2026, 2, 23, 0, 0, 0, tzinfo=timezone.utc)
+
+    def test_keeps_unknown_buckets_after_known_ones(self):
+        raw = {
+            "seven_day_sonnet": {"utilization": 8.0, "resets_at": None},
+            "seven_day_new_model": {"utilization_pct": 3.5},
+            "five_hour": {"utilization": 44.0},
+            "seven_day_oauth_apps": None,
+            "metadata": {"plan": "max"},
+        }
+
+        data = parse_usage_response(raw)
+
+        assert [b.key for b in data.buckets] == ["five_hour", "seven_day_sonnet", "seven_day_new_model"]
+        assert data.get("seven_day_new_model").pct == 3.5
+
+    def test_skips_all_null_buckets(self):
+        raw = {
+            "five_hour": {"utilization": 44.0, "resets_at": None},
+            "seven_day_opus": {"utilization": None, "resets_at": None},
+            "extra_usage": {"is_enabled": False, "utilization": None},
+        }
+
+        data = parse_usage_response(raw)
+
+        assert [b.key for b in data.buckets] == ["five_hour"]
+        assert data.get("seven_day_opus") is None
+
+    def test_ignores_non_numeric_utilisation(self):
+        data = parse_usage_response({"five_hour": {"utilization": "lots", "utilization_pct": None}})
+
+        assert data.session_pct is None
+
+    def test_reuses_parsed_datetimes(self):
+        raw = {"five_hour": {"utilization": 1.0, "resets_at": "2026-02-20T20:00:00Z"}}
+
+        first = parse_usage_response(raw)
+        second = parse_usage_response(raw)
+
+        assert first.session_resets_at is second.session_resets_at
+
+
+class TestUsageData:
+    """Tests for UsageData and UsageBucket."""
+
+    def test_legacy_keywords_build_buckets(self):
+        data = UsageData(session_pct=10.0, opus_pct=2.0)
+
+        assert [b.key for b in data.buckets] == [SESSION, OPUS]
+        assert data.weekly_pct is None
+
+    def test_is_immutable(self):
+        data = UsageData([UsageBucket(SESSION, 10.0)])
+
+        with pytest.raises(AttributeError):
+            data.session_pct = 20.0
+        with pytest.raises(AttributeError):
+            data.buckets[0].pct = 20.0
+
+    def test_compares_by_value(self):
+        assert UsageData(session_pct=1.0) == UsageData([UsageBucket(SESSION, 1.0)])
+        assert UsageData(session_pct=1.0) != UsageData(session_pct=2.0)
+
+    def test_has_no_instance_dict(self):
+        assert not hasattr(UsageData(), "__dict__")
+        assert not hasattr(UsageBucket(SESSION), "__dict__")
+
+    def test_titles(self):
+        assert bucket_title(SESSION) == "Session (5-hour)"
+        assert bucket_title("seven_day_new_model") == "Seven day new model"
+        assert UsageBucket(OPUS).title == "Opus (7-day)"
+
+    def test_titles_use_installed_translations(self, monkeypatch):
+        monkeypatch.setattr(builtins, "_", {"Weekly (7-day)": "Hebdomadaire"}.get, raising=False)
+
+        assert bucket_title(WEEKLY) == "Hebdomadaire"
+
+    def test_repeated_buckets_are_shared(self):
+        raw = {SESSION: {"utilization": 44.2, "resets_at": "2026-02-20T17:00:00+00:00"}}
+
+        assert parse_usage_response(raw).get(SESSION) is parse_usage_response(dict(raw)).get(SESSION)
+
+    def test_windows(self):
+        assert bucket_window(SESSION) == timedelta(hours=5)
+        assert bucket_window("seven_day_sonnet") == timedelta(days=7)
+        assert bucket_window("monthly") is None
@@ -0,0 +1,92 @@
+"""Tests for view_state module."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.burn_rate import Forecast
+from app.usage_calculator import StatusLevel
+from app.usage_model import UsageBucket
+from app.view_state import ViewState, countdown_fields, usage_fields
+
+NOW = datetime(2026, 2, 20, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class TestViewState:
+    """Tests for ViewState."""
+
+    def test_first_render_reports_every_field(self):
+        view = ViewState()
+        assert view.diff("session", {"subtitle": "10.0 %", "value": 10.0}) == {
+            "subtitle": "10.0 %",
+            "value": 10.0,
+        }
+
+    def test_unchanged_fields_are_skipped(self):
+        view = ViewState()
+        view.diff("session", {"subtitle": "10.0 %", "value": 10.0})
+        assert view.diff("session", {"subtitle": "10.0 %", "value": 10.0}) == {}
+        assert view.diff("session", {"subtitle": "11.0 %", "value": 10.0}) == {"subtitle": "11.0 %"}
+
+    def test_widgets_are_independent(self):
+        view = ViewState()
+        view.diff("session", {"subtitle": "10.0 %"})
+        assert view.diff("weekly", {"subtitle": "10.0 %"}) == {"subtitle": "10.0 %"}
+
+    def test_none_is_a_value(self):
+        view = ViewState()
+        assert view.diff("session", {"description": None}) == {"description": None}
+        assert view.diff("session", {"description": None}) == {}
+
+    def test_counts_updates_per_refresh(self):
+        view = ViewState()
+        view.begin_refresh()
+        view.diff("session", {"subtitle": "10.0 %", "value": 10.0})
+        assert view.refresh_updates == 2
+
+        view.begin_refresh()
+        view.diff("session", {"subtitle": "10.0 %", "value": 10.0})
+        assert view.refresh_updates == 0
+        assert view.updates == 2
+        assert view.refreshes == 2
+
+    def test_forget_forces_redraw(self):
+        view = ViewState()
+        view.diff("session", {"subtitle": "10.0 %"})
+        view.diff("weekly", {"subtitle": "5.0 %"})
+        view.forget("session")
+        assert view.diff("session", {"subtitle": "10.0 %"}) == {"subtitle": "10.0 %"}
+        assert view.diff("weekly", {"subtitle": "5.0 %"}) == {}
+
+
+class TestUsageFields:
+    """Tests for usage_fields()."""
+
+    def test_bucket_with_usage(self):
+        assert usage_fields(UsageBucket("five_hour", 82.25)) == {
+            "subtitle": "82.2 %",
+            "value": 82.25,
+            "status": StatusLevel.CRITICAL,
+        }
+
+    def test_bar_is_capped(self):
+        assert usage_fields(UsageBucket("five_hour", 104.0))["value"] == 100
+
+    def test_missing(self):
+        assert usage_fields(None) == {"subtitle": "\u2014", "value": 0}
+        assert usage_fields(UsageBucket("five_hour")) == {"subtitle": "\u2014", "value": 0}
+
+
+class TestCountdownFields:
+    """Tests for countdown_fields()."""
+
+    def test_reset_and_forecast(self):
+        resets_at = NOW + timedelta(hours=2, minutes=5)
+        bucket = UsageBucket("five_hour", 60.0, resets_at)
+        forecast = Forecast("five_hour", 0.01, NOW + timedelta(minutes=47), resets_at)
+        assert countdown_fields(bucket, forecast, now=NOW) == {
+            "reset": "Resets in 2h 5m",
+            "description": "At this rate: limit in 47m (before reset)",
+        }
+
+    def test_nothing_to_show(self):
+        assert countdown_fields(None, None, now=NOW) == {"reset": "", "description": None}
+
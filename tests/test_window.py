@@ -0,0 +1,97 @@
+"""Tests for the window's widget updates, run on fake widgets."""
+
+import math
+from types import SimpleNamespace
+
+import pytest
+
+gi = pytest.importorskip("gi")
+
+try:
+    gi.require_version("Adw", "1")
+    gi.require_version("Gtk", "4.0")
+except ValueError:
+    pytest.skip("libadwaita is not available", allow_module_level=True)
+
+from app.usage_calculator import STATUS_CSS_CLASSES, status_for_pct  # noqa: E402
+from app.usage_model import SESSION, UsageBucket  # noqa: E402
+from app.view_state import ViewState, usage_fields  # noqa: E402
+from app.window import LeewayWindow  # noqa: E402
+
+
+class CountingBar:
+    """Stands in for a Gtk.LevelBar, counting style class changes."""
+
+    def __init__(self):
+        self.classes = set()
+        self.added = 0
+        self.removed = 0
+
+    def add_css_class(self, name):
+        self.added += 1
+        self.classes.add(name)
+
+    def remove_css_class(self, name):
+        self.removed += 1
+        self.classes.discard(name)
+
+    def set_value(self, value):
+        pass
+
+
+class FakeWindow(SimpleNamespace):
+    """Just enough of LeewayWindow for _render() and _apply_pending()."""
+
+    def __init__(self):
+        self.bar = CountingBar()
+        group = SimpleNamespace(bar=self.bar, row=SimpleNamespace(set_subtitle=lambda text: None))
+        super().__init__(
+            view_state=ViewState(), _pending={}, _tick_id=None, _usage_groups={SESSION: group},
+        )
+
+    _render = LeewayWindow._render
+    _apply_pending = LeewayWindow._apply_pending
+
+    def add_tick_callback(self, callback):
+        self.frame = callback
+        return 1
+
+    def draw(self):
+        """Run the queued tick callback, as the next frame would."""
+        if self._tick_id is not None:
+            self.frame(self, None)
+
+
+class TestStatusClasses:
+    """Bars swap status classes only when their level changes."""
+
+    def test_long_run_swaps_only_on_level_changes(self):
+        window = FakeWindow()
+        transitions = 0
+        previous = None
+        # Several hours of one-minute refreshes, climbing through every level
+        # with some jitter, then a reset.
+        for i in range(5000):
+            pct = (i % 2500) / 25 + math.sin(i) * 0.5
+            level = status_for_pct(pct)
+            if level != previous:
+                transitions += 1
+                previous = level
+            window._render(SESSION, **usage_fields(UsageBucket(SESSION, pct)))
+            window.draw()
+
+        assert window.bar.added == transitions
+        assert window.bar.removed == transitions * len(STATUS_CSS_CLASSES)
+        assert window.bar.classes == {STATUS_CSS_CLASSES[level]}
+
+    def test_steady_updates_touch_no_classes(self):
+        window = FakeWindow()
+        window._render(SESSION, **usage_fields(UsageBucket(SESSION, 42.0)))
+        window.draw()
+        added, removed = window.bar.added, window.bar.removed
+
+        for _ in range(1000):
+            window._render(SESSION, **usage_fields(UsageBucket(SESSION, 42.0)))
+            window.draw()
+
+        assert (window.bar.added, window.bar.removed) == (added, removed)